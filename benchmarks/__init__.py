@@ -0,0 +1,3 @@
+"""
+Benchmarks for ga_solver. Run them with ``python -m benchmarks.run``
+"""
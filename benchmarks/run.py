@@ -0,0 +1,191 @@
+"""
+Runs the benchmarks and writes their results as JSON, so runs of different
+versions can be compared:
+
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --output after.json --compare before.json
+
+Every metric is measured by repeating its operation until ``--min-time``
+seconds have passed, so small and large sizes take about the same time.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from random import Random
+
+import ga_solver
+from ga_solver import RangeDict
+from ga_solver.pop_selectors import build_roullete, roullete_many
+
+from .workloads import WORKLOADS
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+
+
+def repeat(operation, min_time):
+    """
+    Calls ``operation`` until ``min_time`` seconds have passed. Returns the
+    number of calls and the elapsed time.
+    """
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+
+    while calls == 0 or elapsed < min_time:
+        operation()
+        calls += 1
+        elapsed = time.perf_counter() - start
+
+    return calls, elapsed
+
+
+def bench_solver(workload, size, min_time):
+    """
+    Generations per second, goal calls per generation and peak memory
+    allocated during one generation
+    """
+    solver = WORKLOADS[workload](size)
+    solver.fitness  # pylint: disable=pointless-statement
+
+    tracemalloc.start()
+    next(solver)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    misses = solver.fitness_misses
+    generations, elapsed = repeat(lambda: next(solver), min_time)
+
+    return {
+        "generations_per_second": generations / elapsed,
+        "goal_calls_per_generation": (solver.fitness_misses - misses) / generations,
+        "peak_bytes_per_generation": peak,
+    }
+
+
+def bench_roullete(size, min_time):
+    """
+    Roullete tables built per second and batched draws per second
+    """
+    rng = Random(0)
+    fitness = [rng.random() for _ in range(size)]
+    population = dict(enumerate(fitness))
+
+    builds, build_time = repeat(lambda: build_roullete(population), min_time)
+    batches, draw_time = repeat(lambda: roullete_many(fitness, size, rng), min_time)
+
+    return {
+        "builds_per_second": builds / build_time,
+        "draws_per_second": batches * size / draw_time,
+    }
+
+
+def bench_range_dict(size, min_time):
+    """
+    Average latency of single and batched lookups
+    """
+    rng = Random(0)
+    range_dict = RangeDict.from_cumulative(range(size + 1), range(size))
+    points = [rng.uniform(0, size) for _ in range(1000)]
+
+    def single():
+        for point in points:
+            range_dict[point]  # pylint: disable=pointless-statement
+
+    singles, single_time = repeat(single, min_time)
+    batches, batch_time = repeat(lambda: range_dict.lookup_many(points), min_time)
+
+    return {
+        "lookup_ns": single_time / (singles * len(points)) * 1e9,
+        "lookup_many_ns": batch_time / (batches * len(points)) * 1e9,
+    }
+
+
+def run(sizes, workloads, min_time, log=print):
+    """
+    Runs every benchmark and returns the JSON-serializable results
+    """
+    results = []
+
+    def record(name, params, metrics):
+        results.append({"benchmark": name, "params": params, "metrics": metrics})
+        log(f"{name} {params} {json.dumps(metrics)}")
+
+    for size in sizes:
+        for workload in workloads:
+            record(
+                f"solver.{workload}",
+                {"population": size},
+                bench_solver(workload, size, min_time),
+            )
+
+        record(
+            "pop_selectors.roullete",
+            {"population": size},
+            bench_roullete(size, min_time),
+        )
+        record("range_dict.lookup", {"ranges": size}, bench_range_dict(size, min_time))
+
+    return {
+        "ga_solver_version": ga_solver.__version__,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "date": datetime.now(timezone.utc).isoformat(),
+        "min_time": min_time,
+        "results": results,
+    }
+
+
+def compare(current, previous):
+    """
+    Returns one line per metric present in both runs, with the ratio
+    current / previous
+    """
+    index = {
+        (item["benchmark"], json.dumps(item["params"], sort_keys=True)): item["metrics"]
+        for item in previous["results"]
+    }
+    lines = []
+
+    for item in current["results"]:
+        key = (item["benchmark"], json.dumps(item["params"], sort_keys=True))
+        old_metrics = index.get(key, {})
+        for metric, value in item["metrics"].items():
+            old = old_metrics.get(metric)
+            if old:
+                lines.append(f"{key[0]} {key[1]} {metric}: {value / old:.2f}x")
+
+    return lines
+
+
+def main(argv=None):
+    """
+    Command line entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--workloads", nargs="+", choices=sorted(WORKLOADS), default=sorted(WORKLOADS)
+    )
+    parser.add_argument("--min-time", type=float, default=1.0)
+    parser.add_argument("--output", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="A previous JSON result to compare with")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.workloads, args.min_time)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as previous:
+            for line in compare(results, json.load(previous)):
+                print(line)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Problems used as workloads by the benchmarks: the second-degree equation
+from the test suite, the eight queens from the demos and one-max on packed
+bit strings
+"""
+from itertools import combinations
+from random import Random
+
+from ga_solver import BitString, GASolver
+from ga_solver.genomes import bit_flip, uniform_crossover
+from ga_solver.pop_selectors import roullete, tournament
+
+# A target no individual reaches, so the solvers never stop by themselves
+UNREACHABLE = float("inf")
+
+
+# pylint: disable=invalid-name
+def equation_goal(x):
+    """
+    Grows as x approaches a root of x² - 49
+    """
+    result = x ** 2 - 49
+    if result == 0:
+        return 1e12
+
+    return abs(1 / result)
+
+
+def equation_root(population, random_seed=0):
+    """
+    Returns a GASolver looking for a root of x² - 49
+    """
+    rng = Random(random_seed)
+
+    return GASolver(
+        initial_pop=[rng.uniform(-1000, 1000) for _ in range(population)],
+        goal=equation_goal,
+        target_value=UNREACHABLE,
+        mutation=lambda x: x + rng.uniform(-1, 1),
+        prob_mutation=0.7,
+        crossover_=lambda x, y: (abs(x * y)) ** 0.5,
+        selector=roullete,
+        random_seed=random_seed,
+    )
+
+
+def queens_goal(board):
+    """
+    The number of pairs of queens that don't attack each other, minus a
+    penalty for repeated lines
+    """
+    non_attacking = sum(
+        1
+        for (col_a, line_a), (col_b, line_b) in combinations(enumerate(board), 2)
+        if line_a != line_b and abs(line_a - line_b) != abs(col_a - col_b)
+    )
+    repetitions = 8 - len(set(board))
+    return max(non_attacking - repetitions * 10, 0.001)
+
+
+def eight_queens(population, random_seed=0):
+    """
+    Returns a GASolver for the eight queens problem, as in the demos
+    """
+    rng = Random(random_seed)
+
+    def board_mutation(board):
+        point = rng.randint(1, 6)
+        board = board[:point] + board[point:][::-1]
+        if rng.random() > 0.5:
+            board[-1] = rng.randint(1, 8)
+        return board
+
+    def crossover(board_a, board_b):
+        point = rng.randint(1, 6)
+        return board_a[:point] + board_b[point:]
+
+    return GASolver(
+        initial_pop=[rng.sample(range(1, 9), k=8) for _ in range(population)],
+        goal=queens_goal,
+        target_value=UNREACHABLE,
+        mutation=board_mutation,
+        prob_mutation=0.8,
+        crossover_=crossover,
+        selector=roullete,
+        min_select=2,
+        random_seed=random_seed,
+    )
+
+
+def one_max(population, random_seed=0):
+    """
+    Returns a GASolver maximizing the set bits of 256-bit strings
+    """
+    rng = Random(random_seed)
+
+    return GASolver(
+        initial_pop=[BitString.random(256, rng) for _ in range(population)],
+        goal=BitString.count,
+        target_value=UNREACHABLE,
+        mutation=bit_flip(rng=rng),
+        prob_mutation=0.5,
+        crossover_=uniform_crossover(rng),
+        selector=tournament(3),
+        random_seed=random_seed,
+    )
+
+
+WORKLOADS = {
+    "equation_root": equation_root,
+    "eight_queens": eight_queens,
+    "one_max": one_max,
+}
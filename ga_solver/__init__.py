@@ -1,5 +1,11 @@
 # pylint: disable=missing-module-docstring
+from .array_solver import ArraySolver
+from .async_solver import AsyncGASolver
+from .fitness import FitnessMemo, FitnessStore, Mutant
 from .ga_solver import GASolver
+from .genomes import BitString, IntVector, RealVector
+from .multi_objective import ParetoArchive
+from .population import Population
 from .range_dict import RangeDict
 
 __version__ = "0.1.2"
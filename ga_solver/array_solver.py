@@ -0,0 +1,406 @@
+"""
+Defines ArraySolver, a Genetic Algorithm Solver for fixed-length numeric
+genomes that keeps its whole population in a NumPy array
+
+NumPy is an optional dependency, install it with ``pip install ga_solver[numpy]``
+"""
+from math import ceil, floor
+
+from .stats import GenerationSummary
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def uniform_crossover(parents_a, parents_b, rng):
+    """
+    Each gene of a child comes from either parent with equal chance
+    """
+    mask = rng.random(parents_a.shape) < 0.5
+    return np.where(mask, parents_a, parents_b)
+
+
+def one_point_crossover(parents_a, parents_b, rng):
+    """
+    Each child takes the genes of ``parents_a`` up to a random cut and the
+    genes of ``parents_b`` after it
+    """
+    count, length = parents_a.shape
+    if length < 2:
+        return parents_a.copy()
+
+    cuts = rng.integers(1, length, size=count)
+    mask = np.arange(length) < cuts[:, None]
+    return np.where(mask, parents_a, parents_b)
+
+
+def blend_crossover(alpha=0.5):
+    """
+    Builds a BLX-alpha crossover for real-valued genomes: each gene is drawn
+    uniformly from the interval spanned by both parents, widened by ``alpha``
+    times its length on each side
+    """
+
+    def crossover(parents_a, parents_b, rng):
+        low = np.minimum(parents_a, parents_b)
+        high = np.maximum(parents_a, parents_b)
+        spread = alpha * (high - low)
+        return rng.uniform(low - spread, high + spread)
+
+    return crossover
+
+
+def gaussian_mutation(scale=1.0):
+    """
+    Builds a mutation that adds normal noise with standard deviation
+    ``scale`` to the masked genes
+    """
+
+    def mutation(population, mask, rng):
+        population[mask] += rng.normal(0.0, scale, size=int(mask.sum()))
+        return population
+
+    return mutation
+
+
+def bit_flip_mutation(population, mask, rng):  # pylint: disable=unused-argument
+    """
+    Flips the masked genes of a 0/1 or boolean population
+    """
+    if population.dtype == bool:
+        population[mask] = ~population[mask]
+    else:
+        population[mask] = 1 - population[mask]
+
+    return population
+
+
+def roulette_indices(fitness, k, rng):
+    """
+    Draws ``k`` indices with probability proportional to ``fitness``.
+    Negative values are shifted so the least fit row gets no chance, and
+    when every weight would be 0 all rows get the same chance, as in
+    ``pop_selectors.roullete``.
+    """
+    low = fitness.min()
+    if low < 0:
+        fitness = fitness - low
+    if not fitness.any():
+        fitness = np.ones(len(fitness))
+
+    cumulative = np.cumsum(fitness)
+    points = rng.random(k) * cumulative[-1]
+    indices = np.searchsorted(cumulative, points, side="right")
+    return np.minimum(indices, len(fitness) - 1)
+
+
+def tournament_indices(size=2):
+    """
+    Builds a selector that draws each index as the fittest of ``size``
+    random contenders
+    """
+
+    def selector(fitness, k, rng):
+        contenders = rng.integers(0, len(fitness), size=(k, size))
+        winners = np.argmax(fitness[contenders], axis=1)
+        return contenders[np.arange(k), winners]
+
+    return selector
+
+
+CROSSOVERS = {
+    "uniform": uniform_crossover,
+    "one_point": one_point_crossover,
+    "blend": blend_crossover(),
+}
+
+MUTATIONS = {
+    "gaussian": gaussian_mutation(),
+    "bit_flip": bit_flip_mutation,
+}
+
+SELECTORS = {
+    "roulette": roulette_indices,
+    "tournament": tournament_indices(),
+}
+
+
+# pylint: disable=too-many-instance-attributes
+class ArraySolver:
+    """
+    A Genetic Algorithm Solver whose population is a 2-D NumPy array, one
+    individual per row. Selection, crossover and mutation run as batched
+    array operations over the whole generation. It follows the same iterator
+    protocol as ``GASolver``.
+
+    Args:
+
+        initial_pop (array-like): The initial population, with shape
+            ``(population size, genome length)``.
+
+        goal (function): By default, a vectorized function that accepts the
+            whole population matrix and returns a 1-D array with the fitness
+            of each row.
+        target_value (numeric): The value you're looking for. When the fitness
+            of any row is equal to this, the solution has been found.
+        vectorized (bool, optional): Set it to False if ``goal`` accepts a
+            single row instead. Defaults to True.
+
+        mutation (str or function): ``"gaussian"`` (for float populations),
+            ``"bit_flip"`` (for 0/1 or boolean populations) or a
+            function ``mutation(population, mask, rng)`` that changes the genes
+            where the boolean ``mask`` is set and returns the population.
+        prob_mutation (float, 0 <= prob_mutation <= 1)): The probability of
+            a row being mutated.
+        gene_rate (float, optional): The probability of each gene of a mutated
+            row being changed. Defaults to 1, every gene.
+
+        crossover_ (str or function): ``"uniform"``, ``"one_point"``,
+            ``"blend"`` or a function ``crossover(parents_a, parents_b, rng)``
+            that returns one child for each pair of rows.
+
+        selector (str or function): ``"roulette"``, ``"tournament"`` or a
+            function ``selector(fitness, k, rng)`` that returns ``k`` row
+            indices.
+        selection_rate (float, 0 <= selection_rate <= 1): the rate of rows
+            that are selected to reproduce and compose the next generation.
+            Defaults to 0.5
+        min_select (integer, optional): if set, at least ``min_select`` rows
+            are selected.
+
+        bounds (tuple, optional): If given, every gene is clipped to
+            ``(lower, upper)`` after mutation.
+
+        max_steps (int, optional): If supplied, the solver will iterate for at
+            most ``max_steps``. The default is 0, which disables the limit.
+        full_state (bool, optional): If True, each step yields
+            ``current_state``, a dictionary of the whole population, instead
+            of a ``GenerationSummary``. Defaults to False.
+
+        random_seed (int, optional): Seeds the solver's own
+            ``numpy.random.Generator``, ``rng``.
+    """
+
+    # pylint: disable=too-many-arguments, too-many-locals
+    def __init__(
+        self,
+        initial_pop,
+        goal,
+        target_value,
+        mutation,
+        prob_mutation,
+        crossover_,
+        selector="roulette",
+        selection_rate=0.5,
+        min_select=0,
+        gene_rate=1.0,
+        bounds=None,
+        vectorized=True,
+        max_steps=0,
+        random_seed=None,
+        full_state=False,
+    ):
+        if np is None:
+            raise ImportError(
+                "ArraySolver requires NumPy, install it with `pip install numpy`"
+            )
+
+        self._fitness = None
+        self.population = initial_pop
+
+        self.goal = goal
+        self.vectorized = vectorized
+        self.target_value = target_value
+
+        self.mutation = MUTATIONS.get(mutation, mutation)
+        self.prob_mutation = prob_mutation
+        self.gene_rate = gene_rate
+        self.bounds = bounds
+
+        self.crossover_ = CROSSOVERS.get(crossover_, crossover_)
+
+        self.selector = SELECTORS.get(selector, selector)
+        self.selection_rate = selection_rate
+        self.min_select = min_select
+
+        self.max_steps = max_steps
+        self.steps = 0
+        self.full_state = full_state
+
+        self.rng = np.random.default_rng(random_seed)
+
+    @property
+    def population(self):
+        """
+        The population matrix. Replacing it discards the cached fitness.
+        """
+        return self._population
+
+    @population.setter
+    def population(self, value):
+        population = np.array(value)
+        if population.ndim != 2:
+            raise ValueError("The population must be a 2-D array, one row each")
+
+        self._population = population
+        self._fitness = None
+
+    @property
+    def fitness(self):
+        """
+        The fitness of every row, computed once per generation
+        """
+        if self._fitness is None:
+            if self.vectorized:
+                fitness = self.goal(self._population)
+            else:
+                fitness = [self.goal(row) for row in self._population]
+
+            self._fitness = np.asarray(fitness)
+
+        return self._fitness
+
+    @property
+    def current_state(self):
+        """
+        A dictionary from each row, as a tuple, to its fitness. Only for
+        compatibility with ``GASolver``; prefer ``population`` and ``fitness``
+        """
+        return dict(zip(map(tuple, self._population.tolist()), self.fitness.tolist()))
+
+    @property
+    def summary(self):
+        """
+        A ``GenerationSummary`` of the current population, computed with
+        array operations. ``best_individual`` is a tuple.
+        """
+        fitness = self.fitness
+        best_index = int(fitness.argmax())
+        distinct = len(np.unique(self._population, axis=0))
+
+        return GenerationSummary(
+            self.steps,
+            fitness[best_index].item(),
+            fitness.mean().item(),
+            fitness.min().item(),
+            tuple(self._population[best_index].tolist()),
+            distinct / len(self),
+        )
+
+    @property
+    def best_fit(self):
+        """
+        Returns the rows with the best fitness value and that value.
+        """
+        fitness = self.fitness
+        best_value = fitness.max()
+        return (self._population[fitness == best_value], best_value)
+
+    @property
+    def solution_found(self):
+        """
+        Returns True if any row has fitness == target_value
+        """
+        return bool(np.any(self.fitness == self.target_value))
+
+    @property
+    def solutions(self):
+        """
+        Returns the rows whose fitness == target_value
+        """
+        return self._population[self.fitness == self.target_value]
+
+    def select(self, replace=True):
+        """
+        Selects ``ceil(len(self) * selection_rate)`` rows, or ``min_select``
+        if that is larger, with ``selector``. If `replace` is True, the
+        population is replaced by them.
+        """
+        new_pop_size = ceil(len(self) * self.selection_rate)
+        if self.min_select:
+            new_pop_size = max(new_pop_size, self.min_select)
+
+        indices = self.selector(self.fitness, new_pop_size, self.rng)
+        new_pop = self._population[indices]
+
+        if replace:
+            self._population = new_pop
+            self._fitness = self.fitness[indices]
+
+        return new_pop
+
+    def crossover(self, count):
+        """
+        Returns ``count`` children of random pairs of distinct rows
+        """
+        size = len(self)
+        if count == 0 or size == 0:
+            return self._population[:0].copy()
+
+        first = self.rng.integers(0, size, size=count)
+        if size == 1:
+            second = first
+        else:
+            second = self.rng.integers(0, size - 1, size=count)
+            second += second >= first
+
+        parents = self._population
+        return self.crossover_(parents[first], parents[second], self.rng)
+
+    def mutate_pop(self):
+        """
+        Mutates each row with probability ``prob_mutation``; within a mutated
+        row, each gene changes with probability ``gene_rate``
+        """
+        rows, length = self._population.shape
+        mask = self.rng.random(rows) < self.prob_mutation
+        mask = np.repeat(mask[:, None], length, axis=1)
+        if self.gene_rate < 1:
+            mask &= self.rng.random((rows, length)) < self.gene_rate
+
+        if mask.any():
+            population = self.mutation(self._population, mask, self.rng)
+            if self.bounds is not None:
+                population = np.clip(population, *self.bounds)
+            self.population = population
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """
+        Runs one generation, just like ``GASolver.__next__``: selection,
+        crossover of random couples to refill the population and mutation.
+        Yields a ``GenerationSummary``, or ``current_state`` when
+        ``full_state`` is set.
+        """
+        if self.solution_found or self.max_steps and self.steps >= self.max_steps:
+            raise StopIteration
+
+        sibling_len = floor((1 - self.selection_rate) * len(self))
+
+        self.select()
+        siblings = self.crossover(sibling_len)
+        self.population = np.concatenate([self._population, siblings])
+        self.mutate_pop()
+
+        self.steps += 1
+
+        return self.current_state if self.full_state else self.summary
+
+    def __len__(self):
+        return len(self._population)
+
+
+__all__ = [
+    "ArraySolver",
+    "bit_flip_mutation",
+    "blend_crossover",
+    "gaussian_mutation",
+    "one_point_crossover",
+    "roulette_indices",
+    "tournament_indices",
+    "uniform_crossover",
+]
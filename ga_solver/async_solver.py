@@ -0,0 +1,221 @@
+"""
+Defines AsyncGASolver, a Genetic Algorithm Solver for goals that are
+coroutines, such as calls to a remote scoring service
+"""
+import asyncio
+
+from .ga_solver import GASolver
+
+_TIMED_OUT = object()
+
+
+def _not_awaited(individual):
+    raise RuntimeError(
+        f"The fitness of {individual!r} is unknown; await solver.evaluate() first"
+    )
+
+
+# pylint: disable=too-many-instance-attributes
+class AsyncGASolver(GASolver):
+    """
+    A ``GASolver`` whose ``goal`` is an ``async def`` function. Each
+    generation, the individuals whose fitness is not stored or memoized are
+    evaluated concurrently, then the usual selection, crossover and mutation
+    run on the known values. Iterate it with ``async for``.
+
+    Besides the arguments of ``GASolver``, it accepts:
+
+    Args:
+        goal (coroutine function): Accepts one member of the population and
+            returns its fitness.
+        goal_batch (coroutine function, optional): Accepts a list of members
+            and returns the list of their fitness, in the same order. When
+            given, it's used instead of ``goal``. If omitted and ``goal`` has
+            a ``batch`` attribute, that is used.
+        batch_size (int, optional): The largest list sent to ``goal_batch``.
+            The default is None, which sends every pending member at once.
+        concurrency (int, optional): How many calls to ``goal`` or
+            ``goal_batch`` may be running at the same time. Defaults to 10.
+        timeout (float, optional): Seconds each call may take. The default is
+            None, which waits forever.
+        fallback (optional): The fitness given to members whose call timed
+            out. It's kept out of the ``memo``, so they are evaluated again if
+            met in a later generation. The default is None, which raises
+            ``asyncio.TimeoutError`` instead.
+
+    ``goal_delta`` and ``selector`` remain synchronous. ``breed_fitness`` is
+    always off: with ``parallel_breeding``, children are evaluated here.
+    ``steady_state`` and ``surrogate`` are not supported.
+
+    The number of calls that timed out is kept in ``timeouts``. Properties
+    like ``best_fit`` only read stored values, so after changing
+    ``population`` by hand, ``await solver.evaluate()`` before using them.
+
+    >>> async for state in AsyncGASolver(...):
+    ...     print(state)
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        initial_pop,
+        goal,
+        target_value,
+        mutation,
+        prob_mutation,
+        crossover_,
+        selector,
+        goal_batch=None,
+        batch_size=None,
+        concurrency=10,
+        timeout=None,
+        fallback=None,
+        **kwargs,
+    ):
+        if kwargs.get("steady_state"):
+            raise ValueError("AsyncGASolver doesn't support steady_state")
+        if kwargs.get("surrogate") is not None:
+            raise ValueError("AsyncGASolver doesn't support surrogate")
+
+        self._async_goal = goal
+        self.goal_batch = goal_batch or getattr(goal, "batch", None)
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.fallback = fallback
+        self.timeouts = 0
+
+        super().__init__(
+            initial_pop,
+            _not_awaited,
+            target_value,
+            mutation,
+            prob_mutation,
+            crossover_,
+            selector,
+            **kwargs,
+        )
+        self.breed_fitness = False
+
+    @property
+    def goal(self):
+        """
+        The goal coroutine function. Replacing it invalidates every stored
+        fitness value.
+        """
+        return self._async_goal
+
+    @goal.setter
+    def goal(self, value):
+        self._async_goal = value
+        self._forget_fitness()
+
+    async def evaluate(self, individuals=None):
+        """
+        Evaluates the members of ``individuals``, the population by default,
+        whose fitness is unknown and returns the fitness of all of them
+        """
+        if individuals is not None:
+            return await self._evaluate_many(individuals)
+
+        population = self.population
+        unknown = population.unknown()
+        if unknown:
+            values = await self._evaluate_many([population[i] for i in unknown])
+            population.set_fitness(unknown, values)
+
+        return population.fitness
+
+    async def _evaluate_many(self, individuals):
+        store = self.fitness_store
+        keys = [store.key_of(indiv) for indiv in individuals]
+        pending = store.pending(individuals, keys)
+        if pending:
+            members = list(pending.values())
+            if self.goal_batch is not None:
+                values = await self._evaluate_batches(members)
+            else:
+                values = await self._evaluate_each(members)
+
+            computed = {}
+            timed_out = {}
+            for (key, member), value in zip(pending.items(), values):
+                if value is _TIMED_OUT:
+                    timed_out[key] = member
+                else:
+                    computed[key] = value
+
+            store.fill(computed, list(computed.values()))
+            store.fill(timed_out, [self.fallback] * len(timed_out), memoize=False)
+
+        return store.lookup(keys)
+
+    async def _call(self, semaphore, coroutine_function, argument):
+        """
+        Awaits ``coroutine_function(argument)`` within ``semaphore`` and
+        ``timeout``. Returns ``_TIMED_OUT`` if it took too long.
+        """
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    coroutine_function(argument), self.timeout
+                )
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                if self.fallback is None:
+                    raise
+                return _TIMED_OUT
+
+    async def _evaluate_each(self, members):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(
+            *(self._call(semaphore, self._async_goal, member) for member in members)
+        )
+
+    async def _evaluate_batches(self, members):
+        size = self.batch_size or len(members)
+        batches = [members[i : i + size] for i in range(0, len(members), size)]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *(self._call(semaphore, self.goal_batch, batch) for batch in batches)
+        )
+
+        values = []
+        for batch, result in zip(batches, results):
+            if result is _TIMED_OUT:
+                values.extend([_TIMED_OUT] * len(batch))
+            else:
+                values.extend(result)
+        return values
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        """
+        Runs one generation, just like ``GASolver.__next__``, evaluating the
+        population concurrently before and after it
+        """
+        generation = self._start_generation()
+        with self._stage("evaluate"):
+            await self.evaluate()
+
+        try:
+            self._check_stop()
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+        self._reproduce()
+
+        with self._stage("evaluate"):
+            await self.evaluate()
+            result = self.current_state if self.full_state else self.summary
+
+        return self._finish_generation(generation, result)
+
+    def __next__(self):
+        raise TypeError("AsyncGASolver must be iterated with `async for`")
+
+
+__all__ = ["AsyncGASolver"]
@@ -0,0 +1,112 @@
+"""
+Provides the breeding stage used by ``GASolver`` when ``parallel_breeding``
+is enabled. Couples are split in batches and every batch is crossed over,
+mutated and, optionally, evaluated by the same worker, so the offspring come
+back with their fitness already attached.
+
+Each batch has its own seed, which drives its mutation rolls and, in worker
+processes, the global ``random`` module, so operators built on it breed the
+same children for the same seed. Operators that keep their own
+``random.Random`` get a copy of it in every batch sent to a process: build
+them on the global module when they must run there.
+"""
+import os
+import random
+from functools import partial
+from random import Random
+
+from .fitness import Mutant
+
+NOT_EVALUATED = None
+
+BATCH_SIZE = 16
+"""How many couples each batch holds by default. It doesn't depend on the
+number of workers, so a seed gives the same children on any machine."""
+
+
+# pylint: disable=too-many-arguments
+def breed_batch(
+    crossover, mutation, prob_mutation, goal, couples, random_seed, caller=None
+):
+    """
+    Produces one child per couple. Runs inside the workers, so it must stay
+    a module-level function.
+
+    Args:
+        crossover (function): Takes two parents and returns their child
+        mutation (function): Takes one child and returns it mutated
+        prob_mutation (float): Chance of ``mutation`` being applied to a child
+        goal (function, optional): If given, every child is evaluated too
+        couples (list): Pairs of parents
+        random_seed (int): Seeds the batch's own stream of mutation rolls, so
+            results don't depend on which worker runs the batch
+        caller (int, optional): The id of the process that split the
+            batches. When the batch runs in another process, that process's
+            global ``random`` is seeded from ``random_seed`` too.
+
+    Returns:
+        A list of ``(child, fitness, mutated)`` triples. ``fitness`` is
+        ``NOT_EVALUATED`` when no ``goal`` was given and ``mutated`` tells
+        whether ``mutation`` was applied.
+    """
+    rng = Random(random_seed)
+    operators_seed = rng.getrandbits(64)
+    if caller is not None and caller != os.getpid():
+        random.seed(operators_seed)
+
+    result = []
+
+    for parent_a, parent_b in couples:
+        child = crossover(parent_a, parent_b)
+        mutated = rng.random() < prob_mutation
+        if mutated:
+            child = mutation(child)
+            if isinstance(child, Mutant):
+                child = child.genome
+
+        fitness = goal(child) if goal is not None else NOT_EVALUATED
+        result.append((child, fitness, mutated))
+
+    return result
+
+
+# pylint: disable=too-many-arguments
+def breed(
+    couples,
+    crossover,
+    mutation,
+    prob_mutation,
+    rng,
+    goal=None,
+    executor=None,
+    batch_size=None,
+):
+    """
+    Splits ``couples`` in batches and runs ``breed_batch`` on each of them,
+    on ``executor`` if given. Batches hold ``batch_size`` couples, by
+    default ``BATCH_SIZE``. Every batch gets its own seed, drawn from
+    ``rng``, so the children don't depend on which worker runs each batch.
+
+    Returns:
+        A list of ``(child, fitness, mutated)`` triples, in the same order as
+        ``couples``
+    """
+    if not couples:
+        return []
+
+    batch_size = batch_size or BATCH_SIZE
+    batches = [couples[i : i + batch_size] for i in range(0, len(couples), batch_size)]
+    batch_seeds = [rng.getrandbits(64) for _ in batches]
+
+    task = partial(
+        breed_batch, crossover, mutation, prob_mutation, goal, caller=os.getpid()
+    )
+    if executor is None:
+        results = map(task, batches, batch_seeds)
+    else:
+        results = executor.map(task, batches, batch_seeds)
+
+    return [child for batch in results for child in batch]
+
+
+__all__ = ["BATCH_SIZE", "breed", "breed_batch", "NOT_EVALUATED"]
@@ -0,0 +1,214 @@
+"""
+Provides checkpoints for ``GASolver``: compact binary snapshots of a run
+that can be resumed later
+
+A checkpoint file is made of a magic string, the length of a JSON header, the
+header itself and the data blocks it describes. Populations of numbers, or of
+same-length tuples of numbers, and numeric fitness values are stored as raw
+8-byte-aligned arrays, which can be memory-mapped when loading. Anything else
+is pickled.
+"""
+import json
+import mmap as _mmap
+import os
+import pickle
+from array import array
+from numbers import Integral
+from struct import Struct
+
+from .fitness import UNKNOWN
+
+MAGIC = b"GASCKPT1"
+VERSION = 1
+
+_LENGTH = Struct("<Q")
+_ALIGNMENT = 8
+_INT_RANGE = (-(2 ** 63), 2 ** 63 - 1)
+
+
+def _typecode(values):
+    """
+    Returns the array typecode able to hold all ``values`` exactly, or None
+    """
+    if all(isinstance(x, Integral) and not isinstance(x, bool) for x in values):
+        low, high = _INT_RANGE
+        if all(low <= x <= high for x in values):
+            return "q"
+        return None
+
+    if all(isinstance(x, float) for x in values):
+        return "d"
+
+    return None
+
+
+def _encode(values):
+    """
+    Returns the header entry and the bytes of a sequence of values
+    """
+    values = list(values)
+    typecode = _typecode(values)
+    if values and typecode:
+        data = array(typecode, values).tobytes()
+        return {"kind": "array", "typecode": typecode}, data
+
+    if values and all(isinstance(x, tuple) for x in values):
+        width = len(values[0])
+        if width and all(len(x) == width for x in values):
+            flat = [gene for row in values for gene in row]
+            typecode = _typecode(flat)
+            if typecode:
+                header = {"kind": "rows", "typecode": typecode, "width": width}
+                return header, array(typecode, flat).tobytes()
+
+    return {"kind": "pickle"}, pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _decode(entry, buffer):
+    """
+    Rebuilds the values encoded by ``_encode``. ``buffer`` is either bytes or
+    a memoryview over a memory-mapped file.
+    """
+    if entry["kind"] == "pickle":
+        return pickle.loads(buffer)
+
+    values = memoryview(buffer).cast(entry["typecode"])
+    if entry["kind"] == "array":
+        return values
+
+    width = entry["width"]
+    return [tuple(values[i : i + width]) for i in range(0, len(values), width)]
+
+
+def snapshot(solver):
+    """
+    Returns the parts of ``solver`` that go into a checkpoint. Only shallow
+    copies are made, so it's cheap enough to call between generations.
+    """
+    stats = solver.stats
+    return {
+        "steps": solver.steps,
+        "random_seed": solver.random_seed,
+        "rng_state": solver.rng.getstate(),
+        "population": list(solver.population),
+        "fitness": solver.fitness,
+        "predicted": solver.predicted,
+        "stats": {
+            "generations": stats.generations,
+            "crossovers": stats.crossovers,
+            "mutations": stats.mutations,
+        },
+    }
+
+
+def restore(solver, state):
+    """
+    Puts a ``snapshot`` back into ``solver``, whose population must be the
+    one in the snapshot. Predicted fitness values are dropped, so they're
+    computed again.
+    """
+    population = solver.population
+    population.set_fitness(range(len(population)), state["fitness"])
+    predicted = state.get("predicted", ())
+    population.set_fitness(predicted, [UNKNOWN] * len(predicted))
+    solver.steps = state["steps"]
+    solver.random_seed = state["random_seed"]
+    solver.rng.setstate(state["rng_state"])
+
+    for name, value in state["stats"].items():
+        setattr(solver.stats, name, value)
+
+
+def write_checkpoint(state, path):
+    """
+    Writes a ``snapshot`` to ``path``. The file is replaced atomically, so a
+    crash while writing never leaves a broken checkpoint behind.
+    """
+    header = {
+        "version": VERSION,
+        "steps": state["steps"],
+        "random_seed": state["random_seed"],
+        "rng_state": [state["rng_state"][0], list(state["rng_state"][1])]
+        + list(state["rng_state"][2:]),
+        "stats": state["stats"],
+        "predicted": state.get("predicted", []),
+        "blocks": {},
+    }
+
+    blocks = []
+    offset = 0
+    for name in ("population", "fitness"):
+        entry, data = _encode(state[name])
+        entry.update(offset=offset, size=len(data))
+        header["blocks"][name] = entry
+        padding = -len(data) % _ALIGNMENT
+        blocks.append(data + b"\0" * padding)
+        offset += len(data) + padding
+
+    encoded = json.dumps(header).encode()
+    encoded += b" " * (-(len(MAGIC) + _LENGTH.size + len(encoded)) % _ALIGNMENT)
+
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as output:
+        output.write(MAGIC)
+        output.write(_LENGTH.pack(len(encoded)))
+        output.write(encoded)
+        for block in blocks:
+            output.write(block)
+
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path, mmap=False):
+    """
+    Reads the checkpoint at ``path``.
+
+    Args:
+        path (str): The checkpoint file
+        mmap (bool, optional): If True, array blocks are memoryviews over the
+            memory-mapped file instead of being read into memory. Useful to
+            inspect large populations. The mapping lives as long as they do.
+
+    Returns:
+        A dictionary with ``steps``, ``random_seed``, ``rng_state``,
+        ``population``, ``fitness``, ``stats`` and ``predicted``, the indices
+        of the members whose fitness is a guess of a ``surrogate``
+    """
+    with open(path, "rb") as source:
+        if source.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a GASolver checkpoint")
+
+        (length,) = _LENGTH.unpack(source.read(_LENGTH.size))
+        header = json.loads(source.read(length))
+        start = len(MAGIC) + _LENGTH.size + length
+
+        if mmap:
+            data = memoryview(_mmap.mmap(source.fileno(), 0, access=_mmap.ACCESS_READ))
+        else:
+            source.seek(start)
+            data = memoryview(source.read())
+            start = 0
+
+    if header["version"] != VERSION:
+        raise ValueError(f"Unsupported checkpoint version {header['version']}")
+
+    state = {
+        "steps": header["steps"],
+        "random_seed": header["random_seed"],
+        "rng_state": (
+            header["rng_state"][0],
+            tuple(header["rng_state"][1]),
+            *header["rng_state"][2:],
+        ),
+        "stats": header["stats"],
+        "predicted": header.get("predicted", []),
+    }
+
+    for name, entry in header["blocks"].items():
+        begin = start + entry["offset"]
+        state[name] = _decode(entry, data[begin : begin + entry["size"]])
+
+    return state
+
+
+__all__ = ["load_checkpoint", "restore", "snapshot", "write_checkpoint"]
@@ -0,0 +1,486 @@
+"""
+Provides the FitnessStore and FitnessMemo classes, which keep the fitness
+values of a population so the goal function is evaluated as little as possible
+"""
+from collections import OrderedDict
+from math import ceil
+from os import cpu_count
+from sys import getsizeof
+
+UNKNOWN = object()
+"""The fitness of an individual that wasn't evaluated yet"""
+
+
+def _identity(individual):
+    return individual
+
+
+# pylint: disable=too-few-public-methods
+class _Unhashable:
+    """
+    Stands for the key of an individual that can't be hashed. Every instance
+    is different, so such individuals are never shared or memoized.
+    """
+
+    __slots__ = ()
+
+
+# pylint: disable=too-few-public-methods
+class Mutant:
+    """
+    What a mutation function may return instead of the bare mutated genome,
+    to describe what it changed. When the solver has a ``goal_delta``, the
+    mutant's fitness is derived from its parent's fitness and ``change``,
+    instead of calling ``goal``.
+
+    Args:
+        genome: The mutated individual
+        change: Anything ``goal_delta`` understands, e.g. the positions that
+            were touched
+
+    >>> def swap_mutation(board):
+    ...     i, j = sample(range(len(board)), 2)
+    ...     board = list(board)
+    ...     board[i], board[j] = board[j], board[i]
+    ...     return Mutant(tuple(board), (i, j))
+    """
+
+    __slots__ = ("genome", "change")
+
+    def __init__(self, genome, change):
+        self.genome = genome
+        self.change = change
+
+    def __repr__(self):
+        return f"Mutant({self.genome!r}, {self.change!r})"
+
+
+class FitnessMemo:
+    """
+    FitnessMemo remembers goal values across generations, so an individual
+    that shows up again (a survivor, a repeated genome) never reaches the
+    goal function twice during a run. It is bounded in entries and/or bytes.
+
+    Args:
+        key (function, optional): Maps an individual to a hashable key. Use it
+            when the genomes themselves are not hashable, e.g. ``tuple``
+            for lists. Defaults to the individual itself.
+        max_entries (int, optional): Maximum number of stored values. The
+            default is 0, which disables the limit.
+        max_bytes (int, optional): Maximum approximate memory used by the
+            stored keys and values, as measured by ``sizeof``. The default is
+            0, which disables the limit.
+        policy (str): Which entry to evict when a limit is reached. ``"lru"``
+            (the default) drops the least recently used value, ``"lfu"`` the
+            least frequently used one.
+        ttl (int, optional): If set, values older than ``ttl`` generations are
+            discarded and computed again.
+        sizeof (function, optional): Returns the size in bytes of a key or a
+            value. Defaults to ``sys.getsizeof``.
+
+    >>> memo = FitnessMemo(max_entries=2)
+    >>> memo.put("a", 1)
+    >>> memo.put("b", 2)
+    >>> memo.get("a")
+    1
+    >>> memo.put("c", 3)
+    >>> "b" in memo
+    False
+    """
+
+    # pylint: disable=too-many-arguments, too-many-instance-attributes
+    def __init__(
+        self, key=None, max_entries=0, max_bytes=0, policy="lru", ttl=0, sizeof=None
+    ):
+        if policy not in ("lru", "lfu"):
+            raise ValueError(f"Unknown eviction policy {policy!r}")
+
+        self.key = key or _identity
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.ttl = ttl
+        self.sizeof = sizeof or getsizeof
+
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+
+        # key -> (value, generation it was stored, size in bytes)
+        self._entries = {}
+        # LRU: one ordered bucket. LFU: frequency -> ordered bucket
+        self._order = OrderedDict()
+        self._freq = {}
+        self._buckets = {}
+        self._min_freq = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def hit_rate(self):
+        """
+        The fraction of lookups that were answered by the memo
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, key, default=None):
+        """
+        Returns the stored value for ``key`` or ``default`` if there's none
+        """
+        try:
+            value, born, _ = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        if self.ttl and self.generation - born >= self.ttl:
+            self._remove(key)
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self._touch(key)
+        return value
+
+    def put(self, key, value):
+        """
+        Stores ``value`` under ``key``, evicting other entries if the memo
+        goes over its limits
+        """
+        if key in self._entries:
+            self._remove(key)
+
+        size = self.sizeof(key) + self.sizeof(value)
+        while self._entries and self._over_limit(size):
+            self._remove(self._victim())
+            self.evictions += 1
+
+        self._entries[key] = (value, self.generation, size)
+        self.nbytes += size
+
+        if self.policy == "lru":
+            self._order[key] = None
+        else:
+            self._freq[key] = 1
+            self._buckets.setdefault(1, OrderedDict())[key] = None
+            self._min_freq = 1
+
+    def next_generation(self):
+        """
+        Advances the memo's clock by one generation. Used for ``ttl``.
+        """
+        self.generation += 1
+
+    def clear(self):
+        """
+        Forgets every stored value. Statistics are kept.
+        """
+        self._entries.clear()
+        self._order.clear()
+        self._freq.clear()
+        self._buckets.clear()
+        self._min_freq = 0
+        self.nbytes = 0
+
+    def _over_limit(self, incoming):
+        if self.max_entries and len(self._entries) >= self.max_entries:
+            return True
+
+        return bool(self.max_bytes and self.nbytes + incoming > self.max_bytes)
+
+    def _victim(self):
+        if self.policy == "lru":
+            return next(iter(self._order))
+
+        while not self._buckets.get(self._min_freq):
+            self._min_freq += 1
+
+        return next(iter(self._buckets[self._min_freq]))
+
+    def _touch(self, key):
+        if self.policy == "lru":
+            self._order.move_to_end(key)
+            return
+
+        freq = self._freq[key]
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+
+        self._freq[key] = freq + 1
+        self._buckets.setdefault(freq + 1, OrderedDict())[key] = None
+
+    def _remove(self, key):
+        _, _, size = self._entries.pop(key)
+        self.nbytes -= size
+
+        if self.policy == "lru":
+            del self._order[key]
+            return
+
+        freq = self._freq.pop(key)
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+
+
+# pylint: disable=too-many-instance-attributes
+class FitnessStore:
+    """
+    FitnessStore holds the goal value of every individual of the current
+    generation. An individual is only sent to ``goal`` the first time it is
+    seen; every later lookup is served from the store.
+
+    Args:
+        goal (function): A function that accepts one member of the population
+            and returns its current value.
+        memo (FitnessMemo, optional): If supplied, values missing from the
+            store are looked up in the memo before calling ``goal``, and every
+            computed value is saved in it. Its ``key`` function is also used
+            to identify individuals in the store.
+        executor (concurrent.futures.Executor, optional): If supplied, the
+            individuals missing from the store are sent to it, in chunks, to be
+            evaluated in parallel. A process pool requires ``goal`` and the
+            individuals to be picklable.
+        chunk_size (int, optional): How many individuals go to the executor
+            at a time. By default the misses are split in about four chunks
+            per CPU.
+        goal_delta (function, optional): A function ``goal_delta(parent,
+            parent_fitness, change)`` returning the fitness of a ``Mutant`` of
+            ``parent``. Used by ``compute_delta``. Derived values are counted in
+            ``deltas``, not in ``misses``.
+        goal_batch (function, optional): A function that accepts a list of
+            individuals and returns the list of their fitness, in the same
+            order. When given, it's used instead of ``goal``: the misses of
+            each ``evaluate`` are sent to it in as few calls as possible.
+        batch_size (int, optional): The longest list sent to ``goal_batch``.
+            The default is None, which sends all the misses at once, or one
+            chunk per executor task when there's an ``executor``.
+
+    Individuals that can't be hashed, such as lists, may be evaluated too, but
+    each of them is sent to ``goal`` every time it's looked up, unless the
+    memo's ``key`` turns them into something hashable.
+
+    >>> store = FitnessStore(lambda x: x * 2)
+    >>> store.evaluate([1, 2, 1])
+    [2, 4, 2]
+    >>> (store.hits, store.misses)
+    (1, 2)
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        goal,
+        memo=None,
+        executor=None,
+        chunk_size=None,
+        goal_delta=None,
+        goal_batch=None,
+        batch_size=None,
+    ):
+        self.goal = goal
+        self.goal_batch = goal_batch
+        self.batch_size = batch_size
+        self.memo = memo
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self.goal_delta = goal_delta
+        self.deltas = 0
+        self.key = memo.key if memo is not None else _identity
+        self.hits = 0
+        self.misses = 0
+        self._values = {}
+
+    def __getitem__(self, individual):
+        """
+        Returns the fitness of ``individual``, computing it if needed
+        """
+        return self.evaluate([individual])[0]
+
+    def __contains__(self, individual):
+        return self.key_of(individual) in self._values
+
+    def key_of(self, individual):
+        """
+        Returns the key that identifies ``individual`` in the store. An
+        unhashable key is replaced by a new, unique placeholder.
+        """
+        key = self.key(individual)
+        try:
+            hash(key)
+        except TypeError:
+            return _Unhashable()
+        return key
+
+    def lookup(self, keys):
+        """
+        Returns the stored values of ``keys``, as given by ``key_of``
+        """
+        values = self._values
+        return [values[key] for key in keys]
+
+    def __len__(self):
+        return len(self._values)
+
+    def evaluate(self, individuals):
+        """
+        Returns a list with the fitness of every member of ``individuals``,
+        in the same order. The members that are neither in the store nor in
+        the memo are evaluated together, in a single batch.
+        """
+        keys = [self.key_of(indiv) for indiv in individuals]
+        pending = self.pending(individuals, keys)
+
+        if pending:
+            self.fill(pending, self._compute_many(list(pending.values())))
+
+        return self.lookup(keys)
+
+    def pending(self, individuals, keys=None):
+        """
+        Returns a dictionary from key to individual with the members of
+        ``individuals`` that are neither in the store nor in the memo. Values
+        found in the memo are brought into the store on the way.
+        """
+        if keys is None:
+            keys = [self.key_of(indiv) for indiv in individuals]
+
+        values = self._values
+        pending = {}
+
+        for key, indiv in zip(keys, individuals):
+            if key in values or key in pending:
+                self.hits += 1
+                continue
+
+            value = self._recall(key)
+            if value is UNKNOWN:
+                pending[key] = indiv
+            else:
+                self.hits += 1
+                values[key] = value
+
+        return pending
+
+    def fill(self, pending, computed, memoize=True):
+        """
+        Stores the ``computed`` fitness of the ``pending`` individuals, as
+        returned by ``pending``. Each of them counts as a miss. If ``memoize``
+        is False, the values are kept out of the memo.
+        """
+        self.misses += len(pending)
+        for key, value in zip(pending, computed):
+            self._store(key, value, memoize)
+
+    def compute_delta(self, individual, parent, change, parent_fitness=UNKNOWN):
+        """
+        Stores and returns the fitness of ``individual``, a mutant of
+        ``parent``, using ``goal_delta``. Only possible when there's a
+        ``goal_delta`` and the fitness of ``parent`` is either given or
+        already stored; otherwise returns ``UNKNOWN``.
+        """
+        if self.goal_delta is None:
+            return UNKNOWN
+
+        key = self.key_of(individual)
+        if key in self._values:
+            return self._values[key]
+
+        if parent_fitness is UNKNOWN:
+            parent_fitness = self._values.get(self.key_of(parent), UNKNOWN)
+            if parent_fitness is UNKNOWN:
+                return UNKNOWN
+
+        value = self.goal_delta(parent, parent_fitness, change)
+        self.deltas += 1
+        self._store(key, value)
+
+        return value
+
+    def record(self, individual, value):
+        """
+        Stores ``value`` as the fitness of ``individual`` when ``goal`` was
+        called elsewhere, e.g. by a breeding worker. Counts as a miss.
+        """
+        self.misses += 1
+        self._store(self.key_of(individual), value)
+
+    def retain(self, individuals):
+        """
+        Drops every stored value whose individual is not in ``individuals``.
+        Called whenever the population is replaced, so the store never
+        grows beyond the size of the current generation.
+        """
+        alive = set(map(self.key_of, individuals))
+        self._values = {k: v for k, v in self._values.items() if k in alive}
+
+    def clear(self):
+        """
+        Forgets all the stored values. The hit and miss counters are kept.
+        """
+        self._values = {}
+
+    def _store(self, key, value, memoize=True):
+        self._values[key] = value
+        if memoize and self.memo is not None and not isinstance(key, _Unhashable):
+            self.memo.put(key, value)
+
+    def _recall(self, key):
+        if self.memo is None or isinstance(key, _Unhashable):
+            return UNKNOWN
+
+        return self.memo.get(key, UNKNOWN)
+
+    def _compute_many(self, individuals):
+        if self.goal_batch is not None:
+            return self._compute_batches(individuals)
+
+        if self.executor is None or len(individuals) == 1:
+            return [self.goal(indiv) for indiv in individuals]
+
+        chunk_size = self.chunk_size or self._default_chunk(len(individuals))
+        return list(self.executor.map(self.goal, individuals, chunksize=chunk_size))
+
+    def _compute_batches(self, individuals):
+        size = self.batch_size
+        if not size:
+            size = len(individuals)
+            if self.executor is not None:
+                size = self.chunk_size or self._default_chunk(size)
+
+        batches = [individuals[i : i + size] for i in range(0, len(individuals), size)]
+        if self.executor is None or len(batches) == 1:
+            results = map(self.goal_batch, batches)
+        else:
+            results = self.executor.map(self.goal_batch, batches)
+
+        values = []
+        for batch, result in zip(batches, results):
+            result = list(result)
+            if len(result) != len(batch):
+                raise ValueError(
+                    f"goal_batch returned {len(result)} values for {len(batch)} "
+                    "individuals"
+                )
+            values.extend(result)
+
+        return values
+
+    @staticmethod
+    def _default_chunk(count):
+        return ceil(count / (4 * (cpu_count() or 1)))
+
+
+__all__ = ["FitnessMemo", "FitnessStore", "UNKNOWN"]
@@ -1,11 +1,23 @@
 """
 Defines the main Genetic Algorithm Solver class
 """
-from itertools import combinations
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from math import ceil, floor
-from random import choices, random, seed
-
-# pylint: disable=too-many-instance-attributes
+from random import Random
+from time import perf_counter, process_time
+
+from .breeding import NOT_EVALUATED, breed
+from .checkpoint import load_checkpoint, restore, snapshot, write_checkpoint
+from .fitness import FitnessStore, Mutant
+from .mating import random_pairs
+from .multi_objective import non_dominated_sort
+from .pop_selectors import select_indices
+from .population import UNKNOWN, Population
+from .replacement import SteadyState, elite_indices
+from .stats import GenerationSummary, SolverStats
+
+# pylint: disable=too-many-instance-attributes, too-many-public-methods
 class GASolver:
     """
     A simple Genetic Algorithm Solver. It accepts an initial population, and several
@@ -13,16 +25,48 @@ class GASolver:
 
     Args:
 
-        initial_pop (list): The elements of the initial population.
+        initial_pop (list): The elements of the initial population. They
+            don't need to be hashable, so lists and arrays are fine, and
+            duplicates are kept as separate members.
 
         goal (function): A function that accepts one member of the population
-            and returns its current value.
+            and returns its current value. It may be None when ``goal_batch``
+            is given.
+        goal_batch (function, optional): A function that accepts a list of
+            members and returns the list of their values, in the same order.
+            When given, it's used instead of ``goal``, with only the members
+            whose fitness is still unknown, usually once per generation.
+            Handy when each call has a fixed cost, like loading a model or
+            querying a database.
+        batch_size (int, optional): The longest list sent to ``goal_batch``,
+            to bound its memory use. By default all the unknown members are
+            sent at once.
         target_value (numeric): The value you're looking for. When the goal(x)
             for any member x of the population is equal to this, the solution
             has been found.
+        tolerance (float, optional): If set, a goal(x) within ``tolerance``
+            of ``target_value`` is good enough. Useful for real-valued goals.
+        surrogate (Prescreen, optional): If supplied, a model learns from the
+            values returned by ``goal`` and predicts the fitness of new
+            members, and only the most promising of them are evaluated. The
+            rest keep the prediction, are listed in ``predicted`` and never
+            count as solutions. See ``ga_solver.surrogate``. Not supported
+            with ``steady_state``.
+        archive (ParetoArchive, optional): For multi-objective runs, where
+            ``goal`` returns a tuple of values to maximize. The non-dominated
+            members of every generation are added to it, and it's read back
+            by ``pareto_front``. Use it with a selector that understands
+            tuples, such as ``multi_objective.nsga2``.
 
         mutation (function): A callable that accepts one member of the population
-            and returns a mutated value of that member.
+            and returns a mutated value of that member. It may also return a
+            ``Mutant`` wrapping the mutated value and a description of the
+            change, to be used by ``goal_delta``.
+        goal_delta (function, optional): A function ``goal_delta(parent,
+            parent_fitness, change)`` that computes the fitness of a ``Mutant``
+            from its parent's, usually much faster than ``goal``. Used whenever
+            ``mutation`` returns a ``Mutant`` of a member whose fitness is
+            known. The number of uses is in ``fitness_store.deltas``.
         prob_mutation (float, 0 <= prob_mutation <= 1)): The probability of a
             mutation occur in any individual. Every time that the ``mutation``
             function is invoked, there's ``prob_mutation`` chance of it actually
@@ -33,26 +77,127 @@ class GASolver:
 
         selector: (function): A function that receives a dictionary containing
             the current population and their fitness values and returns one
-            selected individual. Some of the classic selection functions
-            can be found in the ``pop_selectors`` submodule
+            selected individual. It's called with a ``random_seed`` keyword
+            drawn from ``rng``. If it has a ``select_many`` attribute, that
+            batched version is used instead to draw the whole selection in
+            one call. When the members can't be dictionary keys, the
+            dictionary maps each member's index to its fitness instead. Some
+            of the classic selection functions can be found in the
+            ``pop_selectors`` submodule
         selection_rate (float, 0 <= selection_rate <= 1): the rate of individuals
             in the current population that will be selected to reproduce and
             compose the next. Defaults to 0.5
         min_select (integer, optional): if set, ``selector`` will select at least
             ``min_select`` members of the current population to form the next
 
+        mating (function, optional): Chooses the couples that reproduce. It
+            receives the fitness values of the selected members, the number of
+            couples needed and the source of randomness, and returns pairs of
+            indices. Defaults to ``mating.random_pairs``; use
+            ``mating.all_pairs`` to reproduce runs of older versions. See the
+            ``mating`` submodule for other schemes.
+
+        elitism (int, optional): How many of the fittest members are carried
+            over to the next generation unchanged, without being mutated or
+            evaluated again. They take the place of as many siblings. The
+            default is 0, no elitism.
+        steady_state (int, optional): If set, each step replaces only the
+            ``steady_state`` least fit members by as many children, instead of
+            the whole generation. Parents are picked by ``selector`` and paired
+            by ``mating``; ``selection_rate`` is not used. The worst and best
+            members are tracked in heaps, so the cost of a step grows with the
+            number of children rather than the population size, as long as
+            ``selector`` has a ``select_many`` that doesn't look at every
+            member, such as ``pop_selectors.tournament``. ``elitism`` members
+            are never replaced. The members on target are counted as they're
+            replaced, so the run stops, like a generational one, as soon as
+            any member is on target. The steps always run in this process.
+
         max_steps (int, optional): If supplied, the solver will iterate for at
             most ``max_steps``. The default is 0, which is the value that disable
             the limit in steps.
-
-        random_seed (int, optional): If provided, the seed of Python's PRNG will
-            be set to this. In practice you _only_ want to set this value when
-            you need reproducible runs. Useful for testing
+        stop_when (list, optional): Extra stopping criteria, checked after each
+            step, such as the ``NoImprovement``, ``WallClock``,
+            ``EvaluationBudget`` and ``DiversityCollapse`` of
+            ``ga_solver.stopping``. The solver stops as soon as any of them
+            is met. Why it stopped is kept in ``stop_reason``.
+
+        random_seed (int, optional): If provided, the solver's own PRNG, ``rng``,
+            is seeded with this. In practice you _only_ want to set this value
+            when you need reproducible runs. Useful for testing. Python's
+            global PRNG is never touched, so ``mutation`` and ``crossover_``
+            should use their own ``random.Random`` if they need to be
+            reproducible too.
+
+        memo (FitnessMemo, optional): If supplied, goal values are remembered
+            across generations, so a genome that was already scored never
+            reaches ``goal`` again while it stays in the memo. See
+            ``ga_solver.fitness.FitnessMemo`` for its size limits and stats.
+
+        executor (concurrent.futures.Executor, optional): If supplied, the
+            individuals of each generation that still need a goal value are
+            evaluated on it, in parallel. The solver doesn't shut it down.
+        workers (int, optional): If set and no ``executor`` is given, a
+            ``ProcessPoolExecutor`` with this many processes is created and
+            reused by every generation. Call ``close()``, or use
+            the solver as a context manager, to shut it down. ``goal`` and
+            the individuals must be picklable.
+        chunk_size (int, optional): How many individuals are sent to the
+            executor at a time. See ``ga_solver.fitness.FitnessStore``.
+        parallel_breeding (bool, optional): If True, the couples of every step
+            are sent to the executor in batches, and each worker runs the
+            crossover, the mutation and the goal of its children at once.
+            Each batch draws its mutation rolls from its own seeded stream,
+            which also seeds ``random`` in worker processes; see
+            ``ga_solver.breeding``. ``crossover_`` and ``mutation`` must be
+            picklable when using processes. Without an executor the batches
+            run in this process.
+        breed_fitness (bool, optional): Whether workers also evaluate the
+            children when ``parallel_breeding`` is on. Defaults to True.
+            Ignored with ``goal_batch``, whose batches are always sent from
+            this process.
+
+        profile_every (int, optional): Time each stage of every
+            ``profile_every``-th generation and measure its diversity. The
+            default is 0, which disables profiling; the counters in ``stats``
+            are collected anyway.
+        on_generation_start (function, optional): Called with the solver
+            before each step.
+        on_generation_end (function, optional): Called with the solver and the
+            step's ``GenerationStats`` after each step.
+        on_stage (function, optional): Called with the solver, the name of a
+            stage and the seconds it took, after each stage of a profiled
+            generation. The stages are ``evaluate``, ``select``, ``mating``,
+            ``crossover`` and ``mutate``, or ``breed`` instead of the last two
+            when ``parallel_breeding`` is on.
+
+        full_state (bool, optional): If True, each step yields
+            ``current_state``, a dictionary with the whole population, as
+            older versions did. By default each step yields a
+            ``GenerationSummary``, which is much cheaper for large
+            populations.
+        sinks (list, optional): Functions that receive the
+            ``GenerationSummary`` of every step as soon as it ends, such as
+            the ``JSONLinesSink`` and ``QueueSink`` of ``ga_solver.sinks``.
+            The solver doesn't close them.
+
+        checkpoint_every (int, optional): If set, a checkpoint is saved to
+            ``checkpoint_path`` every ``checkpoint_every`` steps. The file is
+            written by a background thread, so the steps go on meanwhile.
+        checkpoint_path (str, optional): Where automatic checkpoints go.
+
+    Every goal value computed for the current generation is kept in a
+    ``FitnessStore``, so ``goal`` runs at most once per individual per
+    generation. The number of lookups served from it and the number of
+    actual ``goal`` calls are available as ``fitness_hits`` and
+    ``fitness_misses``.
+
+    Statistics about each step, such as goal, crossover and mutation counts and,
+    when profiling, the time spent on each stage, are kept in ``stats``, a
+    ``ga_solver.stats.SolverStats``.
     """
 
-    __current_state = []
-
-    # pylint: disable=too-many-arguments, bad-continuation
+    # pylint: disable=too-many-arguments, too-many-locals, bad-continuation
     def __init__(
         self,
         initial_pop,
@@ -66,11 +211,51 @@ class GASolver:
         min_select=0,
         max_steps=0,
         random_seed=None,
+        mating=random_pairs,
+        memo=None,
+        executor=None,
+        workers=0,
+        chunk_size=None,
+        parallel_breeding=False,
+        breed_fitness=True,
+        profile_every=0,
+        on_generation_start=None,
+        on_generation_end=None,
+        on_stage=None,
+        checkpoint_every=0,
+        checkpoint_path=None,
+        goal_delta=None,
+        elitism=0,
+        steady_state=0,
+        full_state=False,
+        sinks=(),
+        tolerance=0,
+        stop_when=(),
+        goal_batch=None,
+        batch_size=None,
+        archive=None,
+        surrogate=None,
     ):
+        if executor is None and workers:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            self._owned_executor = executor
+        else:
+            self._owned_executor = None
+
+        self.fitness_store = FitnessStore(
+            goal,
+            memo=memo,
+            executor=executor,
+            chunk_size=chunk_size,
+            goal_delta=goal_delta,
+            goal_batch=goal_batch,
+            batch_size=batch_size,
+        )
         self.population = initial_pop
 
-        self.goal = goal
         self.target_value = target_value
+        self.tolerance = tolerance
+        self.archive = archive
 
         self.mutation = mutation
         self.prob_mutation = prob_mutation
@@ -81,43 +266,269 @@ class GASolver:
         self.selection_rate = selection_rate
         self.min_select = min_select
 
+        self.mating = mating
+        self.elitism = elitism
+        self.steady_state = steady_state
+        if surrogate is not None and steady_state:
+            raise ValueError("surrogate doesn't support steady_state")
+        self.surrogate = surrogate
+        self._predicted_ids = {}
+        self.parallel_breeding = parallel_breeding
+        self.breed_fitness = breed_fitness
+
         self.max_steps = max_steps
+        self.stop_when = list(stop_when)
+        self.stop_reason = None
+        self._criteria_started = False
+        self._criterion_met = None
         self.steps = 0
 
+        self.rng = Random()
         self.random_seed = random_seed
 
+        self.stats = SolverStats(sample_every=profile_every)
+        self.on_generation_start = on_generation_start
+        self.on_generation_end = on_generation_end
+        self.on_stage = on_stage
+        self.full_state = full_state
+        self.sinks = list(sinks)
+
+        if checkpoint_every and not checkpoint_path:
+            raise ValueError("checkpoint_every requires a checkpoint_path")
+
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_path = checkpoint_path
+        self._checkpoint_writer = None
+        self._pending_checkpoint = None
+
+    @property
+    def population(self):
+        """
+        The members of the current generation, a ``Population``, which keeps
+        the fitness of each member next to it. Any sequence may be assigned;
+        replacing it drops the stored fitness of every individual that did
+        not survive.
+        """
+        return self._population
+
+    @population.setter
+    def population(self, value):
+        if not isinstance(value, Population):
+            value = Population(value)
+        self._population = value
+        self._steady = None
+        self.fitness_store.retain(value)
+
+    @property
+    def goal(self):
+        """
+        The goal function. Replacing it invalidates every stored fitness value.
+        """
+        return self.fitness_store.goal
+
+    @goal.setter
+    def goal(self, value):
+        self.fitness_store.goal = value
+        self._forget_fitness()
+
+    def _forget_fitness(self):
+        """
+        Drops every fitness value: those of the population, of the store and
+        of the memo
+        """
+        population = self.population
+        population.set_fitness(range(len(population)), [UNKNOWN] * len(population))
+        self.fitness_store.clear()
+        self._predicted_ids.clear()
+        self._steady = None
+        if self.memo is not None:
+            self.memo.clear()
+
+    @property
+    def goal_delta(self):
+        """
+        The incremental goal function used for ``Mutant`` results, if any
+        """
+        return self.fitness_store.goal_delta
+
+    @goal_delta.setter
+    def goal_delta(self, value):
+        self.fitness_store.goal_delta = value
+
+    @property
+    def memo(self):
+        """
+        The cross-generation ``FitnessMemo``, if any
+        """
+        return self.fitness_store.memo
+
+    @property
+    def random_seed(self):
+        """
+        The seed of ``rng``. Setting it reseeds ``rng``.
+        """
+        return self._random_seed
+
+    @random_seed.setter
+    def random_seed(self, value):
+        self._random_seed = value
+        self.rng.seed(value)
+
+    def spawn_rng(self):
+        """
+        Returns a new ``random.Random`` seeded from ``rng``. Use it to give
+        each worker or thread an independent stream that is still
+        reproducible from ``random_seed``.
+        """
+        return Random(self.rng.getrandbits(64))
+
+    @property
+    def fitness_hits(self):
+        """
+        How many fitness lookups were answered without calling ``goal``
+        """
+        return self.fitness_store.hits
+
+    @property
+    def fitness_misses(self):
+        """
+        How many times ``goal`` was actually called
+        """
+        return self.fitness_store.misses
+
+    @property
+    def fitness(self):
+        """
+        The fitness of every member of the current population, in order.
+        Only the members whose fitness is still unknown are looked up in
+        ``fitness_store``.
+        """
+        population = self.population
+        unknown = population.unknown()
+        if self.surrogate is not None:
+            if unknown or self._predicted_ids:
+                store, predicted = self.fitness_store, self._predicted_ids
+                self.surrogate.fill(store, population, unknown, predicted)
+        elif unknown:
+            values = self.fitness_store.evaluate([population[i] for i in unknown])
+            population.set_fitness(unknown, values)
+
+        return population.fitness
+
+    @property
+    def predicted(self):
+        """
+        The indices of the members whose fitness was predicted by
+        ``surrogate`` rather than computed by ``goal``
+        """
+        self.fitness  # pylint: disable=pointless-statement
+        return self.population.indices(self._predicted_ids)
+
+    def _measured(self):
+        """
+        The members whose fitness was computed by ``goal``, leaving out those
+        predicted by ``surrogate``
+        """
+        predicted = set(self.predicted)
+        if not predicted:
+            return self.population
+        return self.population.take([i for i in range(len(self)) if i not in predicted])
+
     @property
     def current_state(self):
         """
         Current state computes the status of the current
         population by applying the goal function to
         all of its members
+
+        It's a dictionary from each member to its fitness, so duplicates show
+        up once. When the members can't be dictionary keys, such as lists, it's
+        a list of ``(member, fitness)`` pairs instead.
         """
-        # pylint: disable=fixme
-        # TODO: Cache this somehow
-        self.__current_state = {indiv: self.goal(indiv) for indiv in self.population}
+        fitness = self.fitness
+        try:
+            return dict(zip(self.population, fitness))
+        except TypeError:
+            return self.population.items()
 
-        return self.__current_state
+    @property
+    def summary(self):
+        """
+        A ``GenerationSummary`` of the current population. In steady-state
+        mode it's read from the heaps, so it doesn't look at every member,
+        and ``diversity`` is only filled on profiled steps. With a
+        ``surrogate``, the predicted members only count for ``diversity``.
+        """
+        if self.steady_state:
+            population = self.population
+            steady = self._steady_state()
+            best_index, best = steady.best()
+
+            diversity = None
+            generation = self.stats.current
+            if generation is not None and generation.sampled:
+                keys = map(self.fitness_store.key_of, population)
+                diversity = len(set(keys)) / len(population)
+
+            return GenerationSummary(
+                self.steps,
+                best,
+                steady.mean,
+                steady.worst()[1],
+                population[best_index],
+                diversity,
+            )
+
+        key, measured = self.fitness_store.key_of, self._measured()
+        summary = GenerationSummary.of(self.steps, measured, measured.fitness, key)
+        if len(measured) < len(self):
+            summary.diversity = len(set(map(key, self.population))) / len(self)
+        return summary
 
     @property
     def best_fit(self):
         """
         Returns the individuals with the best fitness value and that value.
+        Members whose fitness was predicted by ``surrogate`` are left out.
         """
-        best_value = max(self.current_state.values())
+        measured = self._measured()
+        best_value = max(measured.fitness)
         bests = tuple(
-            indiv for indiv in self.population if self.goal(indiv) == best_value
+            indiv
+            for indiv, value in zip(measured, measured.fitness)
+            if value == best_value
         )
         return (bests, best_value)
 
+    def on_target(self, value):
+        """
+        Returns True if the fitness ``value`` is ``target_value``, give or
+        take ``tolerance``
+        """
+        if value == self.target_value:
+            return True
+        return bool(self.tolerance) and abs(value - self.target_value) <= self.tolerance
+
+    @property
+    def pareto_front(self):
+        """
+        The members no other member dominates, for goals that return tuples:
+        those in ``archive`` if there is one, otherwise the first front of the
+        current population
+        """
+        if self.archive is not None:
+            return list(self.archive.members)
+
+        fronts = non_dominated_sort(self.fitness)
+        return [self.population[i] for i in fronts[0]] if fronts else []
+
     @property
     def solution_found(self):
         """
         Returns True if any member of the current population
         has goal(x) == target_value
         """
-        meets_target = [x == self.target_value for x in self.current_state.values()]
-        return any(meets_target)
+        return any(self.on_target(value) for value in self._measured().fitness)
 
     @property
     def solutions(self):
@@ -125,8 +536,11 @@ class GASolver:
         Returns the member of the current population where
         goal(individual) == target_value
         """
+        measured = self._measured()
         solutions = [
-            indiv for indiv in self.population if self.goal(indiv) == self.target_value
+            indiv
+            for indiv, value in zip(measured, measured.fitness)
+            if self.on_target(value)
         ]
 
         return solutions
@@ -136,25 +550,61 @@ class GASolver:
         Mutate tries to apply the mutation function, but it actually
         does anything only a few times, determined by `prob_mutation`
         """
-        seed(self.random_seed)
-        if random() < self.prob_mutation:
-            return self.mutation(individual)
-
-        return individual
+        return self._mutate(individual, UNKNOWN)[0]
 
-    def mutate_pop(self):
+    def _mutate(self, individual, fitness):
+        """
+        Runs ``mutate`` on an ``individual`` whose ``fitness`` may be known.
+        Returns the result, its fitness and whether it was mutated. The
+        fitness is the same when no mutation happened, otherwise it's derived
+        by ``goal_delta`` or ``UNKNOWN``.
+        """
+        if self.rng.random() < self.prob_mutation:
+            self.stats.mutations += 1
+            mutated = self.mutation(individual)
+            if isinstance(mutated, Mutant):
+                value = self.fitness_store.compute_delta(
+                    mutated.genome, individual, mutated.change, fitness
+                )
+                return mutated.genome, value, True
+            return mutated, UNKNOWN, True
+
+        return individual, fitness, False
+
+    def mutate_pop(self, elites=()):
         """
         Runs the entire population through `mutate`. Note that not _every_ time
         that mutate is called it actually does anything. Check `mutate's` doc
-        for details
+        for details. The members of `elites` are put in front of the mutated
+        population, untouched. Members that weren't mutated keep their
+        fitness.
         """
-        self.population = [self.mutate(x) for x in self.population]
+        population = self.population
+        if isinstance(elites, Population):
+            mutated = elites.take(range(len(elites)))
+        else:
+            mutated = Population(elites)
+
+        predicted = self._predicted_ids
+        for genome, fitness, member_id in zip(
+            population, population.fitness, population.ids
+        ):
+            # A predicted fitness is no base for ``goal_delta``
+            known = UNKNOWN if member_id in predicted else fitness
+            genome, value, changed = self._mutate(genome, known)
+            if changed:
+                mutated.add(genome, value)
+            else:
+                mutated.add(genome, fitness, member_id)
+
+        self.population = mutated
 
     def crossover(self, sol_a, sol_b):
         """
         Calls the crossover function with the parameters
         `sol_a` and `sol_b` and returns the given sibling
         """
+        self.stats.crossovers += 1
         return self.crossover_(sol_a, sol_b)
 
     def select(self, replace=True):
@@ -167,18 +617,16 @@ class GASolver:
         If `replace` is True, the current population
         will be replaced by the new one.
         """
-        seed(self.random_seed)
-
         new_pop_size = ceil(len(self) * self.selection_rate)
 
         if self.min_select:
             new_pop_size = max(new_pop_size, self.min_select)
 
-        new_pop = [
-            self.selector(self.current_state, random_seed=self.random_seed)
-            for _ in range(new_pop_size)
-        ]
-
+        population = self.population
+        indices = select_indices(
+            self.selector, population, self.fitness, new_pop_size, self.rng
+        )
+        new_pop = population.take(indices)
         if replace:
             self.population = new_pop
 
@@ -197,17 +645,21 @@ class GASolver:
         optionally, until a max number of steps is reached. That max number
         may be defined in the `max_steps` property.
 
+        Each step yields a ``GenerationSummary``, or ``current_state`` when
+        ``full_state`` is set.
+
         A `step` is built as follows:
 
             1. The current population is selected by the `selector` function.
                This will select a fixed `selection_rate` of the current
                population and *replace* it by the selected members
 
-            2. Random couples are selected to reproduce using the `crossover`
-               function. We select as much couples as needed to replace the size
-               of the population. That is, if `selection_rate` is 0.3, the previous
-               step will have selected 30% of the original population and we need
-               as much as 70% of the original to restore the original size.
+            2. Couples are picked by the `mating` scheme to reproduce using
+               the `crossover` function. We select as much couples as needed to
+               replace the size of the population. That is, if `selection_rate`
+               is 0.3, the previous step will have selected 30% of the original
+               population and we need as much as 70% of the original to restore
+               the original size.
 
             3. All the selected couples are crossed over and create new siblings
 
@@ -216,21 +668,289 @@ class GASolver:
 
             5. All the population suffers mutation by the `mutate` function
         """
-        if self.solution_found or self.max_steps and self.steps >= self.max_steps:
-            raise StopIteration
+        generation = self._start_generation()
+        self._check_stop()
+        self._reproduce()
+
+        with self._stage("evaluate"):
+            result = self.current_state if self.full_state else self.summary
+
+        return self._finish_generation(generation, result)
+
+    def run(self):
+        """
+        Runs the solver until it stops and returns what the last step yielded,
+        or None if no step was run. Nothing else is kept, so pass ``sinks`` to
+        follow the run.
+        """
+        result = None
+        for result in self:
+            pass
+        return result
+
+    def _start_generation(self):
+        """
+        Opens the stats of a new generation and returns them
+        """
+        if not self._criteria_started:
+            for criterion in self.stop_when:
+                if hasattr(criterion, "start"):
+                    criterion.start(self)
+            self._criteria_started = True
 
-        sibling_len = floor((1 - self.selection_rate) * len(self))
+        generation = self.stats.start(self.steps, self.fitness_store)
+        if self.on_generation_start is not None:
+            self.on_generation_start(self)
 
-        self.select()
-        all_couples = list(combinations(self.population, 2))
-        couples = choices(all_couples, k=sibling_len)
-        siblings = [self.crossover(c[0], c[1]) for c in couples]
-        self.population.extend(siblings)
-        self.mutate_pop()
+        return generation
+
+    def _check_stop(self):
+        """
+        Raises ``StopIteration``, after setting ``stop_reason``, if the run is
+        over
+        """
+        with self._stage("evaluate"):
+            if self.steady_state:
+                finished = self._steady_state().hits > 0
+            else:
+                finished = self.solution_found
+
+        if finished:
+            self.stop_reason = "target_value"
+        elif self.max_steps and self.steps >= self.max_steps:
+            self.stop_reason = "max_steps"
+        elif self._criterion_met is not None:
+            self.stop_reason = repr(self._criterion_met)
+        else:
+            self.stop_reason = None
+            return
+
+        self.stats.current = None
+        raise StopIteration
+
+    def _reproduce(self):
+        """
+        Replaces the population by the next generation: selection, mating,
+        crossover and mutation
+        """
+        if self.archive is not None and self.steps == 0:
+            self.archive.update(self.population, self.fitness)
+
+        if self.steady_state:
+            self._replace_worst()
+        else:
+            self._replace_generation()
 
         self.steps += 1
+        if self.memo is not None:
+            self.memo.next_generation()
+
+    def _replace_generation(self):
+        """
+        Generational replacement: the selected members and their children
+        make the next generation, along with the ``elitism`` fittest members
+        """
+        elites = self.population.take(elite_indices(self.fitness, self.elitism))
+        sibling_len = floor((1 - self.selection_rate) * len(self)) - len(elites)
+        if sibling_len < 0:
+            raise ValueError("elitism leaves no room for the selected members")
+
+        with self._stage("select"):
+            self.select()
+
+        parents = self.population
+        with self._stage("mating"):
+            couples = self.mating(self.fitness, sibling_len, self.rng)
+
+        if self.parallel_breeding:
+            with self._stage("breed"):
+                self._breed_in_workers(
+                    [(parents[i], parents[j]) for i, j in couples], elites
+                )
+        else:
+            with self._stage("crossover"):
+                siblings = [self.crossover(parents[i], parents[j]) for i, j in couples]
+                self.population.extend(siblings)
+            with self._stage("mutate"):
+                self.mutate_pop(elites)
+
+    def _steady_state(self):
+        """
+        Returns the ``SteadyState`` tracking the population, built on demand
+        """
+        if self._steady is None:
+            self._steady = SteadyState(self.population, self.fitness, self.on_target)
+        return self._steady
+
+    def _replace_worst(self):
+        """
+        Steady-state replacement: the ``steady_state`` least fit members are
+        replaced by the children of parents picked by ``selector``
+        """
+        steady, population = self._steady_state(), self.population
+        count = min(self.steady_state, len(self) - self.elitism)
+        if count <= 0:
+            return
+
+        with self._stage("select"):
+            size = max(2, 2 * count)
+            fitness = steady.fitness
+            pool = select_indices(self.selector, population, fitness, size, self.rng)
+
+        with self._stage("mating"):
+            couples = self.mating([fitness[i] for i in pool], count, self.rng)
+
+        with self._stage("crossover"):
+            children = [
+                self.crossover(population[pool[i]], population[pool[j]])
+                for i, j in couples
+            ]
+        with self._stage("mutate"):
+            children = [self.mutate(child) for child in children]
+
+        store = self.fitness_store
+        with self._stage("evaluate"):
+            values = store.evaluate(children)
+
+        for index, child, value in zip(steady.pop_worst(count), children, values):
+            steady.replace(index, child, value)
+            population.set_fitness([index], [value])
+
+        # The values of the replaced members linger in the store until it
+        # doubles in size, which keeps the cost per step independent of N
+        if len(store) > 2 * len(population):
+            store.retain(population)
+
+    def _finish_generation(self, generation, result):
+        """
+        Closes the stats of the generation, feeds the sinks, runs the hooks
+        and checkpoints if due. Returns ``result``.
+        """
+        store = self.fitness_store
+        self.stats.finish(store, self.population, store.key_of)
 
-        return self.current_state
+        if self.archive is not None:
+            self.archive.update(self.population, self.fitness)
+
+        if self.sinks or self.stop_when:
+            summary = self.summary if self.full_state else result
+            for sink in self.sinks:
+                sink(summary)
+            for criterion in self.stop_when:
+                if criterion(self, summary):
+                    self._criterion_met = criterion
+                    break
+
+        if self.on_generation_end is not None:
+            self.on_generation_end(self, generation)
+
+        if self.checkpoint_every and self.steps % self.checkpoint_every == 0:
+            self._checkpoint_in_background()
+
+        return result
+
+    @contextmanager
+    def _stage(self, name):
+        """
+        Times the enclosed stage when the current generation is profiled
+        """
+        generation = self.stats.current
+        if generation is None or not generation.sampled:
+            yield
+            return
+
+        wall, cpu = perf_counter(), process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = perf_counter() - wall, process_time() - cpu
+            generation.add_time(name, wall, cpu)
+            if self.on_stage is not None:
+                self.on_stage(self, name, wall)
+
+    def _breed_in_workers(self, couples, elites=()):
+        """
+        Mutates the current population, puts ``elites`` in front of it and
+        adds the children of ``couples``, bred by ``breeding.breed``
+        """
+        store = self.fitness_store
+        evaluate = (
+            self.breed_fitness and store.goal_batch is None and self.surrogate is None
+        )
+        children = breed(
+            couples,
+            self.crossover_,
+            self.mutation,
+            self.prob_mutation,
+            self.rng,
+            goal=self.goal if evaluate else None,
+            executor=store.executor,
+            batch_size=store.chunk_size,
+        )
+
+        self.mutate_pop(elites)
+        self.stats.crossovers += len(children)
+
+        for child, fitness, mutated in children:
+            self.stats.mutations += mutated
+            if fitness is NOT_EVALUATED:
+                self.population.append(child)
+            else:
+                self.population.add(child, fitness)
+                store.record(child, fitness)
+
+    def save_checkpoint(self, path):
+        """
+        Saves the population, its fitness, the number of steps, the state of
+        ``rng`` and the statistics counters to ``path``. See
+        ``ga_solver.checkpoint`` for the format.
+        """
+        write_checkpoint(snapshot(self), path)
+
+    @classmethod
+    def resume(cls, path, **kwargs):
+        """
+        Builds a solver from the checkpoint at ``path``. The functions and
+        settings of the run aren't saved, so they must be given again as
+        keyword arguments, just like for ``GASolver()``, except for
+        ``initial_pop`` and ``random_seed``::
+
+            solver = GASolver.resume(
+                "run.ckpt",
+                goal=goal,
+                target_value=28,
+                mutation=board_mutation,
+                prob_mutation=0.8,
+                crossover_=crossover,
+                selector=roullete,
+            )
+        """
+        state = load_checkpoint(path)
+        solver = cls(initial_pop=list(state["population"]), **kwargs)
+        restore(solver, state)
+        return solver
+
+    def _checkpoint_in_background(self):
+        """
+        Takes a snapshot now and writes it on a background thread. Waits for
+        the previous checkpoint first, so at most one is pending.
+        """
+        if self._checkpoint_writer is None:
+            self._checkpoint_writer = ThreadPoolExecutor(max_workers=1)
+
+        self.wait_checkpoint()
+        self._pending_checkpoint = self._checkpoint_writer.submit(
+            write_checkpoint, snapshot(self), self.checkpoint_path
+        )
+
+    def wait_checkpoint(self):
+        """
+        Blocks until the pending automatic checkpoint, if any, is written.
+        Errors raised while writing it are raised here.
+        """
+        pending, self._pending_checkpoint = self._pending_checkpoint, None
+        if pending is not None:
+            pending.result()
 
     def __len__(self):
         """
@@ -238,5 +958,27 @@ class GASolver:
         """
         return len(self.population)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Waits for the pending checkpoint and shuts down the worker pool
+        created for ``workers``, if any. An ``executor`` given by the user is
+        left untouched.
+        """
+        self.wait_checkpoint()
+        if self._checkpoint_writer is not None:
+            self._checkpoint_writer.shutdown()
+            self._checkpoint_writer = None
+
+        if self._owned_executor is not None:
+            self._owned_executor.shutdown()
+            self._owned_executor = None
+            self.fitness_store.executor = None
+
 
 __all__ = ["GASolver"]
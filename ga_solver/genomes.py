@@ -0,0 +1,362 @@
+"""
+Provides compact genomes for ``GASolver`` and the operators that work on
+them
+
+A list or tuple of 256 bits costs a pointer per gene, several kilobytes
+each. ``BitString`` packs the bits in one Python int, ``IntVector`` and
+``RealVector`` keep their genes in an ``array`` of bytes or doubles. All of
+them use ``__slots__``, are hashable, so the fitness memo works with them,
+and are never changed in place: the operators below build new genomes from
+the packed form, without going through lists.
+
+>>> rng = Random(0)
+>>> solver = GASolver(
+...     initial_pop=[BitString.random(256, rng) for _ in range(1000)],
+...     goal=BitString.count,
+...     target_value=256,
+...     mutation=bit_flip(rng=rng),
+...     prob_mutation=0.5,
+...     crossover_=uniform_crossover(rng),
+...     selector=tournament(3),
+... )
+
+Operators take their own ``random.Random`` as ``rng``, since the solver
+never touches the global one.
+"""
+import random as _random
+from array import array
+from math import log
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # pragma: no cover, Python < 3.10
+
+    def _popcount(value):
+        return bin(value).count("1")
+
+
+class BitString:
+    """
+    A fixed-length string of bits packed in an int. Bit ``i`` is
+    ``(bits >> i) & 1``.
+
+    Args:
+        bits (int): The packed bits
+        length (int): How many bits there are
+
+    >>> genome = BitString.from_bits([1, 0, 1, 1])
+    >>> genome.count(), genome[1], str(genome)
+    (3, 0, '1011')
+    """
+
+    __slots__ = ("bits", "length")
+
+    def __init__(self, bits=0, length=0):
+        if bits < 0 or bits >> length:
+            raise ValueError(f"{bits} doesn't fit in {length} bits")
+        self.bits = bits
+        self.length = length
+
+    @classmethod
+    def from_bits(cls, values):
+        """
+        Packs an iterable of truthy or falsy values, first one as bit 0
+        """
+        bits = length = 0
+        for length, value in enumerate(values, 1):
+            if value:
+                bits |= 1 << (length - 1)
+        return cls(bits, length)
+
+    @classmethod
+    def random(cls, length, rng=_random):
+        """
+        A string of ``length`` random bits
+        """
+        return cls(rng.getrandbits(length) if length else 0, length)
+
+    @classmethod
+    def from_bytes(cls, data, length=None):
+        """
+        Unpacks the output of ``to_bytes``. ``length`` defaults to all the
+        bits in ``data``.
+        """
+        if length is None:
+            length = 8 * len(data)
+        return cls(int.from_bytes(data, "little"), length)
+
+    def to_bytes(self):
+        """
+        The bits as little-endian bytes
+        """
+        return self.bits.to_bytes((self.length + 7) // 8, "little")
+
+    def count(self):
+        """
+        How many bits are set
+        """
+        return _popcount(self.bits)
+
+    def hamming(self, other):
+        """
+        How many bits differ from ``other``
+        """
+        return _popcount(self.bits ^ other.bits)
+
+    def flip(self, *positions):
+        """
+        Returns a copy with the bits at ``positions`` flipped
+        """
+        mask = 0
+        for position in positions:
+            mask ^= 1 << range(self.length)[position]
+        return BitString(self.bits ^ mask, self.length)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.length)
+            if step == 1:
+                size = max(stop - start, 0)
+                return BitString((self.bits >> start) & ((1 << size) - 1), size)
+            return BitString.from_bits(self[i] for i in range(start, stop, step))
+
+        return (self.bits >> range(self.length)[index]) & 1
+
+    def __iter__(self):
+        bits = self.bits
+        for _ in range(self.length):
+            yield bits & 1
+            bits >>= 1
+
+    def __eq__(self, other):
+        if isinstance(other, BitString):
+            return self.bits == other.bits and self.length == other.length
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.bits, self.length))
+
+    def __str__(self):
+        return format(self.bits, f"0{self.length}b")[::-1] if self.length else ""
+
+    def __repr__(self):
+        return f"BitString('{self}')"
+
+
+class ArrayGenome:
+    """
+    A fixed-length vector of numbers kept in an ``array`` of ``typecode``.
+    The hash is computed from the raw bytes, with ``-0.0`` written as ``0.0``
+    since they're equal, and cached, so ``values`` must not be changed once
+    the genome is in use.
+
+    Args:
+        values (iterable): The genes
+    """
+
+    __slots__ = ("values", "_hash")
+    typecode = "d"
+
+    def __init__(self, values=()):
+        if not (isinstance(values, array) and values.typecode == self.typecode):
+            values = array(self.typecode, values)
+        self.values = values
+        self._hash = None
+
+    def replace(self, positions, genes):
+        """
+        Returns a copy with ``genes`` in place of the genes at ``positions``
+        """
+        values = array(self.typecode, self.values)
+        for position, gene in zip(positions, genes):
+            values[position] = gene
+        return type(self)(values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return type(self)(self.values[index])
+        return self.values[index]
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __eq__(self, other):
+        if type(other) is type(self):
+            return self.values == other.values
+        return NotImplemented
+
+    def __hash__(self):
+        if self._hash is None:
+            values = self.values
+            if values.typecode in "fd" and 0 in values:
+                values = array(values.typecode, (value + 0.0 for value in values))
+            self._hash = hash((self.typecode, values.tobytes()))
+        return self._hash
+
+    def __getstate__(self):
+        return self.values
+
+    def __setstate__(self, values):
+        self.values = values
+        self._hash = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.values.tolist()!r})"
+
+
+# pylint: disable=too-few-public-methods
+class IntVector(ArrayGenome):
+    """
+    A vector of small integers, from -128 to 127, one byte each
+    """
+
+    __slots__ = ()
+    typecode = "b"
+
+
+# pylint: disable=too-few-public-methods
+class RealVector(ArrayGenome):
+    """
+    A vector of floats, kept as C doubles
+    """
+
+    __slots__ = ()
+    typecode = "d"
+
+
+def _positions(length, rate, rng):
+    """
+    The genes to mutate: one at random if ``rate`` is None, otherwise each
+    with chance ``rate``, drawn by skipping geometric gaps instead of
+    rolling a number per gene
+    """
+    if not length:
+        return []
+    if rate is None:
+        return [rng.randrange(length)]
+    if rate >= 1:
+        return list(range(length))
+    if rate <= 0:
+        return []
+
+    positions = []
+    scale = log(1 - rate)
+    position = -1
+    while True:
+        position += 1 + int(log(1 - rng.random()) / scale)
+        if position >= length:
+            return positions
+        positions.append(position)
+
+
+def bit_flip(rate=None, rng=_random):
+    """
+    Builds a mutation that flips one random bit of a ``BitString``, or each
+    bit with chance ``rate``
+    """
+
+    def mutation(genome):
+        mask = 0
+        for position in _positions(genome.length, rate, rng):
+            mask |= 1 << position
+        return BitString(genome.bits ^ mask, genome.length)
+
+    return mutation
+
+
+def creep_mutation(step=1, rate=None, low=-128, high=127, rng=_random):
+    """
+    Builds a mutation that moves one random gene of an ``IntVector``, or
+    each gene with chance ``rate``, up or down by at most ``step``, keeping
+    it between ``low`` and ``high``
+    """
+
+    def mutation(genome):
+        positions = _positions(len(genome), rate, rng)
+        genes = [
+            min(max(genome.values[i] + rng.randint(-step, step), low), high)
+            for i in positions
+        ]
+        return genome.replace(positions, genes)
+
+    return mutation
+
+
+def gaussian_mutation(scale=1.0, rate=None, rng=_random):
+    """
+    Builds a mutation that adds normal noise with standard deviation
+    ``scale`` to one random gene of a ``RealVector``, or to each gene with
+    chance ``rate``
+    """
+
+    def mutation(genome):
+        positions = _positions(len(genome), rate, rng)
+        genes = [genome.values[i] + rng.gauss(0.0, scale) for i in positions]
+        return genome.replace(positions, genes)
+
+    return mutation
+
+
+def one_point_crossover(rng=_random):
+    """
+    Builds a crossover whose child takes the genes of the first parent up
+    to a random cut and those of the second after it. Works on
+    ``BitString`` with masks and on array genomes with slices.
+    """
+
+    def crossover(genome_a, genome_b):
+        length = len(genome_a)
+        if length < 2:
+            return genome_a
+
+        cut = rng.randrange(1, length)
+        if isinstance(genome_a, BitString):
+            low = (1 << cut) - 1
+            return BitString((genome_a.bits & low) | (genome_b.bits & ~low), length)
+
+        return type(genome_a)(genome_a.values[:cut] + genome_b.values[cut:])
+
+    return crossover
+
+
+def uniform_crossover(rng=_random):
+    """
+    Builds a crossover where each gene of the child comes from either parent
+    with equal chance. On ``BitString`` it's a single random mask.
+    """
+
+    def crossover(genome_a, genome_b):
+        length = len(genome_a)
+        mask = rng.getrandbits(length) if length else 0
+        if isinstance(genome_a, BitString):
+            return BitString(
+                (genome_a.bits & mask) | (genome_b.bits & ~mask), length
+            )
+
+        values = array(genome_a.typecode, genome_b.values)
+        values_a = genome_a.values
+        for position in range(length):
+            if (mask >> position) & 1:
+                values[position] = values_a[position]
+        return type(genome_a)(values)
+
+    return crossover
+
+
+__all__ = [
+    "ArrayGenome",
+    "BitString",
+    "IntVector",
+    "RealVector",
+    "bit_flip",
+    "creep_mutation",
+    "gaussian_mutation",
+    "one_point_crossover",
+    "uniform_crossover",
+]
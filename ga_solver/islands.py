@@ -0,0 +1,306 @@
+"""
+Provides the island model: several solvers evolving side by side, each in its
+own process, that exchange their best individuals from time to time
+"""
+import multiprocessing
+from collections import namedtuple
+from heapq import nlargest, nsmallest
+from random import Random
+
+IslandResult = namedtuple(
+    "IslandResult", ["found", "best", "best_value", "island", "epochs", "steps"]
+)
+IslandResult.__doc__ = """
+The outcome of ``IslandModel.run``.
+
+Attributes:
+    found (bool): Whether some island reached its ``target_value``
+    best: The best individual found in all islands
+    best_value: Its fitness
+    island (int): The index of the island where ``best`` lives
+    epochs (int): How many migration rounds were run
+    steps (list): The number of steps run by each island
+"""
+
+
+def ring(size, rng):  # pylint: disable=unused-argument
+    """
+    Each island sends its migrants to the next one
+    """
+    return [[(i + 1) % size] for i in range(size)]
+
+
+def fully_connected(size, rng):  # pylint: disable=unused-argument
+    """
+    Each island sends its migrants to all the others
+    """
+    return [[j for j in range(size) if j != i] for i in range(size)]
+
+
+def random_topology(size, rng):
+    """
+    Each island sends its migrants to another island drawn at every epoch
+    """
+    if size < 2:
+        return [[] for _ in range(size)]
+
+    destinations = []
+    for i in range(size):
+        j = rng.randrange(size - 1)
+        destinations.append([j + 1 if j >= i else j])
+    return destinations
+
+
+TOPOLOGIES = {
+    "ring": ring,
+    "full": fully_connected,
+    "random": random_topology,
+}
+
+
+# pylint: disable=too-few-public-methods
+class _Island:
+    """
+    Runs the commands sent by ``IslandModel`` on one solver. The same code
+    runs in worker processes and, without processes, in the caller's.
+    """
+
+    def __init__(self, island, stop_event):
+        self.solver = island() if callable(island) else island
+        self.stop_event = stop_event
+        self.exhausted = False
+
+    def run(self, generations, immigrants, migrants):
+        """
+        Receives ``immigrants``, runs up to ``generations`` steps and returns
+        a report with the ``migrants`` best individuals
+        """
+        solver = self.solver
+        if immigrants:
+            self._welcome(immigrants)
+
+        for _ in range(generations):
+            if self.stop_event is not None and self.stop_event.is_set():
+                break
+            try:
+                next(solver)
+            except StopIteration:
+                self.exhausted = True
+                break
+
+        found = solver.solution_found
+        if found:
+            self.exhausted = True
+            if self.stop_event is not None:
+                self.stop_event.set()
+
+        pairs = list(zip(solver.population, solver.fitness))
+        emigrants = [indiv for indiv, _ in nlargest(migrants, pairs, key=_second)]
+        best, best_value = max(pairs, key=_second)
+
+        return {
+            "found": found,
+            "exhausted": self.exhausted,
+            "emigrants": emigrants,
+            "best": best,
+            "best_value": best_value,
+            "steps": solver.steps,
+        }
+
+    def _welcome(self, immigrants):
+        """
+        Replaces the worst members of the population by ``immigrants``
+        """
+        solver = self.solver
+        population = solver.population.take(range(len(solver)))
+        worst = nsmallest(
+            min(len(immigrants), len(population)),
+            range(len(population)),
+            key=solver.fitness.__getitem__,
+        )
+        for index, immigrant in zip(worst, immigrants):
+            population[index] = immigrant
+
+        solver.population = population
+
+
+def _second(pair):
+    return pair[1]
+
+
+def _island_worker(connection, island, stop_event):
+    """
+    The loop run by each island process. Errors are sent back to be raised
+    by ``IslandModel``.
+    """
+    try:
+        worker = _Island(island, stop_event)
+        while True:
+            command = connection.recv()
+            if command is None:
+                break
+            connection.send(worker.run(*command))
+    except Exception as error:  # pylint: disable=broad-except
+        connection.send(error)
+    finally:
+        connection.close()
+
+
+# pylint: disable=too-many-instance-attributes, too-few-public-methods
+class IslandModel:
+    """
+    Evolves several ``GASolver`` islands in parallel processes. Every
+    ``migration_interval`` generations, each island sends copies of its
+    ``migrants`` best individuals to the islands chosen by ``topology``, where
+    they replace the worst members. The run stops as soon as any island finds
+    a solution, or when every island is done.
+
+    Args:
+        islands (list): Either ``GASolver`` instances or functions that build
+            one. Each island may have its own selector, mutation and other
+            settings. Functions are called in the island's process, so only
+            they need to be picklable on platforms that spawn processes.
+        topology (str or function): ``"ring"``, ``"full"``, ``"random"`` or a
+            function ``topology(size, rng)`` that returns, for each island, the
+            list of islands that receive its migrants.
+        migration_interval (int): Generations between migrations.
+        migrants (int): How many individuals each island sends.
+        max_epochs (int, optional): Stops after this many migration rounds.
+            The default is 0, which runs until a solution is found or every
+            island stops by itself, so give the islands a ``max_steps``.
+        processes (bool, optional): If False, the islands run one after the
+            other in this process. Useful for debugging. Defaults to True.
+        random_seed (int, optional): Seeds the ``"random"`` topology.
+        context (optional): The ``multiprocessing`` context used to start the
+            processes. Defaults to the platform's default.
+
+    >>> model = IslandModel([make_solver] * 4, migration_interval=20)
+    >>> result = model.run()
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        islands,
+        topology="ring",
+        migration_interval=10,
+        migrants=2,
+        max_epochs=0,
+        processes=True,
+        random_seed=None,
+        context=None,
+    ):
+        self.islands = list(islands)
+        self.topology = TOPOLOGIES.get(topology, topology)
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.max_epochs = max_epochs
+        self.processes = processes
+        self.rng = Random(random_seed)
+        self.context = context or multiprocessing.get_context()
+
+    def run(self):
+        """
+        Runs the model and returns an ``IslandResult``
+        """
+        if self.processes:
+            return self._run_in_processes()
+
+        workers = [_Island(island, None) for island in self.islands]
+        reports = {}
+
+        def send(index, command):
+            reports[index] = workers[index].run(*command)
+
+        return self._coordinate(send, lambda indices: [reports[i] for i in indices])
+
+    def _run_in_processes(self):
+        stop_event = self.context.Event()
+        connections = []
+        processes = []
+
+        for island in self.islands:
+            parent, child = self.context.Pipe()
+            process = self.context.Process(
+                target=_island_worker, args=(child, island, stop_event), daemon=True
+            )
+            process.start()
+            child.close()
+            connections.append(parent)
+            processes.append(process)
+
+        def send(index, command):
+            try:
+                connections[index].send(command)
+            except OSError:
+                pass  # The island failed; its error is waiting to be received
+
+        def receive(indices):
+            reports = [connections[i].recv() for i in indices]
+            for report in reports:
+                if isinstance(report, Exception):
+                    raise report
+            return reports
+
+        try:
+            return self._coordinate(send, receive)
+        finally:
+            for connection in connections:
+                try:
+                    connection.send(None)
+                except OSError:
+                    pass  # The island is already gone
+                connection.close()
+            for process in processes:
+                process.join()
+
+    def _coordinate(self, send, receive):
+        """
+        The migration loop. ``send(index, command)`` hands a command to an
+        island and ``receive(indices)`` collects the reports of those islands.
+        """
+        size = len(self.islands)
+        immigrants = [[] for _ in range(size)]
+        active = list(range(size))
+        reports = [None] * size
+        epochs = 0
+
+        while active:
+            for index in active:
+                send(index, (self.migration_interval, immigrants[index], self.migrants))
+
+            for index, report in zip(active, receive(active)):
+                reports[index] = report
+
+            epochs += 1
+            if any(reports[i]["found"] for i in active):
+                break
+            if self.max_epochs and epochs >= self.max_epochs:
+                break
+
+            immigrants = [[] for _ in range(size)]
+            destinations = self.topology(size, self.rng)
+            for origin in active:
+                for destination in destinations[origin]:
+                    immigrants[destination].extend(reports[origin]["emigrants"])
+
+            active = [i for i in active if not reports[i]["exhausted"]]
+
+        winner = max(range(size), key=lambda i: reports[i]["best_value"])
+        return IslandResult(
+            found=any(report["found"] for report in reports),
+            best=reports[winner]["best"],
+            best_value=reports[winner]["best_value"],
+            island=winner,
+            epochs=epochs,
+            steps=[report["steps"] for report in reports],
+        )
+
+
+__all__ = [
+    "IslandModel",
+    "IslandResult",
+    "fully_connected",
+    "random_topology",
+    "ring",
+]
@@ -0,0 +1,146 @@
+"""
+Provides different strategies for choosing the couples that reproduce
+
+A mating scheme is a function ``scheme(fitness, k, rng)`` that receives the
+fitness values of the selected population as a sequence, the number ``k`` of
+couples needed and a source of randomness ``rng`` (the ``random`` module or a
+``random.Random`` instance). It returns a list of ``k`` pairs of indices into
+``fitness``. Apart from ``all_pairs``, every scheme here uses O(k) memory,
+whatever the size of the population.
+"""
+from bisect import bisect_right
+from itertools import accumulate, combinations
+
+from .pop_selectors import _roullete_weights
+
+
+def _check_population(fitness, k):
+    if k and not fitness:
+        raise ValueError("Can't pick couples from an empty population")
+
+
+def random_pairs(fitness, k, rng):
+    """
+    Picks ``k`` couples uniformly among all pairs of distinct members. This is
+    the same distribution ``all_pairs`` samples from, without building the
+    list of pairs. A population of one member mates with itself.
+
+    Args:
+        fitness (sequence): The fitness values of the population
+        k (int): How many couples to pick
+        rng: Source of randomness, such as the ``random`` module
+
+    Returns:
+        A list with ``k`` pairs of indices
+    """
+    _check_population(fitness, k)
+    size = len(fitness)
+
+    if size == 1:
+        return [(0, 0)] * k
+
+    couples = []
+    for _ in range(k):
+        first = rng.randrange(size)
+        second = rng.randrange(size - 1)
+        if second >= first:
+            second += 1
+        couples.append((min(first, second), max(first, second)))
+
+    return couples
+
+
+def all_pairs(fitness, k, rng):
+    """
+    The original behaviour of ``GASolver``: builds every pair of distinct
+    members and picks ``k`` of them with replacement. Uses O(N²) memory, so
+    keep it for reproducing older runs.
+    """
+    all_couples = list(combinations(range(len(fitness)), 2))
+    return rng.choices(all_couples, k=k)
+
+
+def fitness_pairs(fitness, k, rng):
+    """
+    Picks both parents of every couple with a probability proportional to
+    their fitness, like ``pop_selectors.roullete`` does, with the same
+    handling of negative and all-zero values. The two parents are distinct
+    whenever more than one member has a chance of being picked.
+    """
+    _check_population(fitness, k)
+    weights = _roullete_weights(fitness)
+    cumulative = list(accumulate(weights))
+    total = cumulative[-1]
+    last = len(cumulative) - 1
+    distinct_possible = sum(1 for weight in weights if weight > 0) > 1
+
+    def draw():
+        return min(bisect_right(cumulative, rng.random() * total), last)
+
+    couples = []
+    for _ in range(k):
+        first = draw()
+        second = draw()
+        while distinct_possible and second == first:
+            second = draw()
+        couples.append((first, second))
+
+    return couples
+
+
+def tournament_pairs(size=2):
+    """
+    Builds a scheme where each parent is the fittest of ``size`` members
+    drawn at random. Bigger tournaments mean stronger selection pressure.
+    """
+
+    def scheme(fitness, k, rng):
+        _check_population(fitness, k)
+        population = len(fitness)
+
+        def draw():
+            contenders = (rng.randrange(population) for _ in range(size))
+            return max(contenders, key=fitness.__getitem__)
+
+        return [(draw(), draw()) for _ in range(k)]
+
+    return scheme
+
+
+def assortative_pairs(window=1):
+    """
+    Builds a scheme that mates similar individuals: the first parent is drawn
+    at random and the second among the ``window`` members ranked closest to
+    it by fitness, on either side.
+    """
+
+    def scheme(fitness, k, rng):
+        _check_population(fitness, k)
+        population = len(fitness)
+
+        if population == 1:
+            return [(0, 0)] * k
+
+        ranked = sorted(range(population), key=fitness.__getitem__)
+        couples = []
+        for _ in range(k):
+            position = rng.randrange(population)
+            low = max(position - window, 0)
+            high = min(position + window, population - 1)
+            partner = rng.randrange(low, high)
+            if partner >= position:
+                partner += 1
+            couples.append((ranked[position], ranked[partner]))
+
+        return couples
+
+    return scheme
+
+
+__all__ = [
+    "all_pairs",
+    "assortative_pairs",
+    "fitness_pairs",
+    "random_pairs",
+    "tournament_pairs",
+]
@@ -0,0 +1,256 @@
+"""
+Provides the pieces of a multi-objective mode in the style of NSGA-II: the
+goal returns a tuple of values, all of them to be maximized, and members are
+compared by Pareto dominance instead of a single number
+
+>>> solver = GASolver(
+...     initial_pop,
+...     goal=lambda x: (quality(x), -cost(x), -latency(x)),
+...     target_value=None,
+...     mutation=mutation,
+...     prob_mutation=0.5,
+...     crossover_=crossover,
+...     selector=nsga2,
+...     archive=ParetoArchive(100),
+...     max_steps=500,
+... )
+>>> solver.run()
+>>> solver.pareto_front
+
+Selectors built on fitness sums, such as ``roullete``, don't work with
+tuples, and neither does ``steady_state``. ``nsga2`` already keeps the best
+fronts, so ``elitism``, which compares tuples lexicographically, isn't
+needed. ``GenerationSummary`` compares them the same way, so prefer the
+archive to follow the run.
+"""
+import random as _random
+
+from .pop_selectors import batched, tournament
+
+
+def dominates(a, b):
+    """
+    Returns True if the objectives ``a`` are at least as good as ``b`` in
+    every position and better in at least one
+    """
+    better = False
+    for value_a, value_b in zip(a, b):
+        if value_a < value_b:
+            return False
+        if value_a > value_b:
+            better = True
+    return better
+
+
+def _sort_two_objectives(fitness):
+    """
+    Non-dominated sort for two objectives in O(N log N): members are swept
+    from the best first objective down, and each one goes to the first front
+    whose last member doesn't dominate it, found by binary search
+    """
+    order = sorted(range(len(fitness)), key=fitness.__getitem__, reverse=True)
+    fronts = []
+    lasts = []
+
+    for index in order:
+        point = fitness[index]
+
+        # If a front dominates the point, so do all the fronts before it
+        low, high = 0, len(lasts)
+        while low < high:
+            middle = (low + high) // 2
+            if dominates(lasts[middle], point):
+                low = middle + 1
+            else:
+                high = middle
+
+        front = low
+        if front == len(fronts):
+            fronts.append([])
+            lasts.append(point)
+        fronts[front].append(index)
+        lasts[front] = point
+
+    return fronts
+
+
+def _sort_many_objectives(fitness):
+    """
+    Deb's fast non-dominated sort, in O(M N²)
+    """
+    size = len(fitness)
+    dominated_by = [[] for _ in range(size)]
+    counts = [0] * size
+
+    for i in range(size):
+        for j in range(i + 1, size):
+            if dominates(fitness[i], fitness[j]):
+                dominated_by[i].append(j)
+                counts[j] += 1
+            elif dominates(fitness[j], fitness[i]):
+                dominated_by[j].append(i)
+                counts[i] += 1
+
+    fronts = []
+    front = [i for i in range(size) if counts[i] == 0]
+    while front:
+        fronts.append(front)
+        following = []
+        for i in front:
+            for j in dominated_by[i]:
+                counts[j] -= 1
+                if counts[j] == 0:
+                    following.append(j)
+        front = following
+
+    return fronts
+
+
+def non_dominated_sort(fitness):
+    """
+    Splits the indices of ``fitness``, a sequence of objective tuples, in
+    Pareto fronts: the first holds the members no one dominates, the second
+    those only dominated by the first and so on. Takes O(N log N) for two
+    objectives and O(M N²) for M > 2.
+    """
+    if not fitness:
+        return []
+
+    if len(fitness[0]) == 2:
+        return _sort_two_objectives(fitness)
+
+    return _sort_many_objectives(fitness)
+
+
+def crowding_distance(fitness, front):
+    """
+    Returns the crowding distance of each member of ``front``, a list of
+    indices of ``fitness``, in the same order. The members at the ends of
+    each objective get infinity, so they are always kept.
+    """
+    distances = dict.fromkeys(front, 0.0)
+    if len(front) < 3:
+        return [float("inf")] * len(front)
+
+    for objective in range(len(fitness[front[0]])):
+        values = {i: fitness[i][objective] for i in front}
+        ordered = sorted(front, key=values.__getitem__)
+        low, high = values[ordered[0]], values[ordered[-1]]
+        distances[ordered[0]] = distances[ordered[-1]] = float("inf")
+        if high == low:
+            continue
+
+        for previous, current, following in zip(ordered, ordered[1:], ordered[2:]):
+            gap = values[following] - values[previous]
+            distances[current] += gap / (high - low)
+
+    return [distances[i] for i in front]
+
+
+def crowded_ranking(fitness):
+    """
+    Returns the rank (the index of its front) and the crowding distance of
+    every member of ``fitness``
+    """
+    ranks = [0] * len(fitness)
+    crowding = [0.0] * len(fitness)
+
+    for rank, front in enumerate(non_dominated_sort(fitness)):
+        for index, distance in zip(front, crowding_distance(fitness, front)):
+            ranks[index] = rank
+            crowding[index] = distance
+
+    return ranks, crowding
+
+
+def nsga2_many(fitness, k, rng=_random):  # pylint: disable=unused-argument
+    """
+    NSGA-II survival: members are ordered by front, then by decreasing
+    crowding distance, and the first ``k`` are selected. If ``k`` exceeds
+    the population, the order is repeated.
+    """
+    ranks, crowding = crowded_ranking(fitness)
+    order = sorted(range(len(fitness)), key=lambda i: (ranks[i], -crowding[i]))
+
+    return [order[i % len(order)] for i in range(k)]
+
+
+nsga2 = batched(nsga2_many)
+
+
+def crowded_tournament(size=2):
+    """
+    Builds a selector where each pick is the best of ``size`` random members
+    by NSGA-II's crowded comparison: the lower front wins, and the larger
+    crowding distance breaks ties
+    """
+    pick = tournament(size).select_many
+
+    def select_many(fitness, k, rng=_random):
+        """
+        Crowded tournament selection
+        """
+        ranks, crowding = crowded_ranking(fitness)
+        # A plain tournament on (-rank, crowding) makes the crowded comparison
+        return pick([(-rank, far) for rank, far in zip(ranks, crowding)], k, rng)
+
+    return batched(select_many)
+
+
+class ParetoArchive:
+    """
+    Keeps the non-dominated members seen during a run, with their objectives.
+    When there are more than ``max_size`` of them, the most crowded are
+    dropped, so the archive stays spread along the front.
+
+    Args:
+        max_size (int): The largest number of members kept
+    """
+
+    def __init__(self, max_size=100):
+        self.max_size = max_size
+        self.members = []
+        self.objectives = []
+
+    def __len__(self):
+        return len(self.members)
+
+    def __iter__(self):
+        return iter(zip(self.members, self.objectives))
+
+    def update(self, individuals, fitness):
+        """
+        Adds the members of ``individuals`` that no archived member
+        dominates, dropping the archived members they dominate
+        """
+        members, objectives = self.members, self.objectives
+        for individual, values in zip(individuals, fitness):
+            if any(old == values or dominates(old, values) for old in objectives):
+                continue
+
+            kept = [
+                i for i, old in enumerate(objectives) if not dominates(values, old)
+            ]
+            members[:] = [members[i] for i in kept]
+            objectives[:] = [objectives[i] for i in kept]
+            members.append(individual)
+            objectives.append(values)
+
+        while len(members) > self.max_size:
+            front = list(range(len(objectives)))
+            distances = crowding_distance(objectives, front)
+            crowded = min(front, key=distances.__getitem__)
+            del members[crowded]
+            del objectives[crowded]
+
+
+__all__ = [
+    "ParetoArchive",
+    "crowded_ranking",
+    "crowded_tournament",
+    "crowding_distance",
+    "dominates",
+    "non_dominated_sort",
+    "nsga2",
+    "nsga2_many",
+]
@@ -1,11 +1,102 @@
 """
 Provides different strategies for population selection
+
+Every selector is a function that receives a dictionary with the current
+population and their fitness values and returns one selected individual.
+Selectors may also offer a batched version of themselves as their
+``select_many`` attribute: a function ``select_many(fitness, k, rng)`` that
+receives the fitness values as a sequence, draws ``k`` individuals at once
+using ``rng`` (anything with a ``random()`` method, such as the ``random``
+module) and returns their indices in ``fitness``. ``GASolver.select`` uses
+it when available, so the selector's tables are built once per generation
+instead of once per pick.
+
+Besides ``roullete``, there are ``stochastic_universal_sampling`` and the
+builders ``tournament``, ``linear_rank``, ``exponential_rank`` and
+``truncation``, which return selectors with both versions.
 """
-from random import seed, random
+import random as _random
+from bisect import bisect_right
+from heapq import nlargest
+from itertools import accumulate
+from math import ceil
+from random import Random
 
 from .range_dict import RangeDict
 
 
+def _roullete_weights(fitness):
+    """
+    Returns weights proportional to ``fitness`` that a roullete can use.
+    Negative values are shifted so the least fit member gets no chance, and
+    when every weight would be 0 all members get the same chance.
+    """
+    low = min(fitness)
+    if low < 0:
+        fitness = [value - low for value in fitness]
+
+    if not any(fitness):
+        return [1] * len(fitness)
+
+    return fitness
+
+
+def _spin(weights, k, rng):
+    """
+    Draws ``k`` indices with probability proportional to ``weights``
+    """
+    cumulative = list(accumulate(weights))
+    total = cumulative[-1]
+    last = len(cumulative) - 1
+
+    return [min(bisect_right(cumulative, rng.random() * total), last) for _ in range(k)]
+
+
+def batched(select_many):
+    """
+    Builds a classic selector, which picks one member of a population
+    dictionary, out of a ``select_many`` function. The selector keeps it as
+    its ``select_many`` attribute.
+    """
+
+    def selector(population, random_seed=None, rng=None):
+        if rng is None:
+            rng = Random(random_seed) if random_seed is not None else _random
+
+        individuals = list(population)
+        (index,) = select_many(list(population.values()), 1, rng)
+
+        return individuals[index]
+
+    selector.select_many = select_many
+    selector.__doc__ = select_many.__doc__
+    return selector
+
+
+def select_indices(selector, population, fitness, k, rng):
+    """
+    Returns the indices of ``k`` members of ``population``, whose fitness
+    values are ``fitness``, picked by ``selector``: through its
+    ``select_many`` if it has one, otherwise by calling it ``k`` times with a
+    dictionary from each member to its fitness and a ``random_seed`` drawn
+    from ``rng``. The picks are keys of that dictionary, so they're mapped
+    back to members by identity. When the members can't be dictionary keys,
+    such as lists, the dictionary maps each index to its fitness instead.
+    """
+    select_many = getattr(selector, "select_many", None)
+    if select_many is not None:
+        return select_many(fitness, k, rng)
+
+    try:
+        state = dict(zip(population, fitness))
+        position = {id(member): index for index, member in enumerate(population)}
+    except TypeError:
+        state, position = dict(enumerate(fitness)), None
+
+    picks = [selector(state, random_seed=rng.getrandbits(64)) for _ in range(k)]
+    return picks if position is None else [position[id(pick)] for pick in picks]
+
+
 def build_roullete(population):
     """
     Returns a RangeDict with keys related to the value's probability of
@@ -18,41 +109,217 @@ def build_roullete(population):
     >>> build_roullete({"a": 10, "b": 10, "c": 20})
     {(0, 0.25): "a", (0.25, 0.5): "b", (0.5, 1): "c"}
     """
-    sum_probabilities = sum(population.values())
-    averaged_probs = {k: v / sum_probabilities for k, v in population.items()}
-
-    start = 0
-    result = RangeDict()
+    weights = _roullete_weights(list(population.values()))
+    sum_probabilities = sum(weights)
+    bounds = accumulate(v / sum_probabilities for v in weights)
 
-    for value, prob in averaged_probs.items():
-        result[(start, start + prob)] = value
-        start += prob
+    return RangeDict.from_cumulative([0, *bounds], population)
 
-    return result
 
-
-def roullete(population, random_seed=None):
+def roullete(population, random_seed=None, rng=None):
     """
     Uses a classic roullete strategy for selection. Every individual has a
     probability of being selected equal to
 
     (its goal value)/(the sum of all goal values)
 
+    If some goal values are negative, all of them are shifted so the lowest
+    becomes 0. If all of them are 0, every individual has the same chance.
+
     Args:
         population (dict): A dictionary whose keys are the individuals in the
             population and the keys are their fitness value
-        random_seed (int, optional): if supplied, Python PRNG's seed is set to
-            it. Use **only** if you need a total reproducible behavior such
-            as in testing.
+        random_seed (int, optional): if supplied, the draw comes from a new
+            PRNG seeded with it. Use **only** if you need a total reproducible
+            behavior such as in testing.
+        rng (optional): Source of randomness, anything with a ``random()``
+            method. Takes precedence over ``random_seed``. Python's global
+            PRNG is used when neither is given, and it is never reseeded.
 
     Returns:
         One selected member
     """
-    # This is safe because if the seed is None, Python will use a default behavior
-    seed(random_seed)
+    if rng is None:
+        rng = Random(random_seed) if random_seed is not None else _random
+
+    individuals = list(population)
+    (index,) = roullete_many(list(population.values()), 1, rng)
+
+    return individuals[index]
+
+
+def roullete_many(fitness, k, rng=_random):
+    """
+    Batched version of ``roullete``. The cumulative fitness table is built
+    once, in O(N), and each of the ``k`` draws is a binary search on it, in
+    O(log N).
+
+    Args:
+        fitness (sequence): The fitness values of the population
+        k (int): How many individuals to draw
+        rng (optional): Source of randomness, anything with a ``random()``
+            method. Defaults to Python's ``random`` module
+
+    Returns:
+        A list with the indices of the ``k`` selected members
+
+    >>> from random import Random
+    >>> roullete_many([10, 10, 20], 4, Random(1))
+    [0, 2, 2, 1]
+    """
+    return _spin(_roullete_weights(fitness), k, rng)
+
+
+roullete.select_many = roullete_many
+
+
+def stochastic_universal_sampling_many(fitness, k, rng=_random):
+    """
+    Stochastic universal sampling: a roullete with ``k`` equally spaced
+    pointers, spun once. Each member is selected either ``floor`` or
+    ``ceil`` of its expected number of times, and all the draws take a
+    single O(N) pass. The indices come out in population order.
+
+    Takes the same arguments as ``roullete_many``.
+    """
+    if not k:
+        return []
+
+    weights = _roullete_weights(fitness)
+    step = sum(weights) / k
+    pointer = rng.random() * step
+
+    selected = []
+    cumulative = 0
+    for index, weight in enumerate(weights):
+        cumulative += weight
+        while pointer < cumulative and len(selected) < k:
+            selected.append(index)
+            pointer += step
+
+    # Rounding may leave the last pointers just past the end of the wheel
+    selected.extend([len(weights) - 1] * (k - len(selected)))
+    return selected
+
+
+stochastic_universal_sampling = batched(stochastic_universal_sampling_many)
+
+
+def tournament(size=2):
+    """
+    Builds a selector where each pick is the fittest of ``size`` members
+    drawn at random, in O(size). Bigger tournaments mean stronger selection
+    pressure. Fitness may be negative.
+    """
+
+    def select_many(fitness, k, rng=_random):
+        """
+        Tournament selection: each pick is the fittest of a few random members
+        """
+        population = len(fitness)
+        selected = []
+        for _ in range(k):
+            best = rng.randrange(population)
+            for _ in range(size - 1):
+                contender = rng.randrange(population)
+                if fitness[contender] > fitness[best]:
+                    best = contender
+            selected.append(best)
+
+        return selected
+
+    return batched(select_many)
+
+
+def _ranked(fitness, weight, k, rng):
+    """
+    Sorts the members from worst to best and draws ``k`` of them with
+    probability proportional to ``weight(rank, size)``
+    """
+    size = len(fitness)
+    order = sorted(range(size), key=fitness.__getitem__)
+    weights = [weight(rank, size) for rank in range(size)]
+
+    return [order[rank] for rank in _spin(weights, k, rng)]
+
+
+def linear_rank(pressure=1.5):
+    """
+    Builds a linear rank selector: the chance of each member grows linearly
+    with its rank, not its fitness, so outliers don't take over and negative
+    values are fine. With ``pressure`` (between 1 and 2) the best member is
+    expected to be picked ``pressure`` times per N draws and the worst
+    ``2 - pressure`` times.
+    """
+    if not 1 <= pressure <= 2:
+        raise ValueError("pressure must be between 1 and 2")
+
+    def weight(rank, size):
+        if size == 1:
+            return 1
+        return 2 - pressure + 2 * (pressure - 1) * rank / (size - 1)
+
+    def select_many(fitness, k, rng=_random):
+        """
+        Linear rank selection: chances grow linearly with the rank
+        """
+        return _ranked(fitness, weight, k, rng)
+
+    return batched(select_many)
+
+
+def exponential_rank(base=0.9):
+    """
+    Builds an exponential rank selector: the best member has weight 1, the
+    second ``base``, the third ``base ** 2`` and so on. Smaller bases mean
+    stronger selection pressure.
+    """
+    if not 0 < base <= 1:
+        raise ValueError("base must be in (0, 1]")
+
+    def weight(rank, size):
+        return base ** (size - 1 - rank)
+
+    def select_many(fitness, k, rng=_random):
+        """
+        Exponential rank selection: chances decay exponentially with the rank
+        """
+        return _ranked(fitness, weight, k, rng)
+
+    return batched(select_many)
+
+
+def truncation(fraction=0.5):
+    """
+    Builds a truncation selector: only the ``fraction`` fittest members are
+    kept and the picks cycle through them, best first, so each is picked
+    about as many times as the others. No randomness is used.
+    """
+    if not 0 < fraction <= 1:
+        raise ValueError("fraction must be in (0, 1]")
+
+    def select_many(fitness, k, rng=_random):  # pylint: disable=unused-argument
+        """
+        Truncation selection: the picks cycle through the fittest members
+        """
+        kept = max(1, ceil(len(fitness) * fraction))
+        best = nlargest(kept, range(len(fitness)), key=fitness.__getitem__)
+
+        return [best[i % kept] for i in range(k)]
+
+    return batched(select_many)
 
-    # pylint: disable=fixme
-    # TODO: Cache this call somehow. LRU, maybe. Difficulty: dicts are non hashable
-    population_range = build_roullete(population)
 
-    return population_range[random()]
+__all__ = [
+    "batched",
+    "build_roullete",
+    "exponential_rank",
+    "linear_rank",
+    "roullete",
+    "roullete_many",
+    "select_indices",
+    "stochastic_universal_sampling",
+    "stochastic_universal_sampling_many",
+    "tournament",
+    "truncation",
+]
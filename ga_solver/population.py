@@ -0,0 +1,155 @@
+"""
+Provides Population, the container that holds the members of a generation
+along with their fitness
+"""
+from collections.abc import MutableSequence, Sequence
+from itertools import count
+
+from .fitness import UNKNOWN
+
+_ids = count()
+
+
+class Population(MutableSequence):
+    """
+    The members of a generation. Genomes are kept in a list, their fitness
+    in a parallel list and every member has an integer id. Members are only
+    ever addressed by their index, so genomes don't need to be hashable and
+    duplicates are kept as separate members, each with its own chance of
+    being selected.
+
+    It behaves like a list of genomes. Members added or replaced through the
+    list interface have an ``UNKNOWN`` fitness and a new id; members copied
+    with ``take`` keep both.
+
+    Args:
+        genomes (iterable, optional): The genomes of the members
+        fitness (iterable, optional): Their fitness, if already known
+
+    >>> population = Population([[1, 2], [1, 2], [3, 4]])
+    >>> population.set_fitness([0, 2], [3, 7])
+    >>> population.unknown()
+    [1]
+    >>> population.take([2, 0]).fitness
+    [7, 3]
+    """
+
+    def __init__(self, genomes=(), fitness=None):
+        self._genomes = list(genomes)
+        if fitness is None:
+            self._fitness = [UNKNOWN] * len(self._genomes)
+        else:
+            self._fitness = list(fitness)
+            if len(self._fitness) != len(self._genomes):
+                raise ValueError("genomes and fitness must have the same length")
+        self._ids = [next(_ids) for _ in self._genomes]
+
+    @property
+    def genomes(self):
+        """
+        The genomes, as a list
+        """
+        return list(self._genomes)
+
+    @property
+    def fitness(self):
+        """
+        The fitness of each member, ``UNKNOWN`` for those not evaluated yet
+        """
+        return list(self._fitness)
+
+    @property
+    def ids(self):
+        """
+        The id of each member
+        """
+        return list(self._ids)
+
+    def __len__(self):
+        return len(self._genomes)
+
+    def __iter__(self):
+        return iter(self._genomes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(len(self))[index])
+        return self._genomes[index]
+
+    def __setitem__(self, index, genome):
+        if isinstance(index, slice):
+            raise TypeError("Population doesn't support slice assignment")
+        self._genomes[index] = genome
+        self._fitness[index] = UNKNOWN
+        self._ids[index] = next(_ids)
+
+    def __delitem__(self, index):
+        del self._genomes[index]
+        del self._fitness[index]
+        del self._ids[index]
+
+    def insert(self, index, value):
+        self._genomes.insert(index, value)
+        self._fitness.insert(index, UNKNOWN)
+        self._ids.insert(index, next(_ids))
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return self._genomes == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Population({self._genomes!r})"
+
+    def add(self, genome, fitness=UNKNOWN, member_id=None):
+        """
+        Appends ``genome`` with a known ``fitness``. It keeps ``member_id``, if
+        given, otherwise it gets a new id.
+        """
+        self._genomes.append(genome)
+        self._fitness.append(fitness)
+        self._ids.append(next(_ids) if member_id is None else member_id)
+
+    def take(self, indices):
+        """
+        Returns a new Population with the members at ``indices``, which may
+        repeat. Each copy keeps the fitness and id of its original.
+        """
+        # pylint: disable=protected-access
+        taken = Population()
+        genomes, fitness, ids = self._genomes, self._fitness, self._ids
+        taken._genomes = [genomes[i] for i in indices]
+        taken._fitness = [fitness[i] for i in indices]
+        taken._ids = [ids[i] for i in indices]
+        return taken
+
+    def unknown(self):
+        """
+        Returns the indices of the members whose fitness is ``UNKNOWN``
+        """
+        return [i for i, value in enumerate(self._fitness) if value is UNKNOWN]
+
+    def indices(self, ids):
+        """
+        Returns the indices of the members whose id is in ``ids``
+        """
+        if not ids:
+            return []
+        return [i for i, member_id in enumerate(self._ids) if member_id in ids]
+
+    def set_fitness(self, indices, values):
+        """
+        Sets the fitness of the members at ``indices`` to ``values``
+        """
+        fitness = self._fitness
+        for index, value in zip(indices, values):
+            fitness[index] = value
+
+    def items(self):
+        """
+        Returns a list of ``(genome, fitness)`` pairs
+        """
+        return list(zip(self._genomes, self._fitness))
+
+
+__all__ = ["Population", "UNKNOWN"]
@@ -4,10 +4,11 @@ where one needs to find a value whose key lies
 between a range
 """
 
-from collections import UserDict
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
 
-# pylint: disable=too-many-ancestors
-class RangeDict(UserDict):
+
+class RangeDict:
     """
     RangeDict allows the user to store values using ranges as keys.
 
@@ -15,51 +16,216 @@ class RangeDict(UserDict):
     >>> ra[(0, 10)] = "a"
     >>> ra[(10, 20)] = "b"
     >>> ra[2]
-    "a"
-    >>> ra[5]
-    "b"
+    'a'
+    >>> ra[15]
+    'b'
 
     As the usual in computing, the ranges are closed in the lower bound and
     open in the upper bound. That is, the example above we have:
 
     >>> ra[10]
-    "b"
+    'b'
     >>> ra[0]
-    "a"
+    'a'
     >>> ra[20]
-    KeyError
+    Traceback (most recent call last):
+        ...
+    KeyError: 20
+
+    Internally the ranges are kept as parallel sorted lists of lower bounds,
+    upper bounds and values, so finding the range of a point is a binary
+    search, in O(log n). Ranges can't overlap; trying to insert one that
+    does raises ``ValueError``.
     """
 
-    def __setitem__(self, key, item):
+    def __init__(self, data=None):
+        self._lows = []
+        self._highs = []
+        self._values = []
+
+        if data is not None:
+            for key, value in data.items():
+                self[key] = value
+
+    @classmethod
+    def from_cumulative(cls, bounds, values):
+        """
+        Builds a RangeDict from consecutive ranges at once, in O(n). The
+        ``i``-th value is stored under the range ``(bounds[i], bounds[i + 1])``,
+        so ``bounds`` must have one more element than ``values`` and be
+        non-decreasing. Empty ranges are skipped.
+
+        >>> RangeDict.from_cumulative([0, 0.5, 0.5, 1], "abc")
+        {(0, 0.5): 'a', (0.5, 1): 'c'}
         """
-        Sets a new item
+        bounds = list(bounds)
+        values = list(values)
 
-        TODO:
+        if len(bounds) != len(values) + 1:
+            raise ValueError("bounds must have exactly one more item than values")
 
-            1. Check if key is a tuple
-            2. Check if key[0] < key[1]
-            3. Check if there are no overlaps
-               between the current keys and
-               the new one
-            4. We can actually use range()
-               objects as keys! They do not
-               support decimals, w/ the
-               `in` operator, though.
+        result = cls()
+        for low, high, value in zip(bounds, bounds[1:], values):
+            if high < low:
+                raise ValueError(f"bounds must be non-decreasing, got {low}, {high}")
+            if high > low:
+                result._lows.append(low)
+                result._highs.append(high)
+                result._values.append(value)
+
+        return result
+
+    def __setitem__(self, key, item):
         """
-        # pylint: disable=useless-super-delegation
-        return super().__setitem__(key, item)
+        Stores ``item`` under the range ``key``, a ``(lower, upper)`` tuple.
+        Setting a range that already exists replaces its value; setting one
+        that overlaps any other raises ``ValueError``.
+        """
+        low, high = self._check_range(key)
+        index = bisect_left(self._lows, low)
+
+        if index < len(self._lows) and (self._lows[index], self._highs[index]) == (
+            low,
+            high,
+        ):
+            self._values[index] = item
+            return
+
+        if index > 0 and self._highs[index - 1] > low:
+            raise ValueError(
+                f"{key} overlaps {(self._lows[index - 1], self._highs[index - 1])}"
+            )
+
+        if index < len(self._lows) and self._lows[index] < high:
+            raise ValueError(
+                f"{key} overlaps {(self._lows[index], self._highs[index])}"
+            )
+
+        self._lows.insert(index, low)
+        self._highs.insert(index, high)
+        self._values.insert(index, item)
 
     def __getitem__(self, key):
         """
-        Returns the item between the range
+        Returns the item whose range contains the point ``key``, raising
+        ``KeyError`` if there is none
+        """
+        index = bisect_right(self._lows, key) - 1
+
+        if index >= 0 and key < self._highs[index]:
+            return self._values[index]
 
-        TODO:
+        raise KeyError(key)
+
+    def __delitem__(self, key):
+        """
+        Removes the range ``key``, a ``(lower, upper)`` tuple
+        """
+        index = self._index_of(key)
+        del self._lows[index]
+        del self._highs[index]
+        del self._values[index]
 
-            We're dealing with numbers and ranges, there are lots of
-            optimization to be done, like using a binary search!
+    def __contains__(self, key):
         """
-        for key_, value in self.data.items():
-            if key_[0] <= key < key_[1]:
-                return value
+        ``(lower, upper)`` tuples are checked as ranges, anything else as
+        a point
+        """
+        if isinstance(key, tuple):
+            try:
+                self._index_of(key)
+            except KeyError:
+                return False
+            return True
+
+        index = bisect_right(self._lows, key) - 1
+        return index >= 0 and key < self._highs[index]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self._lows)
+
+    def __eq__(self, other):
+        if isinstance(other, RangeDict):
+            return self.items() == other.items()
+
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def get(self, key, default=None):
+        """
+        Returns the item whose range contains ``key`` or ``default``
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def lookup_many(self, points):
+        """
+        Returns the items whose ranges contain each of ``points``, in order.
+        Faster than looking each point up with ``[]``.
+
+        >>> RangeDict.from_cumulative([0, 1, 3], "ab").lookup_many([2, 0.5, 1])
+        ['b', 'a', 'b']
+        """
+        lows = self._lows
+        highs = self._highs
+        values = self._values
+        result = []
+
+        for point in points:
+            index = bisect_right(lows, point) - 1
+            if index < 0 or point >= highs[index]:
+                raise KeyError(point)
+            result.append(values[index])
+
+        return result
+
+    def keys(self):
+        """
+        Returns the ranges, sorted
+        """
+        return list(zip(self._lows, self._highs))
+
+    def values(self):
+        """
+        Returns the values, sorted by their ranges
+        """
+        return list(self._values)
+
+    def items(self):
+        """
+        Returns ``(range, value)`` pairs, sorted by range
+        """
+        return list(zip(self.keys(), self._values))
+
+    def _index_of(self, key):
+        low, high = self._check_range(key)
+        index = bisect_left(self._lows, low)
+
+        if index < len(self._lows) and (self._lows[index], self._highs[index]) == (
+            low,
+            high,
+        ):
+            return index
+
+        raise KeyError(key)
+
+    @staticmethod
+    def _check_range(key):
+        if not isinstance(key, tuple) or len(key) != 2:
+            raise TypeError(f"RangeDict keys must be (lower, upper) tuples, got {key}")
+
+        low, high = key
+        if not low < high:
+            raise ValueError(f"The lower bound of {key} must be below its upper bound")
 
-        return KeyError
+        return low, high
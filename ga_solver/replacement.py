@@ -0,0 +1,137 @@
+"""
+Provides the helpers behind elitism and steady-state replacement in
+``GASolver``
+"""
+from heapq import heapify, heappop, heappush, nlargest
+
+
+def elite_indices(fitness, count):
+    """
+    Returns the indices of the ``count`` fittest members, best first, in
+    O(N log count)
+    """
+    if count <= 0:
+        return []
+
+    return nlargest(count, range(len(fitness)), key=fitness.__getitem__)
+
+
+# pylint: disable=too-many-instance-attributes
+class SteadyState:
+    """
+    Tracks the worst and the best members of a population that changes a few
+    members at a time. Both are kept in heaps whose stale entries are skipped
+    lazily, so finding the worst members and replacing them costs O(log N)
+    each, instead of a pass over the population.
+
+    The sum of the fitness values is kept too, in ``total``, so ``mean`` is
+    also O(1), and so is the number of members ``on_target``, in ``hits``.
+
+    Args:
+        population (list): The population. It's changed in place by
+            ``replace``.
+        fitness (list): The fitness of each member of ``population``.
+        on_target (function, optional): Tells whether a fitness value is a
+            solution. Without it ``hits`` stays 0.
+    """
+
+    def __init__(self, population, fitness, on_target=None):
+        self.population = population
+        self.fitness = list(fitness)
+        self.on_target = on_target
+        self.hits = sum(map(on_target, self.fitness)) if on_target else 0
+        self.total = None
+        self._versions = [0] * len(self.fitness)
+        self._worst = []
+        self._best = []
+        self._rebuild()
+
+    def _rebuild(self):
+        """
+        Rebuilds both heaps from ``fitness``, dropping their stale entries,
+        and recomputes ``total``
+        """
+        try:
+            self.total = sum(self.fitness)
+        except TypeError:
+            self.total = None
+
+        versions = self._versions
+        self._worst = [
+            (value, index, versions[index]) for index, value in enumerate(self.fitness)
+        ]
+        self._best = [(-value, index, version) for value, index, version in self._worst]
+        heapify(self._worst)
+        heapify(self._best)
+
+    def _fresh(self, entry):
+        _, index, version = entry
+        return self._versions[index] == version
+
+    def pop_worst(self, count):
+        """
+        Returns the indices of the ``count`` least fit members, worst first.
+        They are expected to be ``replace``-d right away.
+        """
+        worst = []
+        heap = self._worst
+        while heap and len(worst) < count:
+            entry = heappop(heap)
+            if self._fresh(entry):
+                worst.append(entry[1])
+
+        return worst
+
+    def best(self):
+        """
+        Returns the index of the fittest member and its fitness
+        """
+        heap = self._best
+        while not self._fresh(heap[0]):
+            heappop(heap)
+
+        value, index, _ = heap[0]
+        return index, -value
+
+    def worst(self):
+        """
+        Returns the index of the least fit member and its fitness
+        """
+        heap = self._worst
+        while not self._fresh(heap[0]):
+            heappop(heap)
+
+        value, index, _ = heap[0]
+        return index, value
+
+    @property
+    def mean(self):
+        """
+        The mean fitness, kept up to date by ``replace``, or None
+        """
+        if self.total is None:
+            return None
+        return self.total / len(self.fitness)
+
+    def replace(self, index, individual, value):
+        """
+        Puts ``individual``, whose fitness is ``value``, in place of the member
+        at ``index``
+        """
+        if self.total is not None:
+            self.total += value - self.fitness[index]
+        if self.on_target is not None:
+            self.hits += self.on_target(value) - self.on_target(self.fitness[index])
+        self.population[index] = individual
+        self.fitness[index] = value
+        self._versions[index] += 1
+        version = self._versions[index]
+
+        heappush(self._worst, (value, index, version))
+        heappush(self._best, (-value, index, version))
+
+        if len(self._best) > 2 * len(self.fitness) + 16:
+            self._rebuild()
+
+
+__all__ = ["SteadyState", "elite_indices"]
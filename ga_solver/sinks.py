@@ -0,0 +1,85 @@
+"""
+Provides sinks for the ``GenerationSummary`` of each step of a solver
+
+A sink is any function that accepts a summary; give them to ``GASolver``
+as ``sinks`` and every summary is handed to each of them as soon as the step
+ends, so a long run can be watched, logged or plotted without keeping its
+history in memory. Plain callbacks work as they are; the classes here cover
+files and queues.
+"""
+import json
+
+
+class JSONLinesSink:
+    """
+    Writes each summary as one line of JSON.
+
+    Args:
+        file (str or file): A path, which is opened for writing and closed by
+            ``close``, or an open text file, which is left open.
+        flush (bool, optional): Flush after every line, so the file can be
+            followed while the run goes on. Defaults to False.
+
+    Values that JSON doesn't know, such as custom individuals, are written as
+    their ``repr``.
+    """
+
+    def __init__(self, file, flush=False):
+        if isinstance(file, str):
+            # pylint: disable=consider-using-with
+            self.file = open(file, "w", encoding="utf-8")
+            self._owned = True
+        else:
+            self.file = file
+            self._owned = False
+        self.flush = flush
+
+    def __call__(self, summary):
+        self.file.write(json.dumps(summary.as_dict(), default=repr) + "\n")
+        if self.flush:
+            self.file.flush()
+
+    def close(self):
+        """
+        Closes the file, if it was opened by the sink
+        """
+        if self._owned:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class QueueSink:
+    """
+    Puts each summary in a queue, e.g. a ``queue.Queue`` read by another
+    thread or a ``multiprocessing.Queue`` read by another process.
+
+    Args:
+        queue: Anything with a ``put(item, block, timeout)`` method
+        block (bool, optional): Whether to wait when the queue is full.
+            Defaults to True.
+        timeout (float, optional): How long to wait when blocking.
+
+    ``close`` puts None in the queue, to tell the reader that the run is over.
+    """
+
+    def __init__(self, queue, block=True, timeout=None):
+        self.queue = queue
+        self.block = block
+        self.timeout = timeout
+
+    def __call__(self, summary):
+        self.queue.put(summary, self.block, self.timeout)
+
+    def close(self):
+        """
+        Tells the reader that no more summaries will come
+        """
+        self.queue.put(None, self.block, self.timeout)
+
+
+__all__ = ["JSONLinesSink", "QueueSink"]
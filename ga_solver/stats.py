@@ -0,0 +1,225 @@
+"""
+Provides the statistics collected by ``GASolver`` about each generation
+"""
+from collections import deque
+
+
+# pylint: disable=too-many-instance-attributes, too-few-public-methods
+class GenerationStats:
+    """
+    What happened during one generation.
+
+    Counters (``goal_calls``, ``delta_calls``, ``cache_hits``, ``crossovers``,
+    ``mutations`` and ``population``) are always filled. Timings and
+    ``diversity`` are only filled when the generation was ``sampled`` for
+    profiling.
+
+    Attributes:
+        step (int): The step of the solver when the generation started
+        sampled (bool): Whether timings and diversity were collected
+        wall (dict): Wall-clock seconds spent on each stage
+        cpu (dict): Process CPU seconds spent on each stage
+        goal_calls (int): How many times ``goal`` was called
+        delta_calls (int): How many times ``goal_delta`` was called
+        cache_hits (int): How many fitness lookups didn't call ``goal``
+        crossovers (int): How many children were produced
+        mutations (int): How many mutations were actually applied
+        population (int): The size of the population at the end
+        diversity (float): Distinct individuals / population size at the end.
+            Unhashable individuals all count as distinct.
+    """
+
+    __slots__ = (
+        "step",
+        "sampled",
+        "wall",
+        "cpu",
+        "goal_calls",
+        "delta_calls",
+        "cache_hits",
+        "crossovers",
+        "mutations",
+        "population",
+        "diversity",
+    )
+
+    def __init__(self, step, sampled):
+        self.step = step
+        self.sampled = sampled
+        self.wall = {}
+        self.cpu = {}
+        self.goal_calls = 0
+        self.delta_calls = 0
+        self.cache_hits = 0
+        self.crossovers = 0
+        self.mutations = 0
+        self.population = 0
+        self.diversity = None
+
+    def add_time(self, stage, wall, cpu):
+        """
+        Accounts ``wall`` and ``cpu`` seconds to ``stage``
+        """
+        self.wall[stage] = self.wall.get(stage, 0.0) + wall
+        self.cpu[stage] = self.cpu.get(stage, 0.0) + cpu
+
+    @property
+    def total_wall(self):
+        """
+        Wall-clock seconds spent on all the timed stages
+        """
+        return sum(self.wall.values())
+
+    @property
+    def hit_rate(self):
+        """
+        The fraction of fitness lookups that didn't call ``goal``
+        """
+        lookups = self.goal_calls + self.cache_hits
+        return self.cache_hits / lookups if lookups else 0.0
+
+    def as_dict(self):
+        """
+        Returns the stats as a plain dictionary
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"GenerationStats({self.as_dict()})"
+
+
+# pylint: disable=too-many-arguments, too-few-public-methods
+class GenerationSummary:
+    """
+    A few numbers about the population after one step, yielded by
+    ``GASolver``. Small and cheap to build, so it can be kept or sent away
+    without holding on to the population.
+
+    Attributes:
+        step (int): The number of steps run so far
+        best: The best fitness value
+        mean (float): The mean fitness, or None if it can't be averaged
+        worst: The worst fitness value
+        best_individual: A member with the best fitness
+        diversity (float): Distinct individuals / population size, or None
+            when it wasn't measured
+    """
+
+    __slots__ = ("step", "best", "mean", "worst", "best_individual", "diversity")
+
+    def __init__(self, step, best, mean, worst, best_individual, diversity=None):
+        self.step = step
+        self.best = best
+        self.mean = mean
+        self.worst = worst
+        self.best_individual = best_individual
+        self.diversity = diversity
+
+    @classmethod
+    def of(cls, step, population, fitness, key):
+        """
+        Summarizes ``population``, whose ``fitness`` is known, in a single
+        pass. ``key`` identifies distinct individuals.
+        """
+        best_index = max(range(len(fitness)), key=fitness.__getitem__)
+        try:
+            mean = sum(fitness) / len(fitness)
+        except TypeError:
+            mean = None
+
+        return cls(
+            step,
+            fitness[best_index],
+            mean,
+            min(fitness),
+            population[best_index],
+            len(set(map(key, population))) / len(population),
+        )
+
+    def as_dict(self):
+        """
+        Returns the summary as a plain dictionary
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"GenerationSummary({self.as_dict()})"
+
+
+class SolverStats:
+    """
+    Statistics about the generations run by a solver.
+
+    Args:
+        sample_every (int, optional): Timings and diversity are collected on
+            every ``sample_every``-th generation. The default is 0, which
+            disables them and leaves only the counters, whose cost is
+            negligible.
+        history (int, optional): How many ``GenerationStats`` to keep in
+            ``history``. Defaults to 100.
+
+    Attributes:
+        generations (int): How many generations were completed
+        last (GenerationStats): The stats of the last completed generation
+        history (deque): The stats of the latest generations
+        wall (dict): Wall-clock seconds per stage, over all sampled generations
+        crossovers (int): Children produced during the whole run
+        mutations (int): Mutations applied during the whole run
+    """
+
+    def __init__(self, sample_every=0, history=100):
+        self.sample_every = sample_every
+        self.generations = 0
+        self.last = None
+        self.current = None
+        self.history = deque(maxlen=history)
+        self.wall = {}
+        self.crossovers = 0
+        self.mutations = 0
+
+        self._start_counters = (0, 0, 0, 0, 0)
+
+    def start(self, step, fitness_store):
+        """
+        Opens the stats of a new generation and returns them
+        """
+        sampled = bool(self.sample_every) and step % self.sample_every == 0
+        self.current = GenerationStats(step, sampled)
+        self._start_counters = (
+            fitness_store.misses,
+            fitness_store.deltas,
+            fitness_store.hits,
+            self.crossovers,
+            self.mutations,
+        )
+        return self.current
+
+    def finish(self, fitness_store, population, key):
+        """
+        Closes the current generation, filling its counters, and returns it
+        """
+        generation = self.current
+        misses, deltas, hits, crossovers, mutations = self._start_counters
+
+        generation.goal_calls = fitness_store.misses - misses
+        generation.delta_calls = fitness_store.deltas - deltas
+        generation.cache_hits = fitness_store.hits - hits
+        generation.crossovers = self.crossovers - crossovers
+        generation.mutations = self.mutations - mutations
+        generation.population = len(population)
+
+        if generation.sampled:
+            if population:
+                generation.diversity = len(set(map(key, population))) / len(population)
+            for stage, seconds in generation.wall.items():
+                self.wall[stage] = self.wall.get(stage, 0.0) + seconds
+
+        self.generations += 1
+        self.last = generation
+        self.history.append(generation)
+        self.current = None
+
+        return generation
+
+
+__all__ = ["GenerationStats", "GenerationSummary", "SolverStats"]
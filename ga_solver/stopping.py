@@ -0,0 +1,120 @@
+"""
+Provides stopping criteria for ``GASolver``, given as its ``stop_when``
+
+A criterion is called with the solver and the ``GenerationSummary`` of the
+step that just ended, and returns True when the run should stop. Criteria
+only read the summary and the counters the solver keeps anyway, so checking
+them costs next to nothing. If a criterion has a ``start(solver)`` method,
+it's called before the first step.
+"""
+from time import perf_counter
+
+
+class NoImprovement:
+    """
+    Stops when the best fitness hasn't grown by more than ``min_delta`` for
+    ``generations`` steps in a row
+    """
+
+    def __init__(self, generations, min_delta=0):
+        self.generations = generations
+        self.min_delta = min_delta
+        self.best = None
+        self.stalled = 0
+
+    def start(self, solver):  # pylint: disable=unused-argument
+        """
+        Forgets the previous run
+        """
+        self.best = None
+        self.stalled = 0
+
+    def __call__(self, solver, summary):
+        if self.best is None or summary.best > self.best + self.min_delta:
+            self.best = summary.best
+            self.stalled = 0
+        else:
+            self.stalled += 1
+
+        return self.stalled >= self.generations
+
+    def __repr__(self):
+        return f"NoImprovement({self.generations}, min_delta={self.min_delta})"
+
+
+class WallClock:
+    """
+    Stops once ``seconds`` have passed since the first step started
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.started = None
+
+    def start(self, solver):  # pylint: disable=unused-argument
+        """
+        Starts the clock
+        """
+        self.started = perf_counter()
+
+    def __call__(self, solver, summary):
+        return perf_counter() - self.started >= self.seconds
+
+    def __repr__(self):
+        return f"WallClock({self.seconds})"
+
+
+class EvaluationBudget:
+    """
+    Stops once ``goal`` has been called ``evaluations`` times by the solver.
+    Values derived by ``goal_delta`` count too, as ``delta_weight`` of an
+    evaluation each.
+    """
+
+    def __init__(self, evaluations, delta_weight=0):
+        self.evaluations = evaluations
+        self.delta_weight = delta_weight
+
+    def __call__(self, solver, summary):
+        store = solver.fitness_store
+        spent = store.misses + self.delta_weight * store.deltas
+        return spent >= self.evaluations
+
+    def __repr__(self):
+        return f"EvaluationBudget({self.evaluations})"
+
+
+class DiversityCollapse:
+    """
+    Stops when the diversity of the population, the rate of distinct
+    individuals, stays at or below ``threshold`` for ``patience`` steps in a
+    row. Steps without a measured diversity are skipped.
+    """
+
+    def __init__(self, threshold=0.1, patience=1):
+        self.threshold = threshold
+        self.patience = patience
+        self.collapsed = 0
+
+    def start(self, solver):  # pylint: disable=unused-argument
+        """
+        Forgets the previous run
+        """
+        self.collapsed = 0
+
+    def __call__(self, solver, summary):
+        if summary.diversity is None:
+            return False
+
+        if summary.diversity <= self.threshold:
+            self.collapsed += 1
+        else:
+            self.collapsed = 0
+
+        return self.collapsed >= self.patience
+
+    def __repr__(self):
+        return f"DiversityCollapse({self.threshold}, patience={self.patience})"
+
+
+__all__ = ["DiversityCollapse", "EvaluationBudget", "NoImprovement", "WallClock"]
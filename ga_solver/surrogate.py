@@ -0,0 +1,374 @@
+"""
+Provides surrogate pre-screening for ``GASolver``: a cheap model, trained on
+the values ``goal`` already returned, predicts the fitness of the new members
+of each generation, and only the most promising of them are sent to ``goal``
+
+>>> solver = GASolver(
+...     initial_pop,
+...     expensive_goal,
+...     target_value,
+...     mutation,
+...     prob_mutation,
+...     crossover,
+...     tournament(3),
+...     surrogate=Prescreen(NearestNeighbors(k=5), fraction=0.25),
+... )
+
+The other members get the predicted value as their fitness. They're listed
+in ``solver.predicted``, never count as solutions, nor in ``best_fit`` or the
+best, mean and worst values of the summary, and their predictions are never
+stored in the fitness store or the memo. Every ``recalibrate_every``
+generations the members still carrying a prediction are evaluated for real,
+which measures how wrong the model was, and the model is fit again on the
+latest values.
+
+Both models here are pure Python and take genomes as sequences of numbers,
+as returned by ``features``. The nearest neighbours adapt to any landscape;
+the linear regression is faster to query but slower to fit, O(d³) in the
+number of features, so it suits short genomes.
+"""
+from collections import deque
+from heapq import nlargest, nsmallest
+from math import ceil
+from numbers import Number
+
+
+def default_features(genome):
+    """
+    A number is its own single feature; anything else is iterated, e.g. a
+    list of numbers, a ``BitString`` or an ``IntVector``
+    """
+    if isinstance(genome, Number):
+        return (genome,)
+    return tuple(genome)
+
+
+class NearestNeighbors:
+    """
+    Predicts the mean value of the ``k`` closest known points, weighted by
+    the inverse of their Euclidean distance. A known point predicts its own
+    value.
+    """
+
+    def __init__(self, k=5):
+        self.k = k
+        self.points = []
+        self.values = []
+
+    def fit(self, points, values):
+        """
+        Keeps the known points and their values
+        """
+        self.points = list(points)
+        self.values = list(values)
+
+    def predict(self, point):
+        """
+        Returns the predicted value of ``point``
+        """
+        distances = (
+            (sum((a - b) ** 2 for a, b in zip(point, known)), value)
+            for known, value in zip(self.points, self.values)
+        )
+        nearest = nsmallest(self.k, distances, key=_first)
+
+        total = weights = 0.0
+        for distance, value in nearest:
+            if distance == 0:
+                return value
+            weight = distance ** -0.5
+            total += weight * value
+            weights += weight
+
+        return total / weights
+
+    def __repr__(self):
+        return f"NearestNeighbors(k={self.k})"
+
+
+def _first(pair):
+    return pair[0]
+
+
+class LinearRegression:
+    """
+    Least squares with an intercept and a small ``ridge`` penalty, which
+    keeps the fit stable when features are constant or repeated. The normal
+    equations are solved by Gaussian elimination.
+    """
+
+    def __init__(self, ridge=1e-6):
+        self.ridge = ridge
+        self.weights = []
+
+    def fit(self, points, values):
+        """
+        Finds the weights that best fit ``values`` from ``points``
+        """
+        rows = [(1.0, *point) for point in points]
+        size = len(rows[0])
+        gram = [[0.0] * size for _ in range(size)]
+        moment = [0.0] * size
+
+        for row, value in zip(rows, values):
+            for i, x_i in enumerate(row):
+                if x_i:
+                    moment[i] += x_i * value
+                    line = gram[i]
+                    for j, x_j in enumerate(row):
+                        line[j] += x_i * x_j
+
+        for i in range(1, size):
+            gram[i][i] += self.ridge * len(rows)
+
+        self.weights = _solve(gram, moment)
+
+    def predict(self, point):
+        """
+        Returns the predicted value of ``point``
+        """
+        intercept, *weights = self.weights
+        return intercept + sum(w * x for w, x in zip(weights, point))
+
+    def __repr__(self):
+        return f"LinearRegression(ridge={self.ridge})"
+
+
+def _solve(matrix, vector):
+    """
+    Solves ``matrix @ x = vector`` in place, with partial pivoting. Unknowns
+    without a usable pivot are set to 0.
+    """
+    size = len(vector)
+    for column in range(size):
+        pivot, largest = column, abs(matrix[column][column])
+        for row in range(column + 1, size):
+            if abs(matrix[row][column]) > largest:
+                pivot, largest = row, abs(matrix[row][column])
+        if largest < 1e-12:
+            continue
+        matrix[column], matrix[pivot] = matrix[pivot], matrix[column]
+        vector[column], vector[pivot] = vector[pivot], vector[column]
+
+        head = matrix[column]
+        for row in range(column + 1, size):
+            factor = matrix[row][column] / head[column]
+            if factor:
+                line = matrix[row]
+                for j in range(column, size):
+                    line[j] -= factor * head[j]
+                vector[row] -= factor * vector[column]
+
+    solution = [0.0] * size
+    for row in reversed(range(size)):
+        line = matrix[row]
+        if abs(line[row]) < 1e-12:
+            continue
+        rest = sum(line[j] * solution[j] for j in range(row + 1, size))
+        solution[row] = (vector[row] - rest) / line[row]
+
+    return solution
+
+
+# pylint: disable=too-many-instance-attributes
+class Prescreen:
+    """
+    Decides which new members are worth a call to ``goal``. Give it to
+    ``GASolver`` as ``surrogate``.
+
+    Args:
+        model (optional): Anything with ``fit(points, values)`` and
+            ``predict(point)``. Defaults to ``NearestNeighbors()``.
+        fraction (float, optional): The share of the new members of each
+            generation, those with the best predictions, that are evaluated
+            by ``goal``. At least one always is.
+        features (function, optional): Turns a genome into the sequence of
+            numbers the model works on. See ``default_features``.
+        min_samples (int, optional): How many real values are needed before
+            the first prediction. Until then every member is evaluated.
+        recalibrate_every (int, optional): Every this many generations, the
+            members carrying a prediction are evaluated for real and the
+            model is fit again. 0 never does it, so the model is only fit
+            once.
+        max_samples (int, optional): How many of the latest real values are
+            kept to fit the model.
+
+    Its counters are the stats of the run: ``evaluated`` members were sent
+    to ``goal``, ``predictions`` got a predicted value, ``audited`` of them
+    were evaluated later on. ``saved``, ``mean_error`` and ``error_rate``
+    are derived from them.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        model=None,
+        fraction=0.25,
+        features=default_features,
+        min_samples=20,
+        recalibrate_every=5,
+        max_samples=500,
+    ):
+        if not 0 < fraction <= 1:
+            raise ValueError("fraction must be in (0, 1]")
+
+        self.model = NearestNeighbors() if model is None else model
+        self.fraction = fraction
+        self.features = features
+        self.min_samples = min_samples
+        self.recalibrate_every = recalibrate_every
+        self.samples = deque(maxlen=max_samples)
+        self.ready = False
+        self.rounds = 0
+        self.cut = None
+
+        self.evaluated = 0
+        self.predictions = 0
+        self.audited = 0
+        self.absolute_error = 0.0
+        self.held_back = 0
+
+    @property
+    def saved(self):
+        """
+        How many calls to ``goal`` were avoided
+        """
+        return self.predictions - self.audited
+
+    @property
+    def mean_error(self):
+        """
+        The mean absolute error of the audited predictions, or None
+        """
+        return self.absolute_error / self.audited if self.audited else None
+
+    @property
+    def error_rate(self):
+        """
+        The share of audited members that were wrongly held back: their real
+        fitness would have got them evaluated. None before any audit.
+        """
+        return self.held_back / self.audited if self.audited else None
+
+    def due(self):
+        """
+        Whether the next generation should start with a recalibration
+        """
+        every = self.recalibrate_every
+        return self.ready and bool(every) and self.rounds % every == 0
+
+    def screen(self, store, genomes):
+        """
+        Evaluates the most promising ``genomes`` through ``store`` and
+        predicts the fitness of the others. Returns their values and whether
+        each one is a prediction.
+        """
+        self.rounds += 1
+        if not self.ready:
+            values = store.evaluate(genomes)
+            self.evaluated += len(genomes)
+            self.samples.extend(zip(map(self.features, genomes), values))
+            if len(self.samples) >= self.min_samples:
+                self._fit()
+            return values, [False] * len(genomes)
+
+        points = [self.features(genome) for genome in genomes]
+        values = [self.model.predict(point) for point in points]
+        count = max(1, ceil(self.fraction * len(genomes)))
+        chosen = nlargest(count, range(len(genomes)), key=values.__getitem__)
+        self.cut = values[chosen[-1]]
+
+        real = store.evaluate([genomes[i] for i in chosen])
+        predicted = [True] * len(genomes)
+        for index, value in zip(chosen, real):
+            values[index] = value
+            predicted[index] = False
+            self.samples.append((points[index], value))
+
+        self.evaluated += len(chosen)
+        self.predictions += len(genomes) - len(chosen)
+        return values, predicted
+
+    def recalibrate(self, store, genomes, predictions, cuts=None):
+        """
+        Evaluates ``genomes``, whose fitness was predicted as
+        ``predictions``, measures the error and fits the model again on the
+        latest real values. ``cuts`` are the cuts of the rounds the
+        predictions were made in, by default the latest one. Returns the real
+        values.
+        """
+        values = store.evaluate(genomes) if genomes else []
+        self.evaluated += len(genomes)
+        self.audited += len(genomes)
+        if cuts is None:
+            cuts = [self.cut] * len(genomes)
+        for genome, prediction, cut, value in zip(genomes, predictions, cuts, values):
+            self.absolute_error += abs(value - prediction)
+            if value >= cut:
+                self.held_back += 1
+            self.samples.append((self.features(genome), value))
+
+        self._fit()
+        return values
+
+    def fill(self, store, population, unknown, predicted):
+        """
+        Fills the fitness of the members of ``population`` at ``unknown``.
+        ``predicted`` is kept by the solver across generations: it maps the
+        id of each member carrying a prediction to the cut of the round it
+        was made in. When a recalibration is due, those members are
+        evaluated first. At least one member always has a real fitness: when
+        every one carries a prediction, the most promising is evaluated.
+        """
+        ids = population.ids
+        for member_id in predicted.keys() - set(ids):
+            del predicted[member_id]
+
+        if unknown:
+            if self.due():
+                self._audit(store, population, population.indices(predicted), predicted)
+
+            values, guessed = self.screen(store, [population[i] for i in unknown])
+            population.set_fitness(unknown, values)
+            predicted.update(
+                (ids[i], self.cut) for i, flag in zip(unknown, guessed) if flag
+            )
+
+        if predicted and all(member_id in predicted for member_id in ids):
+            best = max(range(len(ids)), key=population.fitness.__getitem__)
+            self._audit(store, population, population.indices({ids[best]}), predicted)
+
+    def _audit(self, store, population, indices, predicted):
+        """
+        Evaluates the members of ``population`` at ``indices``, which carry a
+        prediction, through ``recalibrate``
+        """
+        fitness, ids = population.fitness, population.ids
+        values = self.recalibrate(
+            store,
+            [population[i] for i in indices],
+            [fitness[i] for i in indices],
+            [predicted[ids[i]] for i in indices],
+        )
+        population.set_fitness(indices, values)
+        for i in indices:
+            predicted.pop(ids[i], None)
+
+    def _fit(self):
+        points, values = zip(*self.samples)
+        self.model.fit(points, values)
+        self.ready = True
+
+    def __repr__(self):
+        return (
+            f"Prescreen({self.model!r}, fraction={self.fraction}, "
+            f"saved={self.saved}, error_rate={self.error_rate})"
+        )
+
+
+__all__ = [
+    "LinearRegression",
+    "NearestNeighbors",
+    "Prescreen",
+    "default_features",
+]
@@ -0,0 +1,320 @@
+"""
+Provides Sweep, which runs a solver over many settings and seeds, in
+parallel, and keeps one line of results per run in a CSV file
+
+>>> def build(prob_mutation, selection_rate, random_seed):
+...     return GASolver(
+...         initial_pop,
+...         goal,
+...         target_value,
+...         mutation,
+...         prob_mutation,
+...         crossover,
+...         tournament(3),
+...         selection_rate=selection_rate,
+...         random_seed=random_seed,
+...     )
+>>> sweep = Sweep(
+...     build,
+...     grid(prob_mutation=[0.1, 0.3, 0.5], selection_rate=[0.3, 0.5]),
+...     seeds=range(10),
+...     max_steps=1000,
+...     workers=4,
+... )
+>>> sweep.run("results.csv")
+
+Each line is written as soon as its run ends, so a sweep that was stopped
+halfway picks up where it was when run again with the same file.
+"""
+import csv
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from itertools import product
+from random import Random
+from time import perf_counter
+
+from .stopping import WallClock
+
+RESULT_FIELDS = [
+    "steps",
+    "best",
+    "mean",
+    "worst",
+    "diversity",
+    "found",
+    "stop_reason",
+    "evaluations",
+    "seconds",
+    "error",
+]
+
+
+def grid(**choices):
+    """
+    Returns every combination of the given values, as a list of keyword
+    arguments
+
+    >>> grid(prob_mutation=[0.1, 0.2], min_select=[0])
+    [{'prob_mutation': 0.1, 'min_select': 0}, {'prob_mutation': 0.2, 'min_select': 0}]
+    """
+    names = list(choices)
+    return [dict(zip(names, values)) for values in product(*choices.values())]
+
+
+def random_search(count, random_seed=None, **choices):
+    """
+    Returns ``count`` random combinations of keyword arguments. Each choice
+    may be a sequence, from which a value is drawn, a function that takes a
+    ``random.Random`` and returns a value, or a constant.
+
+    >>> random_search(20, prob_mutation=lambda rng: rng.uniform(0, 1))
+    """
+    rng = Random(random_seed)
+
+    def draw(choice):
+        if callable(choice):
+            return choice(rng)
+        if isinstance(choice, (list, tuple, range)):
+            return rng.choice(choice)
+        return choice
+
+    return [
+        {name: draw(choice) for name, choice in choices.items()}
+        for _ in range(count)
+    ]
+
+
+def describe(value):
+    """
+    A description of a setting that's the same in every process, used for
+    run ids and in the results file. Functions and classes are named by
+    module and qualified name, followed by the values they close over, so
+    ``pop_selectors.tournament(3)`` and ``tournament(5)`` differ. Other
+    values that JSON doesn't know are given as their ``repr``.
+    """
+    if isinstance(value, partial):
+        arguments = [_dumps(argument) for argument in value.args]
+        arguments += [f"{k}={_dumps(v)}" for k, v in sorted(value.keywords.items())]
+        return f"{describe(value.func)}({', '.join(arguments)})"
+
+    if callable(value) and hasattr(value, "__qualname__"):
+        name = f"{value.__module__}.{value.__qualname__}"
+        cells = getattr(value, "__closure__", None) or ()
+        if cells:
+            name += f"({', '.join(_dumps(cell.cell_contents) for cell in cells)})"
+        return name
+
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+
+    return repr(value)
+
+
+def _dumps(value):
+    if callable(value):
+        return describe(value)
+    return json.dumps(value, sort_keys=True, default=describe)
+
+
+def _cell(value):
+    """
+    The text written in the results file for a setting
+    """
+    return describe(value) if callable(value) else value
+
+
+def run_id(params, seed):
+    """
+    A short id for a run that stays the same across sweeps and processes,
+    used to skip the runs already in the results file
+    """
+    text = _dumps([params, seed])
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+def read_results(path):
+    """
+    Returns the lines of a results file as dictionaries of strings, or an
+    empty list if there's no such file
+    """
+    if not os.path.exists(path):
+        return []
+
+    with open(path, newline="", encoding="utf-8") as file:
+        return list(csv.DictReader(file))
+
+
+def _run_one(build, params, seed, max_steps, max_seconds):
+    """
+    Builds and runs one solver and returns its results. Errors are returned
+    too, so one failed run doesn't stop the sweep.
+    """
+    started = perf_counter()
+    try:
+        with build(**params, random_seed=seed) as solver:
+            if max_steps and not 0 < solver.max_steps <= max_steps:
+                solver.max_steps = max_steps
+            if max_seconds:
+                solver.stop_when.append(WallClock(max_seconds))
+
+            solver.run()
+            summary = solver.summary
+            return {
+                "steps": solver.steps,
+                "best": summary.best,
+                "mean": summary.mean,
+                "worst": summary.worst,
+                "diversity": summary.diversity,
+                "found": solver.solution_found,
+                "stop_reason": solver.stop_reason,
+                "evaluations": solver.fitness_store.misses,
+                "seconds": perf_counter() - started,
+            }
+    except Exception as error:  # pylint: disable=broad-except
+        return {"seconds": perf_counter() - started, "error": repr(error)}
+
+
+class Sweep:
+    """
+    Runs a solver once for every combination of settings and seeds.
+
+    Args:
+        build (function): Called as ``build(**params, random_seed=seed)`` for
+            each run, it returns a new ``GASolver``. When running in worker
+            processes, it must be picklable, e.g. defined at the top level of
+            a module.
+        configs (list): The keyword arguments of each setting, as made by
+            ``grid`` or ``random_search``.
+        seeds (iterable, optional): The seeds each setting is run with.
+            Defaults to a single run with no seed.
+        max_steps (int, optional): The most steps each run may take. The
+            solver's own ``max_steps`` is kept if it's smaller.
+        max_seconds (float, optional): The most time each run may take,
+            checked after every step.
+        workers (int, optional): If set and no ``executor`` is given, runs
+            are spread over a ``ProcessPoolExecutor`` with this many
+            processes. The default, 0, runs them one after the other.
+        executor (concurrent.futures.Executor, optional): Runs are submitted
+            to it. It's not shut down by the sweep.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        build,
+        configs,
+        seeds=(None,),
+        max_steps=0,
+        max_seconds=None,
+        workers=0,
+        executor=None,
+    ):
+        self.build = build
+        self.configs = [dict(params) for params in configs]
+        self.seeds = list(seeds)
+        self.max_steps = max_steps
+        self.max_seconds = max_seconds
+        self.workers = workers
+        self.executor = executor
+
+    @property
+    def fields(self):
+        """
+        The columns of the results file
+        """
+        names = sorted({name for params in self.configs for name in params})
+        return ["run_id", "seed"] + names + RESULT_FIELDS
+
+    def runs(self):
+        """
+        Returns the ``(run_id, params, seed)`` of every run, settings first
+        """
+        return [
+            (run_id(params, seed), params, seed)
+            for params in self.configs
+            for seed in self.seeds
+        ]
+
+    def pending(self, path):
+        """
+        Returns the runs that have no complete line without error in ``path``
+        """
+        lines = read_results(path)
+        done = {line["run_id"] for line in lines if line.get("error") == ""}
+        return [run for run in self.runs() if run[0] not in done]
+
+    def run(self, path):
+        """
+        Does the runs that are still pending in the results file ``path``,
+        appending one line to it as each of them ends, and returns those lines
+        """
+        pending = self.pending(path)
+        fields = self.fields
+
+        with self._open(path, fields) as file:
+            writer = csv.DictWriter(file, fields)
+            lines = []
+            for (identifier, params, seed), results in self._execute(pending):
+                line = {name: _cell(value) for name, value in params.items()}
+                line.update(run_id=identifier, seed=seed, **results)
+                writer.writerow(line)
+                file.flush()
+                lines.append(line)
+
+        return lines
+
+    def _execute(self, pending):
+        """
+        Yields each pending run with its results, as they come
+        """
+        options = (self.max_steps, self.max_seconds)
+        if self.executor is None and not self.workers:
+            for run in pending:
+                yield run, _run_one(self.build, run[1], run[2], *options)
+            return
+
+        executor = self.executor or ProcessPoolExecutor(max_workers=self.workers)
+        futures = {}
+        try:
+            futures = {
+                executor.submit(_run_one, self.build, run[1], run[2], *options): run
+                for run in pending
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            if executor is not self.executor:
+                executor.shutdown()
+
+    @staticmethod
+    def _open(path, fields):
+        """
+        Opens ``path`` for appending, writing the header if it's a new file.
+        A line cut short by an interrupted sweep is ended first.
+        """
+        existing = os.path.exists(path) and os.path.getsize(path) > 0
+        ended = True
+        if existing:
+            with open(path, newline="", encoding="utf-8") as file:
+                header = next(csv.reader(file), [])
+            with open(path, "rb") as file:
+                file.seek(-1, os.SEEK_END)
+                ended = file.read(1) == b"\n"
+            if header != fields:
+                raise ValueError(f"{path} has the columns {header}, not {fields}")
+
+        # pylint: disable=consider-using-with
+        file = open(path, "a", newline="", encoding="utf-8")
+        if not existing:
+            csv.writer(file).writerow(fields)
+        if not ended:
+            file.write("\r\n")
+        return file
+
+
+__all__ = ["Sweep", "describe", "grid", "random_search", "read_results", "run_id"]
@@ -0,0 +1,133 @@
+"""
+Tests the NumPy-backed ArraySolver
+"""
+from pytest import fixture, importorskip
+
+from ga_solver import ArraySolver
+from ga_solver import array_solver as ops
+
+np = importorskip("numpy")
+
+
+@fixture
+def max_solver():
+    """
+    Offers an ArraySolver that maximizes -(x² + y²), whose best is at (0, 0)
+    """
+    return ArraySolver(
+        initial_pop=np.random.default_rng(0).uniform(-5, 5, size=(60, 2)),
+        goal=lambda pop: 1 / (1 + (pop ** 2).sum(axis=1)),
+        target_value=1.0,
+        mutation=ops.gaussian_mutation(0.1),
+        prob_mutation=0.3,
+        crossover_="blend",
+        selector="tournament",
+        bounds=(-5, 5),
+        max_steps=60,
+        random_seed=1,
+    )
+
+
+# pylint: disable=redefined-outer-name
+def test_solver_keeps_population_shape(max_solver):
+    """
+    Every generation must keep the shape of the population matrix
+    """
+    for _ in range(5):
+        next(max_solver)
+
+    assert max_solver.population.shape == (60, 2)
+    assert max_solver.fitness.shape == (60,)
+    assert max_solver.steps == 5
+
+
+def test_solver_improves(max_solver):
+    """
+    The best fitness should improve over the generations
+    """
+    initial_best = max_solver.best_fit[1]
+
+    for _ in max_solver:
+        pass
+
+    assert max_solver.best_fit[1] > initial_best
+    assert max_solver.best_fit[1] > 0.9
+    assert np.all(np.abs(max_solver.population) <= 5)
+
+
+def test_solver_yields_summaries(max_solver):
+    """
+    Like GASolver, each step yields a GenerationSummary unless full_state
+    is set
+    """
+    summary = next(max_solver)
+    fitness = max_solver.fitness
+
+    assert summary.step == 1
+    assert summary.best == fitness.max() and summary.worst == fitness.min()
+    assert abs(summary.mean - fitness.mean()) < 1e-12
+    assert isinstance(summary.best_individual, tuple)
+    assert 0 < summary.diversity <= 1
+
+    max_solver.full_state = True
+    assert len(next(max_solver)) == len(set(map(tuple, max_solver.population)))
+
+
+def test_non_vectorized_goal(max_solver):
+    """
+    Goals that take one row at a time are also accepted
+    """
+    max_solver.goal = lambda row: -abs(row).sum()
+    max_solver.vectorized = False
+    max_solver.population = [[1, -2], [0, 3]]
+
+    assert max_solver.fitness.tolist() == [-3, -3]
+    assert max_solver.current_state == {(1, -2): -3, (0, 3): -3}
+
+
+def test_crossovers_take_genes_from_parents():
+    """
+    Uniform and one-point children only have genes of their parents
+    """
+    rng = np.random.default_rng(0)
+    parents_a = np.zeros((10, 6), dtype=int)
+    parents_b = np.ones((10, 6), dtype=int)
+
+    for crossover in (ops.uniform_crossover, ops.one_point_crossover):
+        children = crossover(parents_a, parents_b, rng)
+        assert children.shape == (10, 6)
+        assert set(np.unique(children)) <= {0, 1}
+
+    children = ops.one_point_crossover(parents_a, parents_b, rng)
+    assert np.all(children[:, 0] == 0)
+    assert np.all(children[:, -1] == 1)
+
+
+def test_bit_flip_respects_mask():
+    """
+    Only the masked genes may flip
+    """
+    population = np.zeros((3, 4), dtype=int)
+    mask = np.zeros((3, 4), dtype=bool)
+    mask[1, 2] = True
+
+    flipped = ops.bit_flip_mutation(population, mask, None)
+
+    assert flipped.sum() == 1
+    assert flipped[1, 2] == 1
+
+
+def test_roulette_with_negative_and_zero_fitness():
+    """
+    Negative fitness is shifted, so the fittest row is picked most and the
+    least fit never; all-zero fitness picks every row alike
+    """
+    rng = np.random.default_rng(1)
+    counts = np.bincount(
+        ops.roulette_indices(np.array([-5.0, -1.0, -3.0]), 3000, rng), minlength=3
+    )
+    assert counts[0] == 0
+    assert counts[1] > counts[2] > 0
+
+    counts = np.bincount(ops.roulette_indices(np.zeros(3), 3000, rng), minlength=3)
+    assert counts.min() > 800
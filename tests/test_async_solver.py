@@ -0,0 +1,233 @@
+"""
+Unit tests for the AsyncGASolver
+"""
+import asyncio
+from random import Random
+
+from pytest import fixture, raises
+
+from ga_solver import AsyncGASolver, FitnessMemo
+from ga_solver.pop_selectors import roullete
+
+
+class ScoringService:
+    """
+    Stands in for a remote scoring service: every request takes a little
+    while and the number of requests in flight is tracked
+    """
+
+    def __init__(self, delay=0.001, slow=()):
+        self.delay = delay
+        self.slow = set(slow)
+        self.calls = []
+        self.batches = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def _request(self, slow):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(1 if slow else self.delay)
+        finally:
+            self.in_flight -= 1
+
+    async def score(self, x):
+        """
+        Scores a single individual
+        """
+        self.calls.append(x)
+        await self._request(x in self.slow)
+        return -abs(x - 10)
+
+    async def score_many(self, xs):
+        """
+        Scores a list of individuals in one request
+        """
+        self.batches.append(list(xs))
+        await self._request(any(x in self.slow for x in xs))
+        return [-abs(x - 10) for x in xs]
+
+
+@fixture(name="service")
+def fixture_service():
+    """
+    Provides a fresh scoring service
+    """
+    return ScoringService()
+
+
+def make_solver(goal, **kwargs):
+    """
+    Builds an AsyncGASolver looking for 10 among the integers
+    """
+    mutation_rng = Random(0)
+    options = {
+        "initial_pop": list(range(20)),
+        "goal": goal,
+        "target_value": 0,
+        "mutation": lambda x: x + mutation_rng.choice((-1, 1)),
+        "prob_mutation": 0.5,
+        "crossover_": lambda x, y: (x + y) // 2,
+        "selector": roullete,
+        "random_seed": 0,
+    }
+    return AsyncGASolver(**{**options, **kwargs})
+
+
+async def collect(solver):
+    """
+    Runs ``solver`` to the end and returns its states
+    """
+    return [state async for state in solver]
+
+
+def test_async_for_runs_generations(service):
+    """
+    The solver must iterate with ``async for`` until it stops
+    """
+    solver = make_solver(
+        service.score, initial_pop=[0, 1, 2, 3], target_value=1, max_steps=3
+    )
+    states = asyncio.run(collect(solver))
+
+    assert len(states) == solver.steps == 3
+    assert states[-1].step == 3
+    assert states[-1].best == max(solver.fitness)
+    assert len(service.calls) == solver.fitness_misses
+
+
+def test_new_goal_invalidates_population_fitness(service):
+    """
+    Replacing the goal drops the values computed by the old one
+    """
+    solver = make_solver(service.score, initial_pop=[1, 2, 3])
+    assert asyncio.run(solver.evaluate()) == [-9, -8, -7]
+
+    async def negate(x):
+        return -x
+
+    solver.goal = negate
+    assert solver.population.unknown() == [0, 1, 2]
+    assert asyncio.run(solver.evaluate()) == [-1, -2, -3]
+
+
+def test_stops_when_solution_is_in_initial_population(service):
+    """
+    A solution in the initial population must stop the solver at once
+    """
+    solver = make_solver(service.score, max_steps=5)
+    assert asyncio.run(collect(solver)) == []
+    assert solver.solution_found
+    assert service.calls == list(range(20))
+
+
+def test_concurrency_is_bounded(service):
+    """
+    No more than ``concurrency`` calls may be in flight at once
+    """
+    solver = make_solver(service.score, concurrency=4)
+    asyncio.run(solver.evaluate())
+
+    assert service.peak == 4
+    assert solver.fitness_misses == 20
+
+
+def test_timeout_falls_back(service):
+    """
+    Calls that take longer than ``timeout`` get the ``fallback`` fitness,
+    which must not be memoized
+    """
+    service.slow = {3}
+    memo = FitnessMemo()
+    solver = make_solver(service.score, timeout=0.1, fallback=-1000, memo=memo)
+
+    fitness = asyncio.run(solver.evaluate())
+
+    assert fitness[3] == -1000
+    assert fitness[4] == -6
+    assert solver.timeouts == 1
+    assert memo.get(3) is None
+    assert memo.get(4) == -6
+
+
+def test_timeout_without_fallback_raises(service):
+    """
+    Without a ``fallback``, a timeout must reach the caller
+    """
+    service.slow = {3}
+    solver = make_solver(service.score, timeout=0.1)
+
+    with raises(asyncio.TimeoutError):
+        asyncio.run(solver.evaluate())
+
+
+def test_batch_endpoint(service):
+    """
+    ``goal_batch`` must receive the pending members in chunks of
+    ``batch_size``, and repeated members only once
+    """
+    solver = make_solver(
+        service.score,
+        initial_pop=list(range(9)) * 2,
+        goal_batch=service.score_many,
+        batch_size=4,
+    )
+    fitness = asyncio.run(solver.evaluate())
+
+    assert fitness == [-abs(x - 10) for x in range(9)] * 2
+    assert [len(batch) for batch in service.batches] == [4, 4, 1]
+    assert not service.calls
+
+
+def test_batch_attribute_of_goal(service):
+    """
+    A ``batch`` attribute of ``goal`` must be picked up
+    """
+
+    async def wrapper(x):
+        return await service.score(x)
+
+    wrapper.batch = service.score_many
+
+    solver = make_solver(wrapper, max_steps=1, initial_pop=[0, 2])
+    asyncio.run(collect(solver))
+
+    assert service.batches and not service.calls
+
+
+def test_sync_iteration_is_rejected(service):
+    """
+    Plain ``for`` would call the coroutine synchronously
+    """
+    solver = make_solver(service.score)
+    with raises(TypeError):
+        next(solver)
+
+
+def test_classic_selector_with_list_genomes(service):
+    """
+    A selector without ``select_many`` keeps the fitness of the list members
+    it picks, so nothing is looked up before it's awaited
+    """
+
+    def fitter_of_two(population, random_seed=None):
+        first, second = Random(random_seed).sample(list(population), 2)
+        return max(first, second, key=population.get)
+
+    async def goal(genome):
+        return await service.score(genome[0])
+
+    solver = make_solver(
+        goal,
+        initial_pop=[[x] for x in range(20)],
+        crossover_=lambda x, y: [(x[0] + y[0]) // 2],
+        mutation=lambda x: [x[0] + 1],
+        selector=fitter_of_two,
+        target_value=1,
+        max_steps=3,
+    )
+    states = asyncio.run(collect(solver))
+
+    assert len(states) == 3
+    assert all(isinstance(genome, list) for genome in solver.population)
@@ -0,0 +1,81 @@
+"""
+Tests the parallel breeding stage
+"""
+import random
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from random import Random
+
+from ga_solver.breeding import NOT_EVALUATED, breed
+
+
+def crossover(x, y):
+    """
+    Averages both parents
+    """
+    return (x + y) / 2
+
+
+def mutation(x):
+    """
+    Negates the child, so mutations are easy to spot
+    """
+    return -x
+
+
+def noisy_mutation(x):
+    """
+    Adds noise from the global ``random`` module
+    """
+    return x + random.random()
+
+
+def test_breed_is_independent_of_the_executor():
+    """
+    The same seed must produce the same children, serially or in workers
+    """
+    couples = [(i, i + 2) for i in range(40)]
+
+    serial = breed(couples, crossover, mutation, 0.5, Random(3), batch_size=7)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        parallel = breed(
+            couples,
+            crossover,
+            mutation,
+            0.5,
+            Random(3),
+            executor=executor,
+            batch_size=7,
+        )
+
+    assert serial == parallel
+    assert [abs(child) for child, _, _ in serial] == [i + 1 for i in range(40)]
+    assert all((child < 0) == mutated for child, _, mutated in serial)
+    assert any(mutated for _, _, mutated in serial)
+    assert all(fitness is NOT_EVALUATED for _, fitness, _ in serial)
+
+
+def test_breed_attaches_fitness():
+    """
+    With a goal, every child comes back evaluated
+    """
+    children = breed([(1, 3), (2, 6)], crossover, mutation, 0, Random(0), goal=abs)
+
+    assert children == [(2, 2, False), (4, 4, False)]
+
+
+def test_global_random_is_seeded_in_processes():
+    """
+    Operators on the global ``random`` breed the same children for the same
+    seed, whichever worker process runs each batch
+    """
+    couples = [(i, i) for i in range(100)]
+
+    def run():
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            return breed(
+                couples, crossover, noisy_mutation, 1, Random(5), executor=executor
+            )
+
+    first = run()
+    assert first == run()
+    assert len({child - i for i, (child, _, _) in enumerate(first)}) == 100
@@ -0,0 +1,125 @@
+"""
+Tests saving and resuming the solver's state
+"""
+from pytest import fixture, mark, raises
+
+from ga_solver import GASolver
+from ga_solver.checkpoint import load_checkpoint
+from ga_solver.pop_selectors import roullete
+
+SETTINGS = {
+    "goal": lambda x: 1 / (1 + abs(sum(x) - 20)) if isinstance(x, tuple) else x,
+    "target_value": -1,
+    "mutation": lambda x: x[::-1] if isinstance(x, tuple) else x + 1,
+    "prob_mutation": 0.5,
+    "crossover_": lambda x, y: x[:2] + y[2:] if isinstance(x, tuple) else (x + y) / 2,
+    "selector": roullete,
+}
+
+
+@fixture(name="path")
+def fixture_path(tmp_path):
+    """
+    Provides a path for the checkpoint
+    """
+    return str(tmp_path / "run.ckpt")
+
+
+@mark.parametrize(
+    "population",
+    [
+        [1.5, 2.25, 3.0, 4.0],
+        [1, 2, 3, 4, 5],
+        [(1, 2, 3, 4), (4, 3, 2, 1), (9, 9, 1, 1)],
+        ["a", "b"],
+    ],
+)
+def test_round_trip(path, population):
+    """
+    Populations of any kind must come back as they were saved
+    """
+    settings = dict(SETTINGS)
+    if isinstance(population[0], str):
+        settings["goal"] = len
+    solver = GASolver(population, **settings, random_seed=3)
+    solver.steps = 12
+    solver.save_checkpoint(path)
+
+    state = load_checkpoint(path)
+
+    assert list(state["population"]) == population
+    assert list(state["fitness"]) == solver.fitness
+    assert state["steps"] == 12
+    assert state["rng_state"] == solver.rng.getstate()
+
+
+def test_memory_mapped_load(path):
+    """
+    Numeric blocks can be read straight from the mapped file
+    """
+    population = [float(x) for x in range(1000)]
+    GASolver(population, **SETTINGS).save_checkpoint(path)
+
+    state = load_checkpoint(path, mmap=True)
+
+    assert isinstance(state["population"], memoryview)
+    assert state["population"][999] == 999.0
+    assert state["fitness"].tolist() == population
+
+
+def test_resume_continues_the_same_run(path):
+    """
+    A resumed solver must behave exactly like the one that was saved
+    """
+    population = [(1, 2, 3, 4), (4, 3, 2, 1), (9, 9, 1, 1), (5, 5, 5, 5)]
+    solver = GASolver(population, **SETTINGS, random_seed=1)
+    for _ in range(5):
+        next(solver)
+
+    solver.save_checkpoint(path)
+    for _ in range(5):
+        next(solver)
+
+    resumed = GASolver.resume(path, **SETTINGS)
+    assert resumed.steps == 5
+    assert resumed.stats.generations == 5
+    misses = resumed.fitness_misses
+    resumed.fitness  # pylint: disable=pointless-statement
+    assert resumed.fitness_misses == misses
+
+    for _ in range(5):
+        next(resumed)
+
+    assert resumed.population == solver.population
+    assert resumed.steps == solver.steps
+
+
+def test_automatic_checkpoints(path):
+    """
+    Checkpoints must be written every `checkpoint_every` steps
+    """
+    with GASolver(
+        [1.0, 2.0, 3.0, 4.0],
+        **SETTINGS,
+        max_steps=7,
+        checkpoint_every=3,
+        checkpoint_path=path,
+    ) as solver:
+        for _ in solver:
+            pass
+
+    assert load_checkpoint(path)["steps"] == 6
+
+    with raises(ValueError):
+        GASolver([1.0], **SETTINGS, checkpoint_every=3)
+
+
+def test_rejects_other_files(path):
+    """
+    Loading something that is not a checkpoint must fail clearly
+    """
+    with open(path, "wb") as output:
+        output.write(b"not a checkpoint")
+
+    with raises(ValueError):
+        load_checkpoint(path)
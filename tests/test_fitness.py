@@ -0,0 +1,226 @@
+"""
+Unit tests for the FitnessStore
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from pytest import fixture, raises
+
+from ga_solver import FitnessMemo, FitnessStore
+from ga_solver.fitness import UNKNOWN
+
+# pylint: disable=redefined-outer-name
+@fixture
+def calls():
+    """
+    Provides a list that records every call to the goal function
+    """
+    return []
+
+
+@fixture
+def store(calls):
+    """
+    Provides a FitnessStore whose goal records its calls
+    """
+
+    def goal(x):
+        calls.append(x)
+        return x * 2
+
+    return FitnessStore(goal)
+
+
+def test_goal_runs_once_per_individual(store, calls):
+    """
+    Repeated lookups must be served from the store
+    """
+    assert store.evaluate([1, 2, 1]) == [2, 4, 2]
+    assert store.evaluate([2, 1]) == [4, 2]
+    assert calls == [1, 2]
+    assert (store.hits, store.misses) == (3, 2)
+
+
+def test_retain_drops_dead_individuals(store, calls):
+    """
+    Only the individuals that are kept should remain stored
+    """
+    store.evaluate([1, 2, 3])
+    store.retain([2, 5])
+
+    assert 2 in store
+    assert 1 not in store
+    assert len(store) == 1
+
+    store.evaluate([1])
+    assert calls == [1, 2, 3, 1]
+
+
+def test_memo_lru_eviction():
+    """
+    The least recently used value must be the first to go
+    """
+    memo = FitnessMemo(max_entries=2)
+    memo.put("a", 1)
+    memo.put("b", 2)
+    assert memo.get("a") == 1
+
+    memo.put("c", 3)
+
+    assert "b" not in memo
+    assert "a" in memo
+    assert memo.evictions == 1
+
+
+def test_memo_lfu_eviction():
+    """
+    The least frequently used value must be the first to go
+    """
+    memo = FitnessMemo(max_entries=2, policy="lfu")
+    memo.put("a", 1)
+    memo.put("b", 2)
+    memo.get("a")
+    memo.get("a")
+    memo.get("b")
+
+    memo.put("c", 3)
+
+    assert "b" not in memo
+    assert set(["a", "c"]) == {k for k in "abc" if k in memo}
+
+
+def test_memo_max_bytes():
+    """
+    The memo must not hold more bytes than allowed
+    """
+    memo = FitnessMemo(max_bytes=100, sizeof=lambda _: 10)
+    for i in range(20):
+        memo.put(i, i)
+
+    assert len(memo) == 5
+    assert memo.nbytes == 100
+    assert memo.evictions == 15
+
+
+def test_memo_ttl():
+    """
+    Values older than ttl generations must be computed again
+    """
+    memo = FitnessMemo(ttl=2)
+    memo.put("a", 1)
+    memo.next_generation()
+    assert memo.get("a") == 1
+
+    memo.next_generation()
+    assert memo.get("a") is None
+    assert memo.hit_rate == 0.5
+
+
+def test_store_uses_memo_across_generations(calls):
+    """
+    Values forgotten by the store should still come from the memo, and
+    the memo's key function allows unhashable individuals
+    """
+
+    def goal(x):
+        calls.append(x)
+        return sum(x)
+
+    store = FitnessStore(goal, memo=FitnessMemo(key=tuple))
+    assert store.evaluate([[1, 2], [3]]) == [3, 3]
+
+    store.retain([])
+    assert store.evaluate([[3], [1, 2]]) == [3, 3]
+
+    assert calls == [[1, 2], [3]]
+    assert store.misses == 2
+    assert store.memo.hits == 2
+
+
+def test_store_evaluates_misses_on_executor(calls):
+    """
+    With an executor, only the missing individuals are sent to it, once
+    """
+
+    def goal(x):
+        calls.append(x)
+        return -x
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        store = FitnessStore(goal, executor=executor, chunk_size=2)
+        assert store.evaluate([3, 1, 2, 3, 5]) == [-3, -1, -2, -3, -5]
+        assert store.evaluate([5, 6, 1]) == [-5, -6, -1]
+
+    assert sorted(calls) == [1, 2, 3, 5, 6]
+    assert (store.hits, store.misses) == (3, 5)
+
+
+def test_compute_delta_uses_goal_delta(calls):
+    """
+    A mutant's fitness comes from goal_delta when its parent's is known
+    """
+
+    def goal(x):
+        calls.append(x)
+        return sum(x)
+
+    def goal_delta(parent, parent_fitness, change):
+        index, value = change
+        return parent_fitness - parent[index] + value
+
+    store = FitnessStore(goal, goal_delta=goal_delta)
+    assert store.compute_delta((1, 5), (1, 2), (1, 5)) is UNKNOWN
+
+    store.evaluate([(1, 2)])
+    assert store.compute_delta((1, 5), (1, 2), (1, 5)) == 6
+    assert store.evaluate([(1, 5)]) == [6]
+    assert calls == [(1, 2)]
+    assert (store.misses, store.deltas) == (1, 1)
+
+
+def test_store_accepts_unhashable_individuals(calls):
+    """
+    Lists can be evaluated; they are just never shared or memoized, unless
+    the memo key makes them hashable
+    """
+
+    def goal(x):
+        calls.append(x)
+        return sum(x)
+
+    store = FitnessStore(goal, memo=FitnessMemo())
+    assert store.evaluate([[1, 2], [1, 2]]) == [3, 3]
+    assert len(calls) == 2
+    assert len(store.memo) == 0
+    assert [1, 2] not in store
+
+    store = FitnessStore(goal, memo=FitnessMemo(key=tuple))
+    assert store.evaluate([[3, 4], [3, 4]]) == [7, 7]
+    assert calls[2:] == [[3, 4]]
+    assert [3, 4] in store
+
+
+def test_goal_batch_receives_misses_in_chunks():
+    """
+    goal_batch must get every miss once, in chunks of batch_size, and its
+    answers must be checked
+    """
+    batches = []
+
+    def goal_batch(individuals):
+        batches.append(list(individuals))
+        return [x * 3 for x in individuals]
+
+    store = FitnessStore(None, goal_batch=goal_batch, batch_size=2)
+    assert store.evaluate([1, 2, 3, 1, 4, 5]) == [3, 6, 9, 3, 12, 15]
+    assert batches == [[1, 2], [3, 4], [5]]
+    assert store.evaluate([5, 6]) == [15, 18]
+    assert batches[-1] == [6]
+    assert store.misses == 6
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        store = FitnessStore(None, goal_batch=goal_batch, executor=executor)
+        assert store.evaluate(list(range(100))) == [x * 3 for x in range(100)]
+
+    store = FitnessStore(None, goal_batch=lambda individuals: [0])
+    with raises(ValueError):
+        store.evaluate([1, 2])
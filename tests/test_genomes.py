@@ -0,0 +1,137 @@
+"""
+Tests the compact genomes and their operators
+"""
+import pickle
+from random import Random
+
+import pytest
+
+from ga_solver import BitString, FitnessMemo, GASolver, IntVector, RealVector
+from ga_solver.genomes import (
+    bit_flip,
+    creep_mutation,
+    gaussian_mutation,
+    one_point_crossover,
+    uniform_crossover,
+)
+from ga_solver.pop_selectors import tournament
+
+
+def test_bit_string():
+    """
+    Packs, indexes, slices and counts bits without unpacking them
+    """
+    genome = BitString.from_bits([1, 0, 1, 1, 0, 0, 0, 0, 1])
+    assert len(genome) == 9
+    assert str(genome) == "101100001"
+    assert list(genome) == [1, 0, 1, 1, 0, 0, 0, 0, 1]
+    assert genome[2] == 1 and genome[-1] == 1 and genome[4] == 0
+    assert genome[1:4] == BitString.from_bits([0, 1, 1])
+    assert genome[::4] == BitString.from_bits([1, 0, 1])
+    assert genome.count() == 4
+    assert genome.flip(0, 4).hamming(genome) == 2
+    assert BitString.from_bytes(genome.to_bytes(), 9) == genome
+
+    with pytest.raises(IndexError):
+        genome[9]  # pylint: disable=pointless-statement
+    with pytest.raises(ValueError):
+        BitString(8, 3)
+
+
+def test_genomes_hash_and_pickle():
+    """
+    Equal genomes have equal hashes and survive a round trip through pickle
+    """
+    genomes = [
+        BitString.from_bits([0, 1, 1]),
+        IntVector([1, -2, 3]),
+        RealVector([0.5, 1.5]),
+    ]
+    for genome in genomes:
+        copy = pickle.loads(pickle.dumps(genome))
+        assert copy == genome
+        assert hash(copy) == hash(genome)
+        assert len({genome, copy}) == 1
+
+    assert IntVector([1, 2]) != RealVector([1, 2])
+    assert hash(RealVector([-0.0, 1.5])) == hash(RealVector([0.0, 1.5]))
+    assert len({RealVector([-0.0]), RealVector([0.0])}) == 1
+    assert not hasattr(IntVector([1]), "__dict__")
+
+
+def test_vectors():
+    """
+    Vectors keep their genes packed and copy them on change
+    """
+    genome = IntVector([1, 2, 3, 4])
+    assert genome.values.typecode == "b"
+    assert genome[1:3] == IntVector([2, 3])
+    changed = genome.replace([0, 3], [9, 9])
+    assert list(changed) == [9, 2, 3, 9]
+    assert list(genome) == [1, 2, 3, 4]
+    assert repr(RealVector([0.5])) == "RealVector([0.5])"
+
+
+def test_mutations():
+    """
+    Each mutation changes one gene by default, or about ``rate`` of them
+    """
+    rng = Random(3)
+    genome = BitString(0, 1000)
+    assert bit_flip(rng=rng)(genome).count() == 1
+    assert 50 <= bit_flip(0.1, rng)(genome).count() <= 150
+    assert bit_flip(1.0, rng)(genome).count() == 1000
+    assert bit_flip(0.0, rng)(genome) == genome
+
+    vector = IntVector([0] * 100)
+    mutated = creep_mutation(step=3, rate=0.5, low=-2, high=1, rng=rng)(vector)
+    assert all(-2 <= gene <= 1 for gene in mutated)
+    assert sum(1 for gene in mutated if gene) > 10
+
+    real = gaussian_mutation(rng=rng)(RealVector([0.0] * 10))
+    assert sum(1 for gene in real if gene) == 1
+
+
+def test_crossovers():
+    """
+    Children take every gene from one of the parents
+    """
+    rng = Random(5)
+    assert len(uniform_crossover(rng)(BitString(), BitString())) == 0
+
+    ones, zeros = BitString((1 << 64) - 1, 64), BitString(0, 64)
+    child = one_point_crossover(rng)(ones, zeros)
+    assert str(child) == "1" * child.count() + "0" * (64 - child.count())
+    assert 0 < uniform_crossover(rng)(ones, zeros).count() < 64
+
+    vector_a, vector_b = RealVector([1.0] * 20), RealVector([2.0] * 20)
+    child = one_point_crossover(rng)(vector_a, vector_b)
+    assert isinstance(child, RealVector)
+    assert list(child) == sorted(child) and set(child) == {1.0, 2.0}
+    child = uniform_crossover(rng)(vector_a, vector_b)
+    assert set(child) == {1.0, 2.0}
+    assert list(vector_b) == [2.0] * 20
+
+
+def test_solver_one_max():
+    """
+    Finds the string of all ones, with the memo caching packed genomes
+    """
+    rng = Random(7)
+    solver = GASolver(
+        initial_pop=[BitString.random(64, rng) for _ in range(60)],
+        goal=BitString.count,
+        target_value=64,
+        mutation=bit_flip(rng=rng),
+        prob_mutation=0.5,
+        crossover_=uniform_crossover(rng),
+        selector=tournament(3),
+        max_steps=300,
+        random_seed=7,
+        memo=FitnessMemo(),
+        elitism=2,
+    )
+    solver.run()
+
+    assert solver.solution_found
+    assert solver.fitness_store.hits > 0
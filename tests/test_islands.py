@@ -0,0 +1,126 @@
+"""
+Tests the island model
+"""
+import multiprocessing
+from random import Random
+
+from pytest import mark, raises
+
+from ga_solver import GASolver
+from ga_solver.islands import IslandModel, fully_connected, random_topology, ring
+from ga_solver.pop_selectors import roullete
+
+
+# pylint: disable=invalid-name
+def goal(x):
+    """
+    Reaches 1 at the roots of x² - 49
+    """
+    return 1 / (1 + abs(x * x - 49))
+
+
+def make_solver(start=1000, seed=0, max_steps=200):
+    """
+    Builds a solver for x² - 49 whose population starts far from the roots
+    """
+    rng = Random(seed)
+    return GASolver(
+        initial_pop=[start + rng.randint(0, 10) for _ in range(10)],
+        goal=goal,
+        target_value=1,
+        mutation=lambda x: x + rng.randint(-3, 1),
+        prob_mutation=0.9,
+        crossover_=lambda x, y: (x + y) // 2,
+        selector=roullete,
+        max_steps=max_steps,
+        random_seed=seed,
+    )
+
+
+def lucky_island():
+    """
+    An island that already holds a root
+    """
+    return make_solver(start=7, seed=1)
+
+
+def broken_island():
+    """
+    An island that can't be built
+    """
+    raise RuntimeError("broken island")
+
+
+def test_topologies():
+    """
+    Topologies must list the destinations of each island
+    """
+    assert ring(3, None) == [[1], [2], [0]]
+    assert fully_connected(3, None) == [[1, 2], [0, 2], [0, 1]]
+
+    destinations = random_topology(4, Random(0))
+    assert all(len(d) == 1 and d[0] != i for i, d in enumerate(destinations))
+
+
+def test_migrants_spread_the_solution():
+    """
+    The best individual of an island must reach the others
+    """
+    islands = [make_solver(seed=i) for i in range(3)]
+    islands[0].population[0] = 40
+
+    model = IslandModel(
+        islands,
+        migration_interval=1,
+        migrants=1,
+        max_epochs=2,
+        processes=False,
+    )
+    model.run()
+
+    assert any(abs(x) < 100 for x in islands[1].population)
+
+
+def test_stops_when_any_island_finds_a_solution():
+    """
+    The model stops once an island reaches the target
+    """
+    model = IslandModel(
+        [make_solver, lucky_island, make_solver],
+        topology="full",
+        migration_interval=5,
+        processes=False,
+    )
+    result = model.run()
+
+    assert result.found
+    assert result.island == 1
+    assert result.best_value == 1
+    assert result.epochs == 1
+
+
+@mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="Needs the fork start method",
+)
+def test_islands_run_in_processes():
+    """
+    Islands in processes must find the solution and report their steps
+    """
+    model = IslandModel(
+        [make_solver, lucky_island],
+        topology="random",
+        migration_interval=3,
+        context=multiprocessing.get_context("fork"),
+    )
+    result = model.run()
+
+    assert result.found
+    assert abs(result.best) == 7
+    assert len(result.steps) == 2
+
+    with raises(RuntimeError):
+        IslandModel(
+            [make_solver, broken_island],
+            context=multiprocessing.get_context("fork"),
+        ).run()
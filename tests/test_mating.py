@@ -0,0 +1,86 @@
+"""
+Tests the mating schemes
+"""
+from itertools import combinations
+from random import Random
+
+from pytest import mark, raises
+
+from ga_solver import mating
+
+SCHEMES = [
+    mating.random_pairs,
+    mating.all_pairs,
+    mating.fitness_pairs,
+    mating.tournament_pairs(3),
+    mating.assortative_pairs(2),
+]
+
+
+@mark.parametrize("scheme", SCHEMES)
+def test_schemes_return_valid_pairs(scheme):
+    """
+    Every scheme must return k pairs of valid indices
+    """
+    fitness = [1, 5, 2, 8, 3, 3, 9]
+    couples = scheme(fitness, 50, Random(0))
+
+    assert len(couples) == 50
+    for first, second in couples:
+        assert 0 <= first < len(fitness)
+        assert 0 <= second < len(fitness)
+
+
+def test_random_pairs_are_distinct_members():
+    """
+    Uniform pairs never mate an individual with itself
+    """
+    couples = mating.random_pairs([1] * 5, 200, Random(1))
+
+    assert all(first < second for first, second in couples)
+    assert len(set(couples)) == 10
+
+
+def test_all_pairs_reproduces_previous_versions():
+    """
+    all_pairs must draw exactly what older versions of the solver drew
+    """
+    population = ["a", "b", "c", "d", "e"]
+    expected = Random(7).choices(list(combinations(population, 2)), k=6)
+
+    couples = mating.all_pairs([1] * 5, 6, Random(7))
+
+    assert [(population[i], population[j]) for i, j in couples] == expected
+
+
+def test_fitness_pairs_ignores_zero_fitness():
+    """
+    Members without fitness can't be chosen as parents
+    """
+    couples = mating.fitness_pairs([0, 4, 0, 4], 100, Random(2))
+
+    assert set(couples) <= {(1, 3), (3, 1)}
+
+
+def test_fitness_pairs_negative_and_zero_fitness():
+    """
+    Negative values are shifted like in the roullete, so the least fit member
+    is never chosen; all-zero fitness gives everyone the same chance
+    """
+    couples = mating.fitness_pairs([5, 5, -100], 50, Random(0))
+    assert set(couples) <= {(0, 1), (1, 0)}
+
+    couples = mating.fitness_pairs([-3, -1, -2], 50, Random(0))
+    assert set(couples) <= {(1, 2), (2, 1)}
+
+    couples = mating.fitness_pairs([0, 0, 0], 200, Random(0))
+    assert all(first != second for first, second in couples)
+    assert {index for couple in couples for index in couple} == {0, 1, 2}
+
+
+def test_empty_population_cant_mate():
+    """
+    There are no couples in an empty population
+    """
+    with raises(ValueError):
+        mating.random_pairs([], 1, Random(0))
@@ -0,0 +1,136 @@
+"""
+Tests the multi-objective mode
+"""
+from random import Random
+
+from ga_solver import GASolver, ParetoArchive
+from ga_solver.multi_objective import (
+    crowded_tournament,
+    crowding_distance,
+    dominates,
+    non_dominated_sort,
+    nsga2,
+)
+
+
+def naive_fronts(fitness):
+    """
+    Peels fronts off one by one, comparing every pair each time
+    """
+    remaining = set(range(len(fitness)))
+    fronts = []
+    while remaining:
+        front = {
+            i
+            for i in remaining
+            if not any(dominates(fitness[j], fitness[i]) for j in remaining)
+        }
+        fronts.append(front)
+        remaining -= front
+    return fronts
+
+
+def test_dominates():
+    """
+    Better or equal everywhere and better somewhere
+    """
+    assert dominates((2, 3), (1, 3))
+    assert not dominates((2, 3), (2, 3))
+    assert not dominates((2, 1), (1, 3))
+
+
+def test_non_dominated_sort_matches_naive():
+    """
+    Both the two-objective sweep and the general sort agree with the naive
+    version, duplicates included
+    """
+    rng = Random(4)
+    for objectives in (2, 3):
+        fitness = [
+            tuple(rng.randint(0, 6) for _ in range(objectives)) for _ in range(120)
+        ]
+        fronts = non_dominated_sort(fitness)
+        assert [set(front) for front in fronts] == naive_fronts(fitness)
+
+    assert not non_dominated_sort([])
+
+
+def test_crowding_distance():
+    """
+    The ends are infinite and the rest get the normalized gap around them
+    """
+    fitness = [(0, 4), (1, 3), (3, 1), (4, 0)]
+    distances = crowding_distance(fitness, [0, 1, 2, 3])
+    assert distances[0] == distances[3] == float("inf")
+    assert distances[1] == distances[2] == 1.5
+
+
+def test_nsga2_prefers_first_front_then_spread():
+    """
+    Truncation takes the first front before any dominated member
+    """
+    fitness = [(0, 0), (4, 0), (0, 4), (2, 2), (1, 1), (2, 1)]
+    assert set(nsga2.select_many(fitness, 3)) == {1, 2, 3}
+    assert nsga2.select_many(fitness, 5)[3] == 5
+
+
+def test_crowded_tournament():
+    """
+    A full-size tournament always finds a member of the first front
+    """
+    fitness = [(0, 0), (4, 1), (1, 1)]
+    selected = crowded_tournament(50).select_many(fitness, 20, Random(1))
+    assert set(selected) == {1}
+
+
+def test_archive_keeps_non_dominated_and_bounded():
+    """
+    Dominated and repeated members are left out, and the most crowded go
+    first when the archive is full
+    """
+    archive = ParetoArchive(max_size=3)
+    archive.update(["a", "b", "c"], [(1, 1), (0, 3), (1, 1)])
+    assert list(archive) == [("a", (1, 1)), ("b", (0, 3))]
+
+    archive.update(["d", "e", "f"], [(2, 1), (3, 0), (1, 2)])
+    assert len(archive) == 3
+    assert {"b", "e"} <= set(archive.members)
+    assert not any(
+        dominates(new, old)
+        for new in archive.objectives
+        for old in archive.objectives
+    )
+
+
+def test_solver_multi_objective():
+    """
+    Trades off two conflicting goals: the archive ends up spread along
+    x + y = 10 and holds no dominated member
+    """
+    rng = Random(2)
+
+    def mutation(pair):
+        x = max(0, min(10, pair[0] + rng.randint(-1, 1)))
+        return (x, max(0, min(10 - x, pair[1] + rng.randint(-1, 1))))
+
+    solver = GASolver(
+        initial_pop=[(rng.randint(0, 5), 0) for _ in range(30)],
+        goal=lambda pair: pair,
+        target_value=None,
+        mutation=mutation,
+        prob_mutation=0.9,
+        crossover_=lambda a, b: (a[0], min(b[1], 10 - a[0])),
+        selector=nsga2,
+        max_steps=80,
+        random_seed=2,
+        archive=ParetoArchive(20),
+    )
+    solver.run()
+
+    front = solver.pareto_front
+    assert 5 <= len(front) <= 20
+    assert sum(sum(pair) == 10 for pair in front) >= len(front) - 2
+    assert len({x for x, _ in front}) == len(front)
+
+    solver.archive = None
+    assert solver.pareto_front
@@ -2,7 +2,9 @@
 Tests the differente selection strategies available
 """
 
-from pytest import fixture
+from random import Random
+
+from pytest import fixture, raises
 
 import ga_solver.pop_selectors as selectors
 
@@ -34,3 +36,122 @@ def test_roullete(population):
     """
     selected = set(selectors.roullete(population, random_seed=42424) for _ in range(10))
     assert selected == {"d"}
+
+
+def test_roullete_many_returns_indices():
+    """
+    The batched roullete must return k valid indices, skipping members
+    with no chance of being selected
+    """
+    selected = selectors.roullete_many([0, 10, 0, 30], 1000, Random(42))
+
+    assert len(selected) == 1000
+    assert set(selected) == {1, 3}
+    assert 650 < selected.count(3) < 850
+
+
+def test_roullete_has_batched_version():
+    """
+    roullete must advertise its batched version to the solver
+    """
+    assert selectors.roullete.select_many is selectors.roullete_many
+
+
+def test_roullete_handles_negative_and_zero_fitness():
+    """
+    Negative values are shifted and all-zero populations are drawn
+    uniformly, instead of breaking the wheel
+    """
+    selected = selectors.roullete_many([-5, -1, -3], 1000, Random(1))
+    assert set(selected) == {1, 2}
+    assert selected.count(1) > selected.count(2)
+
+    selected = selectors.roullete_many([0, 0, 0], 300, Random(1))
+    assert set(selected) == {0, 1, 2}
+
+    assert selectors.roullete({"a": -1, "b": 0}, random_seed=3) == "b"
+
+
+def test_stochastic_universal_sampling_is_proportional():
+    """
+    Each member must be selected as many times as expected, give or take
+    one, in a single spin
+    """
+    fitness = [1, 2, 3, 4]
+    selected = selectors.stochastic_universal_sampling_many(fitness, 20, Random(7))
+
+    assert len(selected) == 20
+    assert selected == sorted(selected)
+    for index, value in enumerate(fitness):
+        assert abs(selected.count(index) - 2 * value) <= 1
+
+    assert not selectors.stochastic_universal_sampling_many(fitness, 0, Random(7))
+
+
+def test_tournament_prefers_the_fittest():
+    """
+    With a tournament as big as the population, the best member should
+    win most of the time, and a size 1 tournament is a uniform draw
+    """
+    fitness = [-3, -1, -2, -4]
+    selected = selectors.tournament(8).select_many(fitness, 200, Random(2))
+    assert selected.count(1) > 180
+
+    selected = selectors.tournament(1).select_many(fitness, 400, Random(2))
+    assert set(selected) == {0, 1, 2, 3}
+
+
+def test_linear_rank_ignores_scale():
+    """
+    Linear rank selection depends only on the order of the fitness values
+    """
+    select_many = selectors.linear_rank(2).select_many
+
+    assert select_many([1, 1000, 2], 50, Random(3)) == select_many(
+        [-10, 5, 0], 50, Random(3)
+    )
+    assert 0 not in select_many([1, 1000, 2], 200, Random(3))
+
+
+def test_exponential_rank_favours_the_best():
+    """
+    The best member must be the most frequent pick
+    """
+    select_many = selectors.exponential_rank(0.5).select_many
+    selected = select_many([3, 9, 1, 4], 1000, Random(4))
+
+    counts = [selected.count(i) for i in range(4)]
+    assert counts.index(max(counts)) == 1
+    assert counts[1] > counts[3] > counts[0] > counts[2]
+
+
+def test_truncation_keeps_the_best():
+    """
+    Only the fittest fraction is picked, in turns
+    """
+    selected = selectors.truncation(0.5).select_many([5, 1, 7, 3], 5, Random(5))
+    assert selected == [2, 0, 2, 0, 2]
+
+
+def test_selector_builders_validate_parameters():
+    """
+    Out of range parameters must be refused
+    """
+    with raises(ValueError):
+        selectors.linear_rank(3)
+    with raises(ValueError):
+        selectors.exponential_rank(0)
+    with raises(ValueError):
+        selectors.truncation(0)
+
+
+def test_batched_selectors_work_with_the_solver():
+    """
+    The classic single pick must agree with the batched version
+    """
+    selector = selectors.tournament(3)
+    population = {"a": 1, "b": 5, "c": 2}
+
+    pick = selector(population, random_seed=11)
+    (index,) = selector.select_many(list(population.values()), 1, Random(11))
+    assert pick == list(population)[index]
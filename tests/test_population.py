@@ -0,0 +1,54 @@
+"""
+Unit tests for the Population container
+"""
+from pytest import raises
+
+from ga_solver.population import UNKNOWN, Population
+
+
+def test_population_behaves_like_a_list():
+    """
+    The list interface must work on the genomes, keeping fitness and ids
+    aligned with them
+    """
+    population = Population([[1], [2]], fitness=[10, 20])
+    population.append([3])
+    population.extend([[4]])
+    del population[0]
+
+    assert population == [[2], [3], [4]]
+    assert population.fitness == [20, UNKNOWN, UNKNOWN]
+    assert len(set(population.ids)) == 3
+    assert population.unknown() == [1, 2]
+
+    first_id = population.ids[0]
+    population[0] = [5]
+    assert population.fitness[0] is UNKNOWN
+    assert population.ids[0] != first_id
+
+
+def test_take_keeps_fitness_and_ids_of_duplicates():
+    """
+    Copies of the same member are separate members that share its fitness
+    and id
+    """
+    population = Population(["a", "b"], fitness=[1, 2])
+    taken = population.take([1, 1, 0])
+
+    assert taken == ["b", "b", "a"]
+    assert taken.fitness == [2, 2, 1]
+    assert taken.ids == [population.ids[1], population.ids[1], population.ids[0]]
+    assert taken.indices({population.ids[1]}) == [0, 1]
+    assert taken.indices(set()) == []
+
+    taken.set_fitness([2], [5])
+    assert population.fitness == [1, 2]
+    assert population[1:].fitness == [2]
+
+
+def test_population_checks_lengths():
+    """
+    There must be one fitness value per genome
+    """
+    with raises(ValueError):
+        Population([1, 2], fitness=[1])
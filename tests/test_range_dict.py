@@ -1,7 +1,7 @@
 """
 Unit tests for the RangeDict
 """
-from pytest import fixture, mark, raises
+from pytest import fixture, raises
 
 from ga_solver import RangeDict
 
@@ -63,7 +63,6 @@ def test_decimals_works():
     assert r_dict[7.42 - 0.0001] == "a"
 
 
-@mark.xfail
 def test_overlapping_ranges_are_forbidden():
     """
     Tests if overlaps raises error
@@ -75,10 +74,63 @@ def test_overlapping_ranges_are_forbidden():
         r_dict[(1, 3)] = "b"
 
 
-@mark.xfail
 def test_equality_works(r_dict):
     """
     RangeDicts should be comparable with dicts
     """
 
     assert r_dict == {(0, 10): "a", (10, 20): "b", (20, 50): "c"}
+
+
+def test_misses_raise_key_error(r_dict):
+    """
+    Points outside every range must raise KeyError
+    """
+    with raises(KeyError):
+        r_dict[50]  # pylint: disable=pointless-statement
+
+    with raises(KeyError):
+        r_dict[-1]  # pylint: disable=pointless-statement
+
+    assert r_dict.get(50) is None
+    assert 50 not in r_dict
+    assert 49 in r_dict
+
+
+def test_insertion_keeps_ranges_sorted():
+    """
+    Ranges can be inserted in any order and gaps are allowed
+    """
+    r_dict = RangeDict()
+    r_dict[(20, 30)] = "c"
+    r_dict[(0, 10)] = "a"
+    r_dict[(10, 15)] = "b"
+
+    assert list(r_dict) == [(0, 10), (10, 15), (20, 30)]
+    assert r_dict[12] == "b"
+    assert r_dict.get(17) is None
+
+    r_dict[(10, 15)] = "B"
+    assert r_dict[12] == "B"
+
+    with raises(ValueError):
+        r_dict[(14, 21)] = "x"
+
+    with raises(ValueError):
+        r_dict[(5, 5)] = "x"
+
+
+def test_from_cumulative_and_lookup_many():
+    """
+    The bulk constructor and lookup must agree with item-by-item access
+    """
+    r_dict = RangeDict.from_cumulative([0, 10, 10, 20, 50], "axbc")
+
+    assert r_dict == {(0, 10): "a", (10, 20): "b", (20, 50): "c"}
+    assert r_dict.lookup_many([0, 10, 49.9, 5]) == ["a", "b", "c", "a"]
+
+    with raises(KeyError):
+        r_dict.lookup_many([1, 50])
+
+    with raises(ValueError):
+        RangeDict.from_cumulative([0, 10, 5], "ab")
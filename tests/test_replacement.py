@@ -0,0 +1,61 @@
+"""
+Unit tests for the elitism and steady-state helpers
+"""
+from ga_solver.replacement import SteadyState, elite_indices
+
+
+def test_elite_indices():
+    """
+    The fittest members must come first
+    """
+    assert elite_indices([3, 9, 1, 7], 2) == [1, 3]
+    assert elite_indices([3, 9, 1, 7], 0) == []
+
+
+def test_steady_state_tracks_worst_and_best():
+    """
+    Replacing members must keep the worst and best ones up to date
+    """
+    population = list("abcde")
+    steady = SteadyState(population, [5, 1, 4, 2, 3])
+
+    assert steady.best() == (0, 5)
+    assert steady.pop_worst(2) == [1, 3]
+
+    steady.replace(1, "f", 10)
+    steady.replace(3, "g", 0)
+    assert population == list("afcge")
+    assert steady.best() == (1, 10)
+    assert steady.pop_worst(1) == [3]
+
+    steady.replace(3, "h", 6)
+    steady.replace(1, "i", 2)
+    assert steady.best() == (3, 6)
+    assert steady.pop_worst(5) == [1, 4, 2, 0, 3]
+
+
+def test_steady_state_rebuilds_stale_heaps():
+    """
+    Many replacements of the same member must not let the heaps grow
+    """
+    steady = SteadyState([0, 1], [0, 1])
+    for value in range(100):
+        steady.replace(0, value, value)
+
+    assert len(steady._best) <= 2 * 2 + 16  # pylint: disable=protected-access
+    assert steady.best() == (0, 99)
+    assert steady.pop_worst(2) == [1, 0]
+
+
+def test_steady_state_counts_members_on_target():
+    """
+    ``hits`` follows the members on target through replacements
+    """
+    steady = SteadyState(list("abc"), [1, 3, 3], on_target=lambda value: value == 3)
+    assert steady.hits == 2
+
+    steady.replace(1, "d", 5)
+    assert steady.hits == 1
+    steady.replace(0, "e", 3)
+    steady.replace(2, "f", 3)
+    assert steady.hits == 2
@@ -0,0 +1,56 @@
+"""
+Unit tests for the summary sinks
+"""
+import json
+from io import StringIO
+from queue import Queue
+
+from ga_solver.sinks import JSONLinesSink, QueueSink
+from ga_solver.stats import GenerationSummary
+
+
+def make_summary(step):
+    """
+    Builds a summary whose best individual isn't JSON serializable
+    """
+    return GenerationSummary(step, 3, 2.0, 1, {1, 2}, 0.5)
+
+
+def test_json_lines_sink(tmp_path):
+    """
+    Each summary must become a line of JSON
+    """
+    path = tmp_path / "run.jsonl"
+    with JSONLinesSink(str(path)) as sink:
+        sink(make_summary(1))
+        sink(make_summary(2))
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["step"] for line in lines] == [1, 2]
+    assert lines[0]["best_individual"] == "{1, 2}"
+
+
+def test_json_lines_sink_leaves_open_files_open():
+    """
+    Files opened by the caller are the caller's to close
+    """
+    output = StringIO()
+    sink = JSONLinesSink(output, flush=True)
+    sink(make_summary(1))
+    sink.close()
+
+    assert not output.closed
+    assert json.loads(output.getvalue())["mean"] == 2.0
+
+
+def test_queue_sink():
+    """
+    Summaries must be put in the queue, followed by None on close
+    """
+    queue = Queue()
+    sink = QueueSink(queue)
+    sink(make_summary(1))
+    sink.close()
+
+    assert queue.get().step == 1
+    assert queue.get() is None
@@ -1,12 +1,28 @@
 """
 Provides basic unitary tests for the solver
 """
-from random import randint, uniform
+from concurrent.futures import ThreadPoolExecutor
+from random import Random, randint, seed, uniform
 from sys import maxsize
 
 from pytest import fixture, raises
-from ga_solver import GASolver
-from ga_solver.pop_selectors import roullete
+from ga_solver import FitnessMemo, FitnessStore, GASolver, Mutant
+from ga_solver.pop_selectors import (
+    exponential_rank,
+    linear_rank,
+    roullete,
+    stochastic_universal_sampling,
+    tournament,
+    truncation,
+)
+
+
+# pylint: disable=invalid-name
+def square_root_goal(x):
+    """
+    Module-level goal, so it can be sent to worker processes
+    """
+    return -abs(x ** 2 - 49)
 
 
 @fixture
@@ -27,7 +43,8 @@ def eq_solver():
 
         return abs(1 / result)
 
-    mutation = lambda x: x + uniform(-1, 1)
+    mutation_rng = Random(0)
+    mutation = lambda x: x + mutation_rng.uniform(-1, 1)
     crossover = lambda x, y: (x * y) ** 0.5
     gas = GASolver(
         initial_pop=[0, 2, 4, 6],
@@ -71,13 +88,21 @@ def test_solver_honors_mutation_prob(eq_solver):
     """
     Tests if the solver actually respects the given mutation probability
     """
-    # pylint: disable=invalid-name
     eq_solver.random_seed = 4242424242
-    x = 10
-    for _ in range(10):
-        x = eq_solver.mutate(x)
+    eq_solver.mutation = lambda x: x + 1
+
+    mutated = 0
+    for _ in range(1000):
+        mutated = eq_solver.mutate(mutated)
+
+    assert 650 < mutated < 750
 
-    assert x == 2.733731801703599
+    eq_solver.random_seed = 4242424242
+    again = 0
+    for _ in range(1000):
+        again = eq_solver.mutate(again)
+
+    assert again == mutated
 
 
 def test_solver_mutates_all_pop(eq_solver):
@@ -85,16 +110,41 @@ def test_solver_mutates_all_pop(eq_solver):
     Tests if the solver mutate all the population correctly
     """
     eq_solver.random_seed = 4242424242
+    eq_solver.mutation = lambda x: x + 1
 
     for _ in range(10):
         eq_solver.mutate_pop()
 
-    assert eq_solver.current_state == {
-        -7.266268198296398: 0.2632511736631728,
-        -5.266268198296398: 0.047022490603815664,
-        -3.2662681982963973: 0.026088209624562805,
-        -1.2662681982963981: 0.021098575459321596,
-    }
+    moves = [
+        after - before for before, after in zip([0, 2, 4, 6], eq_solver.population)
+    ]
+    assert all(0 < move <= 10 for move in moves)
+    assert len(set(moves)) > 1
+
+
+def test_solver_leaves_global_prng_alone(eq_solver):
+    """
+    Seeded solvers must not reseed Python's global PRNG
+    """
+    seed(1)
+    expected = Random(1).random()
+
+    eq_solver.mutate_pop()
+    eq_solver.select()
+
+    assert uniform(0, 1) == expected
+
+
+def test_spawned_rngs_are_reproducible(eq_solver):
+    """
+    Streams spawned by a seeded solver are independent but reproducible
+    """
+    eq_solver.random_seed = 7
+    streams = [eq_solver.spawn_rng().random() for _ in range(3)]
+
+    eq_solver.random_seed = 7
+    assert [eq_solver.spawn_rng().random() for _ in range(3)] == streams
+    assert len(set(streams)) == 3
 
 
 def test_crossover_works(eq_solver):
@@ -127,7 +177,8 @@ def test_solver_is_iterable(eq_solver):
         if steps == 100:
             break
 
-    assert eq_solver.current_state == {6: 0.07692307692307693}
+    assert eq_solver.steps == 100
+    assert len(eq_solver) == 4
 
 
 def test_solver_honors_max_step(eq_solver):
@@ -148,6 +199,18 @@ def test_solver_honors_max_step(eq_solver):
         next(eq_solver)
 
 
+def test_positional_arguments_keep_their_order():
+    """
+    The arguments of the first versions keep their positions, so older calls
+    still set ``max_steps`` and ``random_seed``
+    """
+    solver = GASolver(
+        [1, 2], square_root_goal, 0, abs, 0.5, max, roullete, 0.5, 0, 2000, 42
+    )
+    assert solver.max_steps == 2000
+    assert solver.random_seed == 42
+
+
 def test_next_keeps_population_size(eq_solver):
     """
     When selecting and crossing-over, the new generation
@@ -223,3 +286,618 @@ def test_solver_honors_min_select(eq_solver):
     eq_solver.selection_rate = 1  # Forces the solver to select everyone
     eq_solver.select()
     assert len(eq_solver) == 5
+
+
+def test_goal_runs_once_per_individual_per_step(eq_solver):
+    """
+    A whole step should not call the goal function more than once for
+    each individual it produces
+    """
+    calls = []
+    goal = eq_solver.goal
+
+    def counting_goal(x):
+        calls.append(x)
+        return goal(x)
+
+    eq_solver.goal = counting_goal
+    eq_solver.population = [randint(-10000, 10000) for _ in range(50)]
+
+    next(eq_solver)
+    eq_solver.best_fit  # pylint: disable=pointless-statement
+    eq_solver.solutions  # pylint: disable=pointless-statement
+
+    assert len(calls) <= 100
+    assert eq_solver.fitness_misses == len(calls)
+    assert eq_solver.fitness_hits > 0
+
+
+def test_new_goal_invalidates_population_fitness(eq_solver):
+    """
+    Replacing the goal drops the values computed by the old one
+    """
+    eq_solver.population = [1, 2, 3]
+    goal = eq_solver.goal
+    assert eq_solver.fitness == [goal(x) for x in [1, 2, 3]]
+
+    eq_solver.goal = lambda x: -x
+    assert eq_solver.fitness == [-1, -2, -3]
+    assert dict(eq_solver.current_state) == {1: -1, 2: -2, 3: -3}
+
+
+def test_memo_avoids_reevaluating_survivors(eq_solver):
+    """
+    With a memo, a genome is scored only once during the whole run
+    """
+    calls = []
+    goal = eq_solver.goal
+
+    def counting_goal(x):
+        calls.append(x)
+        return goal(x)
+
+    eq_solver.fitness_store = FitnessStore(counting_goal, memo=FitnessMemo())
+    eq_solver.population = [0, 2, 4, 6]
+    eq_solver.max_steps = 20
+
+    for _ in eq_solver:
+        pass
+
+    assert len(calls) == len(set(calls))
+    assert eq_solver.memo.generation == 20
+
+
+def test_selection_uses_batched_selector(eq_solver):
+    """
+    When the selector has a `select_many`, it must be called only once
+    per selection
+    """
+    calls = []
+
+    # pylint: disable=unused-argument
+    def selector(population, random_seed=None):
+        raise AssertionError("the per-pick selector should not be used")
+
+    def select_many(fitness, k, rng):  # pylint: disable=unused-argument
+        calls.append(k)
+        return [len(fitness) - 1] * k
+
+    selector.select_many = select_many
+    eq_solver.selector = selector
+
+    assert eq_solver.select(replace=False) == [6, 6]
+    assert calls == [2]
+
+
+def test_solver_evaluates_on_worker_processes():
+    """
+    With `workers`, the goal must run on the pool, which is shut down on exit
+    """
+    with GASolver(
+        initial_pop=[randint(-100, 100) for _ in range(40)],
+        goal=square_root_goal,
+        target_value=0,
+        mutation=lambda x: x + randint(-1, 1),
+        prob_mutation=0.5,
+        crossover_=lambda x, y: (x + y) // 2,
+        selector=roullete,
+        workers=2,
+    ) as solver:
+        expected = [square_root_goal(x) for x in solver.population]
+        assert solver.fitness == expected
+
+    assert solver.fitness_store.executor is None
+
+
+def test_parallel_breeding_keeps_population_and_fitness(eq_solver):
+    """
+    Breeding in workers must keep the population size and attach the
+    children's fitness without evaluating them again
+    """
+    calls = []
+    goal = eq_solver.goal
+
+    def counting_goal(x):
+        calls.append(x)
+        return goal(x)
+
+    eq_solver.goal = counting_goal
+    eq_solver.population = [randint(-10000, 10000) for _ in range(30)]
+    eq_solver.parallel_breeding = True
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        eq_solver.fitness_store.executor = executor
+        next(eq_solver)
+
+    assert len(eq_solver) == 30
+    assert eq_solver.fitness == [goal(x) for x in eq_solver.population]
+    assert eq_solver.fitness_misses == len(calls)
+
+
+def test_parallel_breeding_ignores_the_number_of_workers():
+    """
+    Without a ``chunk_size``, the same seed breeds the same children
+    serially and on any number of workers
+    """
+
+    def run(workers):
+        solver = GASolver(
+            initial_pop=list(range(40)),
+            goal=square_root_goal,
+            target_value=1,
+            mutation=lambda x: x + 1,
+            prob_mutation=0.5,
+            crossover_=lambda x, y: x + y,
+            selector=tournament(2),
+            max_steps=3,
+            random_seed=9,
+            parallel_breeding=True,
+        )
+        if not workers:
+            solver.run()
+            return list(solver.population)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            solver.fitness_store.executor = executor
+            solver.run()
+        return list(solver.population)
+
+    assert run(0) == run(2) == run(8)
+
+
+def test_solver_collects_stats(eq_solver):
+    """
+    Each step must count its goal calls, crossovers and mutations
+    """
+    eq_solver.population = [randint(-10000, 10000) for _ in range(20)]
+    misses = eq_solver.fitness_misses
+
+    next(eq_solver)
+    generation = eq_solver.stats.last
+
+    assert eq_solver.stats.generations == 1
+    assert generation.step == 0
+    assert generation.crossovers == 10
+    assert generation.mutations == eq_solver.stats.mutations
+    assert generation.goal_calls == eq_solver.fitness_misses - misses
+    assert generation.population == 20
+    assert not generation.sampled
+    assert generation.wall == {}
+
+
+def test_solver_profiles_and_calls_hooks(eq_solver):
+    """
+    Profiled steps must be timed stage by stage and reported to the hooks
+    """
+    events = []
+    eq_solver.stats.sample_every = 2
+    eq_solver.on_generation_start = lambda solver: events.append("start")
+    eq_solver.on_generation_end = lambda solver, stats: events.append(stats.step)
+    eq_solver.on_stage = lambda solver, stage, seconds: events.append(stage)
+
+    next(eq_solver)
+    next(eq_solver)
+
+    assert events == [
+        "start",
+        "evaluate",
+        "select",
+        "mating",
+        "crossover",
+        "mutate",
+        "evaluate",
+        0,
+        "start",
+        1,
+    ]
+    first, second = eq_solver.stats.history
+    assert set(first.wall) == {"evaluate", "select", "mating", "crossover", "mutate"}
+    assert 0 < first.diversity <= 1
+    assert second.wall == {}
+    assert second.diversity is None
+
+
+def queens_conflicts(board, columns):
+    """
+    Counts the pairs of queens attacking each other that involve `columns`
+    """
+    return sum(
+        1
+        for i in columns
+        for j in range(len(board))
+        if j != i
+        and (j not in columns or j > i)
+        and abs(board[i] - board[j]) == abs(i - j)
+    )
+
+
+def test_goal_delta_replaces_full_evaluation():
+    """
+    Mutants described with `Mutant` must be scored by goal_delta, with the
+    same result the full goal would give
+    """
+    rng = Random(5)
+
+    def goal(board):
+        return 100 - queens_conflicts(board, range(len(board)))
+
+    def goal_delta(parent, parent_fitness, change):
+        i, j = change
+        board = list(parent)
+        board[i], board[j] = board[j], board[i]
+        before = queens_conflicts(parent, (i, j))
+        after = queens_conflicts(board, (i, j))
+        return parent_fitness + before - after
+
+    def swap_mutation(board):
+        i, j = rng.sample(range(len(board)), 2)
+        mutant = list(board)
+        mutant[i], mutant[j] = mutant[j], mutant[i]
+        return Mutant(tuple(mutant), (i, j))
+
+    solver = GASolver(
+        initial_pop=[tuple(rng.sample(range(8), 8)) for _ in range(20)],
+        goal=goal,
+        target_value=100,
+        mutation=swap_mutation,
+        prob_mutation=1,
+        crossover_=lambda x, y: x,
+        selector=roullete,
+        goal_delta=goal_delta,
+        max_steps=10,
+        random_seed=5,
+    )
+    for _ in solver:
+        pass
+
+    assert solver.fitness_store.deltas > 0
+    assert solver.stats.last.delta_calls > 0
+    assert all(isinstance(board, tuple) for board in solver.population)
+    assert solver.fitness == [goal(board) for board in solver.population]
+
+
+def test_solver_with_batched_selectors_and_negative_fitness():
+    """
+    Every selector of the library must drive the solver, even when all the
+    fitness values are negative
+    """
+    for selector in (
+        roullete,
+        stochastic_universal_sampling,
+        tournament(3),
+        linear_rank(),
+        exponential_rank(),
+        truncation(0.5),
+    ):
+        solver = GASolver(
+            initial_pop=[1, 2, 3, 4, 10, 12],
+            goal=square_root_goal,
+            target_value=0,
+            mutation=lambda x, rng=Random(1): x + rng.choice((-1, 1)),
+            prob_mutation=0.5,
+            crossover_=lambda x, y: (x + y) // 2,
+            selector=selector,
+            max_steps=30,
+            random_seed=1,
+        )
+        for _ in solver:
+            pass
+
+        assert len(solver) == 6
+        assert solver.solution_found
+
+
+def test_elitism_keeps_the_best_unmutated():
+    """
+    The fittest members must survive every step untouched, and their
+    fitness must not be computed again
+    """
+    calls = []
+
+    def goal(x):
+        calls.append(x)
+        return -abs(x - 1000)
+
+    mutation_rng = Random(2)
+    solver = GASolver(
+        initial_pop=[1, 5, 900, 950, 20, 30],
+        goal=goal,
+        target_value=0,
+        mutation=lambda x: x + mutation_rng.randint(-50, 50),
+        prob_mutation=1,
+        crossover_=lambda x, y: (x + y) // 2,
+        selector=tournament(2),
+        elitism=2,
+        max_steps=5,
+        random_seed=2,
+    )
+
+    best = 950
+    for _ in solver:
+        assert len(solver) == 6
+        assert best in solver.population
+        assert calls.count(best) == 1
+        best = solver.best_fit[0][0]
+
+
+def test_elitism_must_leave_room_for_siblings(eq_solver):
+    """
+    Elites take the place of siblings, so there must be enough of them
+    """
+    eq_solver.elitism = 3
+    with raises(ValueError):
+        next(eq_solver)
+
+
+def test_steady_state_replaces_only_the_worst():
+    """
+    Each step must replace the w least fit members and evaluate only the
+    new children
+    """
+    calls = []
+
+    def goal(x):
+        calls.append(x)
+        return -abs(x - 500)
+
+    mutation_rng = Random(3)
+    population = list(range(3, 1000, 10))
+    solver = GASolver(
+        initial_pop=population,
+        goal=goal,
+        target_value=0,
+        mutation=lambda x: x + mutation_rng.randint(-3, 3),
+        prob_mutation=0.5,
+        crossover_=lambda x, y: (x + y) // 2,
+        selector=tournament(3),
+        steady_state=4,
+        max_steps=1,
+        random_seed=3,
+    )
+
+    survivors = sorted(population, key=lambda x: abs(x - 500))[:96]
+    next(solver)
+    assert len(solver) == 100
+    assert all(x in solver.population for x in survivors)
+    assert len(calls) == 100 + 4
+
+    solver.max_steps = 0
+    for _ in solver:
+        pass
+    assert solver.solution_found
+    assert solver.fitness == [goal(x) for x in solver.population]
+
+
+def test_solver_with_list_genomes():
+    """
+    Boards may be lists, with no conversion to tuples, and unmutated
+    survivors must keep their fitness
+    """
+    rng = Random(8)
+    calls = []
+
+    def goal(board):
+        calls.append(board)
+        return 100 - queens_conflicts(board, range(len(board)))
+
+    def mutation(board):
+        i, j = rng.sample(range(8), 2)
+        board = list(board)
+        board[i], board[j] = board[j], board[i]
+        return board
+
+    solver = GASolver(
+        initial_pop=[rng.sample(range(8), 8) for _ in range(20)],
+        goal=goal,
+        target_value=100,
+        mutation=mutation,
+        prob_mutation=0.3,
+        crossover_=lambda x, y: x[:4] + [gene for gene in y if gene not in x[:4]],
+        selector=tournament(3),
+        max_steps=20,
+        random_seed=8,
+        full_state=True,
+    )
+
+    for state in solver:
+        assert isinstance(state, list)
+        assert len(state) == len(solver) == 20
+
+    assert all(isinstance(board, list) for board in solver.population)
+    assert solver.fitness == [goal(board) for board in solver.population]
+    # Only the 10 children and the mutated survivors are evaluated each step
+    assert len(calls) <= 20 + 15 * solver.steps
+
+
+def fitter_of_two(population, random_seed=None):
+    """
+    A classic selector, without ``select_many``: the fitter of two random
+    keys of the ``population`` dictionary
+    """
+    first, second = Random(random_seed).sample(list(population), 2)
+    return max(first, second, key=population.get)
+
+
+def test_both_modes_stop_on_any_member_on_target():
+    """
+    Steady-state and generational runs stop alike, even when the target is
+    below the best fitness
+    """
+    for steady_state in (0, 2):
+        solver = GASolver(
+            initial_pop=[1, 5, 9, 20],
+            goal=lambda x: x,
+            target_value=4,
+            mutation=lambda x: x,
+            prob_mutation=0,
+            crossover_=max,
+            selector=tournament(2),
+            max_steps=5,
+            tolerance=1,
+            steady_state=steady_state,
+        )
+        solver.run()
+
+        assert solver.stop_reason == "target_value"
+        assert solver.steps == 0
+        assert solver.solutions == [5]
+
+
+def test_classic_selector_with_list_genomes():
+    """
+    A selector without ``select_many`` picks list members, which keep their
+    fitness, so each step only evaluates the children
+    """
+    calls = []
+
+    def goal(genome):
+        calls.append(genome)
+        return -abs(genome[0] - 7)
+
+    solver = GASolver(
+        initial_pop=[[x] for x in range(10)],
+        goal=goal,
+        target_value=1,
+        mutation=lambda x: x,
+        prob_mutation=0,
+        crossover_=lambda x, y: [(x[0] + y[0]) // 2],
+        selector=fitter_of_two,
+        max_steps=3,
+        random_seed=2,
+    )
+    solver.run()
+
+    assert all(isinstance(genome, list) for genome in solver.population)
+    assert solver.fitness == [goal(genome) for genome in solver.population]
+    assert len(calls) == 10 + 5 * 3 + 10
+
+
+def test_steady_state_with_a_classic_selector_and_list_genomes():
+    """
+    Steady-state picks parents with a classic selector, even among lists
+    """
+    solver = GASolver(
+        initial_pop=[[x] for x in range(10)],
+        goal=lambda genome: -abs(genome[0] - 7),
+        target_value=1,
+        mutation=lambda x: x,
+        prob_mutation=0,
+        crossover_=lambda x, y: [(x[0] + y[0]) // 2],
+        selector=fitter_of_two,
+        max_steps=20,
+        random_seed=2,
+        steady_state=1,
+    )
+    solver.run()
+
+    assert len(solver) == 10 and solver.steps == 20
+    assert all(isinstance(genome, list) for genome in solver.population)
+
+
+def test_duplicates_keep_their_selection_pressure():
+    """
+    Copies of a member are separate members, so a population of copies
+    of one member must be selected as such
+    """
+    solver = GASolver(
+        initial_pop=["a"] * 9 + ["b"],
+        goal={"a": 1, "b": 1}.get,
+        target_value=2,
+        mutation=lambda x: x,
+        prob_mutation=0,
+        crossover_=lambda x, y: x,
+        selector=roullete,
+        random_seed=4,
+    )
+    selected = solver.select(replace=False)
+
+    assert len(selected) == 5
+    assert selected.count("a") >= 3
+    assert solver.current_state == {"a": 1, "b": 1}
+
+
+def test_steps_yield_summaries(eq_solver):
+    """
+    Each step must yield a GenerationSummary of the new population, hand it
+    to the sinks, and the full state only when asked for
+    """
+    received = []
+    eq_solver.sinks = [received.append]
+
+    summary = next(eq_solver)
+    fitness = eq_solver.fitness
+    assert summary.step == 1
+    assert summary.best == max(fitness)
+    assert summary.worst == min(fitness)
+    assert summary.mean == sum(fitness) / len(fitness)
+    assert summary.best_individual in eq_solver.best_fit[0]
+    assert 0 < summary.diversity <= 1
+    assert received == [summary]
+
+    eq_solver.full_state = True
+    assert next(eq_solver) == eq_solver.current_state
+    assert received[-1].step == 2
+
+    eq_solver.full_state = False
+    eq_solver.max_steps = 5
+    assert eq_solver.run().step == 5
+    assert [summary.step for summary in received] == [1, 2, 3, 4, 5]
+
+
+def test_steady_state_summary_matches_population():
+    """
+    The summary read from the heaps must agree with the population
+    """
+    mutation_rng = Random(6)
+    solver = GASolver(
+        initial_pop=list(range(0, 2000, 7)),
+        goal=lambda x: -abs(x - 1000.5),
+        target_value=0,
+        mutation=lambda x: x + mutation_rng.randint(-5, 5),
+        prob_mutation=0.5,
+        crossover_=lambda x, y: (x + y) // 2,
+        selector=tournament(2),
+        steady_state=10,
+        max_steps=30,
+        profile_every=10,
+        random_seed=6,
+    )
+
+    for summary in solver:
+        fitness = solver.fitness
+        assert summary.best == max(fitness)
+        assert summary.worst == min(fitness)
+        assert abs(summary.mean - sum(fitness) / len(fitness)) < 1e-6
+        assert (summary.diversity is None) == (summary.step % 10 != 1)
+
+
+def test_goal_batch_scores_each_generation_at_once():
+    """
+    With goal_batch, every generation must be scored in a single call with
+    only its new members
+    """
+    batches = []
+
+    def goal_batch(individuals):
+        batches.append(len(individuals))
+        return [-abs(x - 77) for x in individuals]
+
+    mutation_rng = Random(10)
+    solver = GASolver(
+        initial_pop=list(range(0, 200, 5)),
+        goal=None,
+        goal_batch=goal_batch,
+        target_value=0,
+        mutation=lambda x: x + mutation_rng.randint(-2, 2),
+        prob_mutation=0.5,
+        crossover_=lambda x, y: (x + y) // 2,
+        selector=tournament(2),
+        max_steps=10,
+        random_seed=10,
+    )
+    solver.run()
+
+    assert len(batches) == solver.steps + 1
+    assert sum(batches) == solver.fitness_misses
+    assert solver.best_fit[1] == max(solver.fitness)
+    assert solver.solutions == [x for x in solver.population if x == 77]
@@ -0,0 +1,117 @@
+"""
+Tests the stopping criteria
+"""
+from random import Random
+
+from pytest import fixture
+
+from ga_solver import GASolver
+from ga_solver.pop_selectors import tournament
+from ga_solver.stopping import (
+    DiversityCollapse,
+    EvaluationBudget,
+    NoImprovement,
+    WallClock,
+)
+
+
+@fixture
+def root_solver():
+    """
+    Offers a GASolver looking for the square root of 49 among the floats
+    """
+    rng = Random(9)
+    return GASolver(
+        initial_pop=[rng.uniform(0, 100) for _ in range(30)],
+        goal=lambda x: -abs(x * x - 49),
+        target_value=0,
+        mutation=lambda x: x + rng.uniform(-0.5, 0.5),
+        prob_mutation=0.5,
+        crossover_=lambda x, y: (x + y) / 2,
+        selector=tournament(3),
+        max_steps=500,
+        random_seed=9,
+    )
+
+
+# pylint: disable=redefined-outer-name
+def test_tolerance_around_target(root_solver):
+    """
+    A float goal never hits 0 exactly, but it gets close enough
+    """
+    root_solver.tolerance = 1e-3
+    root_solver.run()
+
+    assert root_solver.stop_reason == "target_value"
+    assert root_solver.steps < 500
+    assert all(abs(x * x - 49) <= 1e-3 for x in root_solver.solutions)
+
+
+def test_no_tolerance(root_solver):
+    """
+    Without a tolerance, the float goal never reaches the target
+    """
+    root_solver.max_steps = 50
+    root_solver.run()
+
+    assert root_solver.stop_reason == "max_steps"
+    assert not root_solver.solution_found
+
+
+def test_no_improvement_on_a_flat_goal(root_solver):
+    """
+    A flat goal must stop after the given number of stalled steps
+    """
+    root_solver.goal = lambda x: 1
+    root_solver.stop_when = [NoImprovement(5)]
+    root_solver.run()
+
+    assert root_solver.steps == 6
+    assert root_solver.stop_reason == "NoImprovement(5, min_delta=0)"
+
+
+def test_no_improvement_with_min_delta(root_solver):
+    """
+    Improvements smaller than ``min_delta`` count as stalled steps
+    """
+    root_solver.stop_when = [NoImprovement(20, min_delta=1)]
+    root_solver.run()
+
+    assert root_solver.stop_reason == "NoImprovement(20, min_delta=1)"
+    assert 20 < root_solver.steps < 500
+
+
+def test_evaluation_budget(root_solver):
+    """
+    The evaluation budget must stop the run
+    """
+    root_solver.stop_when = [EvaluationBudget(200)]
+    root_solver.run()
+
+    assert 200 <= root_solver.fitness_misses < 200 + 30
+    assert root_solver.stop_reason == "EvaluationBudget(200)"
+
+
+def test_wall_clock(root_solver):
+    """
+    The wall-clock budget must stop the run
+    """
+    root_solver.stop_when = [WallClock(0)]
+    root_solver.run()
+
+    assert root_solver.steps == 1
+    assert root_solver.stop_reason == "WallClock(0)"
+
+
+def test_diversity_collapse(root_solver):
+    """
+    A population of copies has no diversity left
+    """
+    root_solver.population = [1.0] * 10 + [2.0]
+    root_solver.mutation = lambda x: x
+    root_solver.stop_when = [DiversityCollapse(0.2, patience=3)]
+    summary = root_solver.run()
+
+    assert root_solver.stop_reason == "DiversityCollapse(0.2, patience=3)"
+    assert summary.diversity <= 0.2
+    assert root_solver.steps < 50
@@ -0,0 +1,252 @@
+"""
+Tests the surrogate pre-screening
+"""
+from random import Random
+
+import pytest
+
+from ga_solver import AsyncGASolver, FitnessStore, GASolver, IntVector
+from ga_solver.genomes import creep_mutation, uniform_crossover
+from ga_solver.population import Population
+from ga_solver.pop_selectors import tournament
+from ga_solver.surrogate import LinearRegression, NearestNeighbors, Prescreen
+
+
+def test_nearest_neighbors():
+    """
+    Known points predict their value; others the weighted mean of the
+    closest ones
+    """
+    model = NearestNeighbors(k=2)
+    model.fit([(0,), (1,), (10,)], [0.0, 3.0, 100.0])
+    assert model.predict((1,)) == 3.0
+    assert model.predict((0.5,)) == pytest.approx(1.5)
+    assert model.predict((0.25,)) == pytest.approx(0.75)
+
+
+def test_linear_regression():
+    """
+    A linear function is recovered, even with a constant feature
+    """
+    rng = Random(1)
+    points = [(rng.uniform(-5, 5), rng.uniform(-5, 5), 1.0) for _ in range(30)]
+    values = [3 * x - 2 * y + 7 for x, y, _ in points]
+
+    model = LinearRegression()
+    model.fit(points, values)
+    assert model.predict((1.0, 1.0, 1.0)) == pytest.approx(8.0, abs=1e-3)
+    assert model.predict((0.0, 2.0, 1.0)) == pytest.approx(3.0, abs=1e-3)
+
+
+def test_prescreen_evaluates_the_best_fraction():
+    """
+    Everything is evaluated until the model is ready; then only the top
+    predictions reach the goal
+    """
+    calls = []
+
+    def goal(x):
+        calls.append(x)
+        return x
+
+    store = FitnessStore(goal)
+    screen = Prescreen(NearestNeighbors(k=1), fraction=0.25, min_samples=4)
+
+    values, predicted = screen.screen(store, [0, 10, 20, 30])
+    assert values == [0, 10, 20, 30] and not any(predicted)
+    assert screen.ready
+
+    calls.clear()
+    values, predicted = screen.screen(store, [1, 29, 11, 28, 2, 19, 21, 9])
+    assert sorted(calls) == [28, 29]
+    assert predicted == [True, False, True, False, True, True, True, True]
+    assert values[0] == 0 and values[1] == 29
+    assert screen.predictions == 6 and screen.saved == 6
+
+    values = screen.recalibrate(store, [21, 1], [20, 0])
+    assert values == [21, 1]
+    assert screen.mean_error == 1
+    assert screen.error_rate == 0
+    assert screen.saved == 4
+
+    with pytest.raises(ValueError):
+        Prescreen(fraction=0)
+
+
+def make_solver(max_steps=60, **kwargs):
+    """
+    Looks for the vector of all 9s, counting the calls to its goal
+    """
+    rng = Random(4)
+    calls = []
+
+    def goal(vector):
+        calls.append(vector)
+        return -sum(abs(9 - gene) for gene in vector)
+
+    solver = GASolver(
+        initial_pop=[IntVector(rng.randint(0, 9) for _ in range(6)) for _ in range(40)],
+        goal=goal,
+        target_value=0,
+        mutation=creep_mutation(low=0, high=9, rng=rng),
+        prob_mutation=0.5,
+        crossover_=uniform_crossover(rng),
+        selector=tournament(3),
+        max_steps=max_steps,
+        random_seed=4,
+        **kwargs,
+    )
+    return solver, calls
+
+
+def test_solver_with_surrogate():
+    """
+    The surrogate saves goal calls, and predicted members never count as
+    solutions nor reach the fitness store
+    """
+    plain, plain_calls = make_solver()
+    plain.run()
+
+    screen = Prescreen(NearestNeighbors(k=3), fraction=0.3, recalibrate_every=3)
+    solver, calls = make_solver(surrogate=screen)
+    for _ in solver:
+        predicted = set(solver.predicted)
+        fitness = solver.fitness
+        for i, member in enumerate(solver.population):
+            if i not in predicted:
+                assert fitness[i] == -sum(abs(9 - gene) for gene in member)
+        assert all(solver.population[i] not in solver.solutions for i in predicted)
+
+    assert solver.solution_found
+    assert len(calls) < len(plain_calls)
+    assert screen.saved > 0
+    assert screen.audited > 0
+    assert screen.mean_error is not None
+    assert screen.evaluated == solver.fitness_store.hits + solver.fitness_misses
+
+
+class Optimist:
+    """
+    Predicts a value no genome reaches
+    """
+
+    def fit(self, points, values):
+        """
+        Learns nothing
+        """
+
+    def predict(self, point):  # pylint: disable=unused-argument
+        """
+        Beats the target
+        """
+        return 1
+
+
+def test_summary_leaves_out_predictions():
+    """
+    The best, mean and worst values and ``best_fit`` only count the members
+    evaluated by ``goal``
+    """
+    screen = Prescreen(Optimist(), fraction=0.2, min_samples=1, recalibrate_every=0)
+    solver, _ = make_solver(surrogate=screen, max_steps=5)
+
+    for summary in solver:
+        predicted = set(solver.predicted)
+        assert predicted and max(solver.fitness) == 1
+        real = [value for i, value in enumerate(solver.fitness) if i not in predicted]
+        bests, best = solver.best_fit
+        assert summary.best == best == max(real)
+        assert summary.worst == min(real)
+        assert summary.mean == pytest.approx(sum(real) / len(real))
+        assert summary.best_individual in bests
+
+    assert solver.stop_reason == "max_steps"
+
+
+def test_prescreen_keeps_one_member_evaluated():
+    """
+    When every member carries a prediction, the most promising one is
+    evaluated, and audits are checked against the cut of the round each
+    prediction was made in
+    """
+    store = FitnessStore(lambda x: x)
+    screen = Prescreen(Optimist(), min_samples=1, recalibrate_every=0)
+    population = Population([5, 7, 3], fitness=[4, 8, 2])
+    ids = population.ids
+    predicted = {ids[0]: 6, ids[1]: 9, ids[2]: 1}
+
+    screen.fill(store, population, [], predicted)
+    assert population.fitness == [4, 7, 2]
+    assert predicted == {ids[0]: 6, ids[2]: 1}
+    assert screen.audited == 1 and screen.held_back == 0
+
+    screen.recalibrate(store, [5, 3], [4, 2], [6, 1])
+    assert screen.audited == 3 and screen.held_back == 1
+
+
+def test_summary_when_every_member_is_predicted():
+    """
+    A generation made only of new members still has one evaluated by
+    ``goal`` for the summary and ``best_fit``
+    """
+    screen = Prescreen(Optimist(), fraction=0.2, min_samples=1, recalibrate_every=0)
+    solver, _ = make_solver(surrogate=screen, max_steps=5)
+    next(solver)
+    population = solver.population
+    population.set_fitness(range(len(population)), [1] * len(population))
+    # pylint: disable=protected-access
+    solver._predicted_ids.update(dict.fromkeys(population.ids, screen.cut))
+
+    summary = solver.summary
+    assert len(solver.predicted) < len(solver)
+    assert summary.best == summary.worst == solver.best_fit[1] < 1
+
+
+def test_surrogate_checkpoint(tmp_path):
+    """
+    Predicted values are not restored as real ones
+    """
+    path = str(tmp_path / "run.ckpt")
+    solver, _ = make_solver(surrogate=Prescreen(fraction=0.2, recalibrate_every=0))
+    while not solver.predicted:
+        next(solver)
+
+    predicted = solver.predicted
+    solver.save_checkpoint(path)
+
+    fresh, calls = make_solver()
+    resumed = GASolver.resume(
+        path,
+        goal=fresh.fitness_store.goal,
+        target_value=0,
+        mutation=fresh.mutation,
+        prob_mutation=0.5,
+        crossover_=fresh.crossover_,
+        selector=tournament(3),
+    )
+    assert resumed.population.unknown() == predicted
+    resumed.fitness  # pylint: disable=pointless-statement
+    assert len(calls) == len({resumed.population[i] for i in predicted})
+
+
+def test_surrogate_unsupported():
+    """
+    Steady-state and async solvers don't take a surrogate
+    """
+    with pytest.raises(ValueError):
+        make_solver(surrogate=Prescreen(), steady_state=2)
+
+    async def goal(x):
+        return x
+
+    with pytest.raises(ValueError):
+        AsyncGASolver(
+            [1, 2],
+            goal,
+            2,
+            lambda x: x,
+            0.5,
+            max,
+            tournament(2),
+            surrogate=Prescreen(),
+        )
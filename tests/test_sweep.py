@@ -0,0 +1,176 @@
+"""
+Tests the sweep runner
+"""
+import subprocess
+import sys
+from random import Random
+
+import pytest
+
+from ga_solver import GASolver
+from ga_solver.pop_selectors import roullete, tournament
+from ga_solver.sweep import Sweep, grid, random_search, read_results, run_id
+
+BUILT = []
+
+
+# pylint: disable=too-many-arguments
+def build(
+    prob_mutation=0.5, selection_rate=0.5, fail=False, selector=None, random_seed=None
+):
+    """
+    Builds a solver looking for 42 among the integers. Module level, so it
+    can be sent to worker processes.
+    """
+    BUILT.append((prob_mutation, random_seed))
+    if fail:
+        raise RuntimeError("bad settings")
+
+    rng = Random(random_seed)
+    return GASolver(
+        initial_pop=[rng.randint(0, 1000) for _ in range(20)],
+        goal=lambda x: -abs(x - 42),
+        target_value=0,
+        mutation=lambda x: x + rng.randint(-5, 5),
+        prob_mutation=prob_mutation,
+        crossover_=lambda x, y: (x + y) // 2,
+        selector=selector or tournament(3),
+        selection_rate=selection_rate,
+        max_steps=200,
+        random_seed=random_seed,
+    )
+
+
+def test_grid_and_random_search():
+    """
+    Grids hold every combination; random searches draw from each choice
+    """
+    assert grid(a=[1, 2], b=[0]) == [{"a": 1, "b": 0}, {"a": 2, "b": 0}]
+
+    configs = random_search(
+        50, random_seed=1, a=[1, 2], b=lambda rng: rng.uniform(0, 1), c=7
+    )
+    assert len(configs) == 50
+    assert {config["a"] for config in configs} == {1, 2}
+    assert all(0 <= config["b"] <= 1 and config["c"] == 7 for config in configs)
+    assert configs == random_search(
+        50, random_seed=1, a=[1, 2], b=lambda rng: rng.uniform(0, 1), c=7
+    )
+
+
+def test_sweep_writes_and_resumes(tmp_path):
+    """
+    Each run gets one line, with the budget applied, and running again only
+    does what's missing
+    """
+    path = str(tmp_path / "results.csv")
+    configs = grid(prob_mutation=[0.2, 0.8])
+    sweep = Sweep(build, configs, seeds=[1, 2, 3], max_steps=5)
+
+    lines = sweep.run(path)
+    assert len(lines) == 6
+    results = read_results(path)
+    assert [line["run_id"] for line in results] == [run[0] for run in sweep.runs()]
+    assert all(int(line["steps"]) <= 5 for line in results)
+    assert {line["prob_mutation"] for line in results} == {"0.2", "0.8"}
+
+    BUILT.clear()
+    assert not sweep.run(path)
+    assert not BUILT
+
+    bigger = Sweep(build, grid(prob_mutation=[0.2, 0.8, 0.5]), seeds=[1, 2, 3])
+    assert len(bigger.run(path)) == 3
+    assert BUILT == [(0.5, 1), (0.5, 2), (0.5, 3)]
+    assert len(read_results(path)) == 9
+
+
+def test_sweep_resumes_with_function_settings(tmp_path):
+    """
+    Functions get the same run id in every process, built selectors are told
+    apart by what they close over, and the file names them without addresses
+    """
+    path = str(tmp_path / "results.csv")
+    selectors = [roullete, tournament(2), tournament(5)]
+    sweep = Sweep(build, grid(selector=selectors), seeds=[1], max_steps=2)
+
+    assert len(sweep.run(path)) == 3
+    assert len({run[0] for run in sweep.runs()}) == 3
+    names = [line["selector"] for line in read_results(path)]
+    assert names[0] == "ga_solver.pop_selectors.roullete"
+    assert all("0x" not in name for name in names)
+
+    again = Sweep(build, grid(selector=[roullete, tournament(5)]), seeds=[1])
+    assert again.pending(path) == []
+
+    code = (
+        "from ga_solver.pop_selectors import tournament;"
+        "from ga_solver.sweep import run_id;"
+        "print(run_id({'selector': tournament(5)}, 1))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert output.stdout.strip() == run_id({"selector": tournament(5)}, 1)
+
+
+def test_sweep_interrupted_line(tmp_path):
+    """
+    A line cut short is run again, and the new line starts on its own
+    """
+    path = tmp_path / "results.csv"
+    sweep = Sweep(build, grid(prob_mutation=[0.3]), seeds=[1, 2], max_steps=3)
+    sweep.run(str(path))
+
+    text = path.read_text()
+    path.write_text(text[: text.rindex(",", 0, len(text) - 10)])
+
+    assert len(sweep.run(str(path))) == 1
+    results = read_results(str(path))
+    assert len(results) == 3
+    assert results[-1]["error"] == ""
+
+
+def test_sweep_records_errors_and_retries(tmp_path):
+    """
+    A failed run doesn't stop the sweep and is tried again on resume
+    """
+    path = str(tmp_path / "results.csv")
+    sweep = Sweep(build, grid(fail=[False, True]), max_steps=3)
+
+    lines = sweep.run(path)
+    assert "bad settings" in lines[1]["error"]
+    assert lines[0].get("error") is None
+
+    assert len(sweep.run(path)) == 1
+
+
+def test_sweep_columns_must_match(tmp_path):
+    """
+    A results file of another sweep isn't appended to
+    """
+    path = str(tmp_path / "results.csv")
+    Sweep(build, grid(prob_mutation=[0.3]), max_steps=1).run(path)
+
+    with pytest.raises(ValueError):
+        Sweep(build, grid(selection_rate=[0.3]), max_steps=1).run(path)
+
+
+def test_sweep_in_processes(tmp_path):
+    """
+    Runs in worker processes give the same results as in this one
+    """
+    configs = grid(prob_mutation=[0.2, 0.8])
+    serial = Sweep(build, configs, seeds=[1, 2], max_steps=10)
+    parallel = Sweep(build, configs, seeds=[1, 2], max_steps=10, workers=2)
+
+    serial.run(str(tmp_path / "serial.csv"))
+    parallel.run(str(tmp_path / "parallel.csv"))
+
+    def key(line):
+        return line["run_id"]
+
+    def outcome(path):
+        lines = sorted(read_results(str(tmp_path / path)), key=key)
+        return [(line["run_id"], line["steps"], line["best"]) for line in lines]
+
+    assert outcome("serial.csv") == outcome("parallel.csv")